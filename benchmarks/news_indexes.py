@@ -0,0 +1,106 @@
+"""
+Latency of NewsDAO queries with and without the news table indexes.
+
+Usage::
+
+    poetry run python -m benchmarks.news_indexes --rows 2000000
+"""
+import argparse
+import asyncio
+import typing
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from benchmarks.utils import (
+    measure,
+    scratch_database,
+    seed_news,
+    vacuum_analyze,
+)
+
+from quantex.database.dao.news_dao import NewsDAO
+from quantex.database.models.news_model import NewsModel
+
+
+async def run_queries(
+    engine: AsyncEngine,
+    runs: int,
+) -> typing.Dict[str, typing.Dict[str, float]]:
+    """
+    Measure the query shapes served by NewsDAO.
+
+    :param engine: engine connected to the seeded database.
+    :param runs: number of measured calls per query.
+    :return: latency stats per query.
+    """
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        dao = NewsDAO(session)
+        headline = await session.scalar(
+            select(NewsModel.headline)
+            .where(NewsModel.ticker == "T100")
+            .limit(1),
+        )
+
+        queries = {
+            "ticker": lambda: dao.get_many_news(ticker="T100"),
+            "ticker_term_result": lambda: dao.get_many_news(
+                ticker="T100",
+                term="short",
+                result="positive",
+            ),
+            "ticker_headline": lambda: dao.get_many_news(
+                ticker="T100",
+                headline=headline,
+            ),
+        }
+
+        return {
+            name: await measure(query, runs=runs)
+            for name, query in queries.items()
+        }
+
+
+async def main(rows: int, runs: int) -> None:
+    """
+    Seed a scratch database and compare query latency before and after
+    indexing.
+
+    :param rows: number of synthetic news rows.
+    :param runs: number of measured calls per query.
+    """
+    async with scratch_database() as engine:
+        indexes = NewsModel.__table__.indexes
+
+        async with engine.begin() as conn:
+            for index in indexes:
+                await conn.run_sync(index.drop)
+
+        print(f"Seeding {rows} rows")  # noqa: WPS421
+        await seed_news(engine, rows)
+        before = await run_queries(engine, runs)
+
+        async with engine.begin() as conn:
+            for index in indexes:
+                await conn.run_sync(index.create)
+        await vacuum_analyze(engine)
+        after = await run_queries(engine, runs)
+
+    print(f"{'query':<20}{'before p50':>14}{'after p50':>14}")  # noqa: WPS421
+    for name in before:
+        print(  # noqa: WPS421
+            f"{name:<20}"
+            f"{before[name]['p50_ms']:>12.2f}ms"
+            f"{after[name]['p50_ms']:>12.2f}ms",
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.runs))
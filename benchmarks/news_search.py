@@ -0,0 +1,74 @@
+"""
+Latency of headline search on a seeded news table.
+
+Usage::
+
+    poetry run python -m benchmarks.news_search --rows 2000000
+"""
+import argparse
+import asyncio
+import datetime
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.utils import measure, scratch_database, seed_news
+
+from quantex.database.dao.news_dao import NewsDAO
+
+# The API searches the last 90 days by default
+SINCE = datetime.datetime.utcnow() - datetime.timedelta(days=90)
+
+SEARCHES = {
+    "word": {"phrase": "earnings"},
+    "two_words": {"phrase": "FDA approval"},
+    "phrase": {"phrase": '"FDA approval"'},
+    "negation": {"phrase": "merger -lawsuit"},
+    "ticker": {"phrase": "earnings", "ticker": "T100"},
+    "deep_page": {"phrase": "FDA approval", "offset": 900},
+    "fuzzy": {"phrase": "aproval", "fuzzy": True},
+    "fuzzy_ticker": {"phrase": "bankrupcy", "fuzzy": True, "ticker": "T100"},
+}
+
+
+async def main(rows: int, runs: int) -> None:
+    """
+    Seed a scratch database and measure search latency.
+
+    :param rows: number of synthetic news rows.
+    :param runs: number of measured calls per search.
+    """
+    async with scratch_database() as engine:
+        print(f"Seeding {rows} rows")  # noqa: WPS421
+        await seed_news(engine, rows)
+
+        session_factory = async_sessionmaker(engine)
+        async with session_factory() as session:
+            dao = NewsDAO(session)
+            results = {
+                name: await measure(
+                    lambda search=search: dao.search_news(  # type: ignore
+                        since=SINCE,
+                        limit=100,
+                        **search,
+                    ),
+                    runs=runs,
+                )
+                for name, search in SEARCHES.items()
+            }
+
+    print(f"{'search':<16}{'p50':>12}{'p99':>12}")  # noqa: WPS421
+    for name, stats in results.items():
+        print(  # noqa: WPS421
+            f"{name:<16}"
+            f"{stats['p50_ms']:>10.2f}ms"
+            f"{stats['p99_ms']:>10.2f}ms",
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.runs))
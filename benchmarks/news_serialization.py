@@ -0,0 +1,93 @@
+"""
+Rows per second of the GET /api/news serialization paths.
+
+The old path loads ORM objects, validates them with NewsModelDTO and encodes
+every row with model_dump_json, before JSONResponse encodes the list again.
+The new path selects plain column tuples and encodes them once with orjson.
+
+Usage::
+
+    poetry run python -m benchmarks.news_serialization --page-size 1000
+"""
+import argparse
+import asyncio
+import functools
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.responses import JSONResponse
+
+from benchmarks.utils import measure, scratch_database, seed_news
+
+from quantex.database.dao.news_dao import NewsDAO
+from quantex.database.models.news_model import NewsModel
+from quantex.web.api.news.schema import NewsModelDTO
+
+
+async def old_path(session: AsyncSession, page_size: int) -> bytes:
+    """
+    Serialize news the way GET /api/news did before.
+
+    :param session: session connected to the seeded database.
+    :param page_size: number of rows serialized.
+    :return: response body.
+    """
+    r = await session.execute(select(NewsModel).limit(page_size))
+    news = [NewsModelDTO.from_orm(n) for n in r.scalars().all()]
+    session.expunge_all()
+    return JSONResponse(
+        {"news": [row.model_dump_json() for row in news], "count": len(news)},
+    ).body
+
+
+async def new_path(session: AsyncSession, page_size: int) -> bytes:
+    """
+    Serialize news the way GET /api/news does now.
+
+    :param session: session connected to the seeded database.
+    :param page_size: number of rows serialized.
+    :return: response body.
+    """
+    news = await NewsDAO(session).get_many_news(limit=page_size)
+    return ORJSONResponse({"news": news, "count": len(news)}).body
+
+
+async def main(page_size: int, runs: int) -> None:
+    """
+    Seed a scratch database and compare both serialization paths.
+
+    :param page_size: number of rows serialized per call.
+    :param runs: number of measured calls per path.
+    """
+    paths = {"model_dump_json": old_path, "orjson_columns": new_path}
+
+    async with scratch_database() as engine:
+        await seed_news(engine, page_size)
+        session_factory = async_sessionmaker(engine)
+
+        async with session_factory() as session:
+            results = {
+                name: await measure(
+                    functools.partial(path, session, page_size),
+                    runs=runs,
+                )
+                for name, path in paths.items()
+            }
+
+    print(f"{'path':<20}{'p50':>12}{'rows/s':>14}")  # noqa: WPS421
+    for name, stats in results.items():
+        print(  # noqa: WPS421
+            f"{name:<20}"
+            f"{stats['p50_ms']:>10.2f}ms"
+            f"{stats['per_second'] * page_size:>14.0f}",
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.page_size, args.runs))
@@ -0,0 +1,205 @@
+"""
+Requests per second and connections held by the GET /api/news session paths.
+
+The old path reads in a transaction that is committed after the response is
+encoded, like get_db_session did for every request. The new path reads with
+a read-only session in autocommit mode, which sends no BEGIN and COMMIT and
+returns the connection to the pool before the response is encoded.
+
+Usage::
+
+    poetry run python -m benchmarks.news_sessions --concurrency 50 --pool 10
+"""
+import argparse
+import asyncio
+import time
+import typing
+
+import orjson
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from benchmarks.utils import scratch_database, seed_news
+
+from quantex.database.dao.news_dao import NEWS_COLUMNS, NewsDAO
+from quantex.database.models.news_model import NewsModel
+
+SessionFactory = typing.Callable[[], AsyncSession]
+
+
+async def old_path(session_factory: SessionFactory, page_size: int) -> bytes:
+    """
+    Read a page of news the way GET /api/news did before.
+
+    :param session_factory: factory of sessions with transactions.
+    :param page_size: number of news read.
+    :return: response body.
+    """
+    session = session_factory()
+    try:
+        r = await session.execute(
+            select(*NEWS_COLUMNS)
+            .order_by(NewsModel.created_at.desc(), NewsModel.id.desc())
+            .limit(page_size),
+        )
+        news = [row._asdict() for row in r]
+        return orjson.dumps({"news": news, "count": len(news)})
+    finally:
+        await session.commit()
+        await session.close()
+
+
+async def new_path(session_factory: SessionFactory, page_size: int) -> bytes:
+    """
+    Read a page of news the way GET /api/news does now.
+
+    :param session_factory: factory of read-only sessions.
+    :param page_size: number of news read.
+    :return: response body.
+    """
+    session = session_factory()
+    try:
+        news = await NewsDAO(session).get_many_news(limit=page_size)
+        return orjson.dumps({"news": news, "count": len(news)})
+    finally:
+        await session.close()
+
+
+async def load(
+    engine: AsyncEngine,
+    path: typing.Callable[[SessionFactory, int], typing.Awaitable[bytes]],
+    session_factory: SessionFactory,
+    page_size: int,
+    concurrency: int,
+    requests: int,
+) -> typing.Dict[str, float]:
+    """
+    Call a path from concurrent clients and track pool checkouts.
+
+    :param engine: engine with the pool.
+    :param path: path to call.
+    :param session_factory: factory of sessions passed to the path.
+    :param page_size: number of news read per call.
+    :param concurrency: number of concurrent clients.
+    :param requests: number of calls per client.
+    :return: requests per second and connections held on average.
+    """
+    held = 0.0
+    checkouts: typing.Dict[int, float] = {}
+
+    def checkout(dbapi_conn, record, proxy):
+        checkouts[id(record)] = time.perf_counter()
+
+    def checkin(dbapi_conn, record):
+        nonlocal held
+        start = checkouts.pop(id(record), None)
+        if start is not None:
+            held += time.perf_counter() - start
+
+    pool = engine.sync_engine.pool
+    event.listen(pool, "checkout", checkout)
+    event.listen(pool, "checkin", checkin)
+
+    async def client() -> None:
+        for _ in range(requests):
+            await path(session_factory, page_size)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(pool, "checkout", checkout)
+        event.remove(pool, "checkin", checkin)
+
+    total = concurrency * requests
+    return {
+        "per_second": total / elapsed,
+        "held_ms": held / total * 1000,
+        "avg_held": held / elapsed,
+    }
+
+
+async def main(
+    rows: int,
+    page_size: int,
+    concurrency: int,
+    requests: int,
+    pool_size: int,
+) -> None:
+    """
+    Seed a scratch database and compare both session paths.
+
+    :param rows: number of seeded news.
+    :param page_size: number of news read per call.
+    :param concurrency: number of concurrent clients.
+    :param requests: number of calls per client.
+    :param pool_size: number of connections in the pool.
+    """
+    async with scratch_database() as seed_engine:
+        await seed_news(seed_engine, rows)
+
+        engine = create_async_engine(
+            seed_engine.url,
+            pool_size=pool_size,
+            max_overflow=0,
+        )
+        paths = {
+            "transaction": (old_path, async_sessionmaker(engine)),
+            "readonly": (
+                new_path,
+                async_sessionmaker(
+                    engine.execution_options(isolation_level="AUTOCOMMIT"),
+                ),
+            ),
+        }
+
+        try:
+            results = {}
+            for name, (path, session_factory) in paths.items():
+                # Warm up the pool and the statement caches
+                await load(engine, path, session_factory, page_size, 2, 5)
+                results[name] = await load(
+                    engine,
+                    path,
+                    session_factory,
+                    page_size,
+                    concurrency,
+                    requests,
+                )
+        finally:
+            await engine.dispose()
+
+    print(  # noqa: WPS421
+        f"{'path':<14}{'req/s':>10}{'held ms/req':>14}{'avg held':>10}",
+    )
+    for name, stats in results.items():
+        print(  # noqa: WPS421
+            f"{name:<14}{stats['per_second']:>10.0f}"
+            f"{stats['held_ms']:>14.2f}{stats['avg_held']:>10.1f}",
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--pool", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(
+            args.rows,
+            args.page_size,
+            args.concurrency,
+            args.requests,
+            args.pool,
+        ),
+    )
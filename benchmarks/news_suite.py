@@ -0,0 +1,329 @@
+"""
+Latency and throughput of news reads and writes, by the DAO and by the API.
+
+For every dataset size a scratch database is seeded with synthetic news and
+every case is measured. Results are saved as JSON, pass them as a baseline to
+a later run to see what got slower.
+
+Usage::
+
+    poetry run python -m benchmarks.news_suite --rows 100000 1000000 \\
+        --output bench.json
+    poetry run python -m benchmarks.news_suite --rows 100000 1000000 \\
+        --baseline bench.json
+"""
+import argparse
+import asyncio
+import datetime
+import functools
+import itertools
+import json
+import random
+import sys
+import typing
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from benchmarks.utils import measure, scratch_database, seed_news
+
+from quantex.database.dao.news_dao import NewsDAO
+from quantex.database.models.news_model import NewsModel
+from quantex.services.response_cache import ResponseCache
+from quantex.settings import settings
+from quantex.web.api.news.schema import NewsModelCreateDTO
+from quantex.web.application import get_app
+
+Case = typing.Callable[[], typing.Awaitable[typing.Any]]
+Results = typing.Dict[str, typing.Dict[str, typing.Dict[str, float]]]
+
+# Ticker covered most and one covered rarely, see SEED_NEWS_SQL
+POPULAR_TICKER = "T0"
+RARE_TICKER = "T400"
+
+
+def _new_news(counter: typing.Iterator[int]) -> NewsModelCreateDTO:
+    return NewsModelCreateDTO(
+        ticker=random.choice((POPULAR_TICKER, RARE_TICKER)),
+        headline=f"Benchmark headline {next(counter)}",
+        explanation="Benchmark explanation",
+        result=random.choice(("positive", "negative", "neutral")),
+        term="short",
+    )
+
+
+def dao_cases(
+    engine: AsyncEngine,
+    ids: typing.List[int],
+    middle: typing.Tuple[datetime.datetime, int],
+) -> typing.Dict[str, Case]:
+    """
+    Create cases that call NewsDAO, every call with its own session.
+
+    :param engine: engine connected to the seeded database.
+    :param ids: ids of seeded news to get.
+    :param middle: (created_at, id) of a news in the middle of the table.
+    :return: cases by name.
+    """
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    readonly_sessions = async_sessionmaker(
+        engine.execution_options(isolation_level="AUTOCOMMIT"),
+        expire_on_commit=False,
+    )
+    counter = itertools.count()
+
+    async def read(**kwargs: typing.Any) -> None:
+        async with readonly_sessions() as session:
+            await NewsDAO(session).get_many_news(**kwargs)
+
+    async def get_news() -> None:
+        async with readonly_sessions() as session:
+            await NewsDAO(session).get_news(random.choice(ids))
+
+    async def create_news() -> None:
+        async with sessions() as session:
+            await NewsDAO(session).create_news(_new_news(counter))
+
+    since = datetime.datetime.utcnow() - datetime.timedelta(days=7)
+    return {
+        "dao.get_many_news": functools.partial(read),
+        "dao.get_many_news.ticker": functools.partial(
+            read,
+            ticker=POPULAR_TICKER,
+        ),
+        "dao.get_many_news.rare_ticker_result": functools.partial(
+            read,
+            ticker=RARE_TICKER,
+            result="negative",
+        ),
+        "dao.get_many_news.deep_page": functools.partial(read, after=middle),
+        "dao.get_many_news.since": functools.partial(read, since=since),
+        "dao.get_news": get_news,
+        "dao.create_news": create_news,
+    }
+
+
+def api_cases(
+    client: httpx.AsyncClient,
+    ids: typing.List[int],
+) -> typing.Dict[str, Case]:
+    """
+    Create cases that call the news API.
+
+    :param client: client of the app.
+    :param ids: ids of seeded news to get.
+    :return: cases by name.
+    """
+    headers = {"X-Secret": settings.secret_key}
+    counter = itertools.count()
+
+    async def get(**params: typing.Any) -> None:
+        r = await client.get("/api/news/", params=params, headers=headers)
+        r.raise_for_status()
+
+    async def get_news() -> None:
+        await get(news_id=random.choice(ids))
+
+    async def create_news() -> None:
+        r = await client.post(
+            "/api/news/",
+            content=_new_news(counter).model_dump_json(),
+            headers=headers,
+        )
+        r.raise_for_status()
+
+    return {
+        "api.get_many_news": functools.partial(get),
+        "api.get_many_news.ticker": functools.partial(
+            get,
+            ticker=POPULAR_TICKER,
+        ),
+        "api.get_news": get_news,
+        "api.create_news": create_news,
+    }
+
+
+async def run_cases(
+    cases: typing.Dict[str, Case],
+    runs: int,
+) -> typing.Dict[str, typing.Dict[str, float]]:
+    """
+    Measure every case.
+
+    :param cases: cases by name.
+    :param runs: number of measured calls per case.
+    :return: latency and throughput by case name.
+    """
+    results = {}
+    for name, case in cases.items():
+        results[name] = await measure(case, runs=runs, warmup=5)
+        print(  # noqa: WPS421
+            f"  {name:<40}{results[name]['p50_ms']:>9.2f}ms"
+            f"{results[name]['p99_ms']:>9.2f}ms"
+            f"{results[name]['per_second']:>9.0f}/s",
+        )
+    return results
+
+
+async def bench_dataset(rows: int, runs: int) -> typing.Dict[str, typing.Any]:
+    """
+    Seed a scratch database and measure all cases against it.
+
+    :param rows: number of seeded news.
+    :param runs: number of measured calls per case.
+    :return: latency and throughput by case name.
+    """
+    async with scratch_database() as engine:
+        await seed_news(engine, rows)
+
+        async with engine.connect() as conn:
+            ids = list(
+                await conn.scalars(
+                    select(NewsModel.id)
+                    .order_by(func.random())
+                    .limit(max(runs, 1000)),
+                ),
+            )
+            middle = (
+                await conn.execute(
+                    select(NewsModel.created_at, NewsModel.id)
+                    .order_by(NewsModel.created_at.desc(), NewsModel.id.desc())
+                    .offset(rows // 2)
+                    .limit(1),
+                )
+            ).one()
+
+        print(f"{rows} rows")  # noqa: WPS421
+        results = await run_cases(
+            dao_cases(engine, ids, tuple(middle)),
+            runs,
+        )
+
+        # The app connects to the database in settings, so it is pointed to
+        # the scratch database while it runs
+        db_base = settings.db_base
+        settings.db_base = engine.url.database
+        app = get_app()
+        try:
+            await app.router.startup()
+            # Every request is a cache miss, so the database is hit
+            app.state.news_cache = ResponseCache(ttl=0)
+            async with httpx.AsyncClient(
+                app=app,
+                base_url="http://bench",
+            ) as client:
+                results.update(await run_cases(api_cases(client, ids), runs))
+        finally:
+            await app.router.shutdown()
+            settings.db_base = db_base
+
+    return results
+
+
+def compare(
+    results: Results,
+    baseline: Results,
+    tolerance: float,
+) -> typing.List[str]:
+    """
+    Print how results changed since the baseline.
+
+    :param results: results of this run.
+    :param baseline: results of an earlier run.
+    :param tolerance: relative p50 increase reported as regression, p99 of
+        short runs is too noisy to tell.
+    :return: names of regressed cases.
+    """
+    regressions = []
+    print(  # noqa: WPS421
+        f"{'rows':>10}  {'case':<40}{'p50':>10}{'p99':>10}",
+    )
+    for rows, cases in results.items():
+        for name, stats in cases.items():
+            before = baseline.get(rows, {}).get(name)
+            if before is None:
+                continue
+
+            changes = {
+                key: stats[key] / before[key] - 1 if before[key] else 0.0
+                for key in ("p50_ms", "p99_ms")
+            }
+            regressed = changes["p50_ms"] > tolerance
+            if regressed:
+                regressions.append(f"{rows}/{name}")
+            print(  # noqa: WPS421
+                f"{rows:>10}  {name:<40}"
+                f"{changes['p50_ms']:>+10.0%}{changes['p99_ms']:>+10.0%}"
+                f"{'  REGRESSED' if regressed else ''}",
+            )
+    return regressions
+
+
+async def main(
+    rows: typing.List[int],
+    runs: int,
+    output: typing.Optional[str],
+    baseline: typing.Optional[str],
+    tolerance: float,
+) -> int:
+    """
+    Run the suite for every dataset size.
+
+    :param rows: dataset sizes.
+    :param runs: number of measured calls per case.
+    :param output: path to save results to.
+    :param baseline: path of results to compare with.
+    :param tolerance: relative p50 increase reported as regression.
+    :return: exit code, 1 if any case regressed.
+    """
+    results: Results = {}
+    for size in rows:
+        results[str(size)] = await bench_dataset(size, runs)
+
+    if output:
+        with open(output, "w") as file:
+            json.dump(
+                {
+                    "created_at": datetime.datetime.utcnow().isoformat(),
+                    "runs": runs,
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if baseline:
+        with open(baseline) as file:
+            regressions = compare(
+                results,
+                json.load(file)["results"],
+                tolerance,
+            )
+        if regressions:
+            print(f"Regressed: {', '.join(regressions)}")  # noqa: WPS421
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    sys.exit(
+        asyncio.run(
+            main(
+                args.rows,
+                args.runs,
+                args.output,
+                args.baseline,
+                args.tolerance,
+            ),
+        ),
+    )
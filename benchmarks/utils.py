@@ -0,0 +1,189 @@
+import contextlib
+import statistics
+import time
+import typing
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from quantex.database.meta import meta
+from quantex.database.models import load_all_models
+from quantex.database.utils import create_database, drop_database
+from quantex.settings import settings
+
+# Words that seeded headlines are made of, so they can be searched
+HEADLINE_WORDS = (
+    "FDA approval earnings beat miss guidance raised cut revenue record "
+    "quarter dividend buyback merger acquisition lawsuit settlement recall "
+    "upgrade downgrade analyst target price shares surge plunge rally "
+    "layoffs hiring expansion chip cloud AI deal partnership contract "
+    "investigation probe CEO resigns appoints IPO offering debt bankruptcy "
+    "outlook forecast sales growth decline"
+).split()
+
+# Seeded news are created over this many days before now
+SEED_DAYS = 730
+
+# Rows g and g + 1, for even g, are the same news analysed for both terms:
+# everything but the term, explanation and result is drawn from the digest
+# of g / 2. Tickers are roughly Zipf-distributed, T0 is the most covered one.
+SEED_NEWS_SQL = """
+WITH vocabulary AS (SELECT CAST(:words AS text[]) AS words)
+INSERT INTO news (
+    created_at, term, ticker, headline, explanation, result, content_hash
+)
+SELECT
+    seed.*,
+    -- Seeded headlines are already normalized, see news_content_hash
+    decode(
+        md5(upper(ticker) || chr(31) || lower(headline) || chr(31) || term),
+        'hex'
+    )
+FROM (
+    SELECT
+        now() - time_draw * make_interval(days => CAST(:days AS int))
+            AS created_at,
+        (ARRAY['short', 'long'])[1 + g % 2]::term AS term,
+        'T' || floor(CAST(:tickers AS int) * power(ticker_draw, 3))::int
+            AS ticker,
+        concat_ws(
+            ' ',
+            words[1 + get_byte(digest, 0) % cardinality(words)],
+            words[1 + get_byte(digest, 1) % cardinality(words)],
+            words[1 + get_byte(digest, 2) % cardinality(words)],
+            words[1 + get_byte(digest, 3) % cardinality(words)],
+            encode(substr(digest, 5, 6), 'hex')
+        ) AS headline,
+        'Explanation of the headline ' || md5(g::text) AS explanation,
+        (ARRAY['neutral', 'neutral', 'positive', 'positive', 'negative'])[
+            1 + floor(random() * 5)::int
+        ]::result AS result
+    FROM
+        generate_series(CAST(:start AS int), CAST(:stop AS int)) AS g,
+        LATERAL (SELECT decode(md5((g / 2)::text), 'hex') AS digest) AS h,
+        -- Uniform in [0, 1), from the bytes not used by the headline
+        LATERAL (
+            SELECT
+                (
+                    get_byte(digest, 10) * 65536
+                    + get_byte(digest, 11) * 256
+                    + get_byte(digest, 12)
+                ) / 16777216::float8 AS ticker_draw,
+                (
+                    get_byte(digest, 13) * 65536
+                    + get_byte(digest, 14) * 256
+                    + get_byte(digest, 15)
+                ) / 16777216::float8 AS time_draw
+        ) AS draws,
+        vocabulary
+) AS seed
+"""
+
+
+@contextlib.asynccontextmanager
+async def scratch_database(
+    name: str = f"{settings.db_base}_bench",
+) -> typing.AsyncIterator[AsyncEngine]:
+    """
+    Create a throwaway database with all tables for benchmarking.
+
+    :param name: name of the database, dropped when the benchmark finishes.
+    :yield: engine connected to the database.
+    """
+    load_all_models()
+    await create_database(name)
+
+    engine = create_async_engine(str(settings.db_url.with_path(f"/{name}")))
+    async with engine.begin() as conn:
+        await conn.run_sync(meta.create_all)
+
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+        await drop_database(name)
+
+
+async def seed_news(
+    engine: AsyncEngine,
+    rows: int,
+    tickers: int = 500,
+    chunk: int = 1_000_000,
+) -> None:
+    """
+    Fill the news table with synthetic rows.
+
+    Every headline is stored twice, once per term, like the scraper does.
+
+    :param engine: engine connected to the benchmark database.
+    :param rows: number of rows to insert.
+    :param tickers: number of distinct tickers.
+    :param chunk: number of rows inserted per statement.
+    """
+    # Otherwise news older than the partitions created with the table would
+    # all end up in the default partition
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "SELECT news_create_partitions(localtimestamp - "
+                "make_interval(days => CAST(:days AS int)), localtimestamp)",
+            ),
+            {"days": SEED_DAYS},
+        )
+
+    for start in range(1, rows + 1, chunk):
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(SEED_NEWS_SQL),
+                {
+                    "words": HEADLINE_WORDS,
+                    "tickers": tickers,
+                    "days": SEED_DAYS,
+                    "start": start,
+                    "stop": min(rows, start + chunk - 1),
+                },
+            )
+
+    await vacuum_analyze(engine)
+
+
+async def vacuum_analyze(engine: AsyncEngine) -> None:
+    """
+    Refresh visibility map and planner statistics of the news table.
+
+    :param engine: engine connected to the benchmark database.
+    """
+    autocommit = engine.execution_options(isolation_level="AUTOCOMMIT")
+    async with autocommit.connect() as conn:
+        await conn.execute(text("VACUUM ANALYZE news"))
+
+
+async def measure(
+    func: typing.Callable[[], typing.Awaitable[typing.Any]],
+    runs: int = 20,
+    warmup: int = 2,
+) -> typing.Dict[str, float]:
+    """
+    Measure latency of an async callable.
+
+    :param func: callable to measure.
+    :param runs: number of measured calls.
+    :param warmup: number of calls made before measuring.
+    :return: p50, p99 and mean latency in milliseconds, and calls per second.
+    """
+    for _ in range(warmup):
+        await func()
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        "p50_ms": statistics.median(timings),
+        "p99_ms": timings[min(runs - 1, int(runs * 0.99))],
+        "mean_ms": statistics.fmean(timings),
+        "per_second": 1000 / statistics.fmean(timings),
+    }
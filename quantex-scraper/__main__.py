@@ -1,3 +1,4 @@
+import json
 import traceback
 from typing import List
 
@@ -6,16 +7,100 @@ from selenium.common import NoSuchElementException
 from selenium.webdriver.common.by import By
 from datetime import datetime, timedelta
 import os
+import sys
 import time
 import logging
 from dotenv import load_dotenv
 import requests
 
+from .analysis import AnalysisExecutor, ProviderLimitationError
+from .cache import AnalysisCache
 from .listener import EventListener
+from .pipeline import ScraperPipeline
+from .ratelimit import TokenBucket
+from .seen import SeenSet
 from .telegram import TelegramBot
 
 load_dotenv()
 INTERVAL = int(os.getenv("QUANTEX_INTERVAL", 30))
+# Maximum number of (ticker, headline) pairs accepted by /api/news/exists
+LOOKUP_BATCH_SIZE = 1000
+# Maximum number of rows accepted by /api/news/batch
+INSERT_BATCH_SIZE = 1000
+
+# Number of concurrent EdenAI requests and requests per second allowed
+ANALYSIS_WORKERS = int(os.getenv("QUANTEX_ANALYSIS_WORKERS", 4))
+ANALYSIS_RATE_LIMIT = float(os.getenv("QUANTEX_ANALYSIS_RATE_LIMIT", 2))
+# Ask for all tickers and both terms of a headline in a single request
+BATCHED_ANALYSIS = os.getenv("QUANTEX_BATCHED_ANALYSIS", "true") == "true"
+# Answer tokens reserved per ticker in batched prompts
+BATCHED_ANALYSIS_TOKENS = 120
+# Analysis results are cached on disk, least recently used ones are evicted
+ANALYSIS_CACHE_PATH = os.getenv(
+    "QUANTEX_ANALYSIS_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "analysis.db"),
+)
+ANALYSIS_CACHE_SIZE = int(os.getenv("QUANTEX_ANALYSIS_CACHE_SIZE", 100_000))
+# "script" collects the page in one execute_script call, "xpath" per element
+SCRAPE_MODE = os.getenv("QUANTEX_SCRAPE_MODE", "script")
+
+EXTRACT_ARTICLES_SCRIPT = """
+const evaluate = (path, node) => document.evaluate(
+    path, node, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+);
+const texts = (path, node) => {
+    const snapshot = evaluate(path, node);
+    const result = [];
+    for (let i = 0; i < snapshot.snapshotLength; i++) {
+        result.push(snapshot.snapshotItem(i).innerText.trim());
+    }
+    return result;
+};
+
+const articles = evaluate(
+    "/html/body/div/div[2]/div[4]/div/div/div/div", document
+);
+const result = [];
+for (let i = 0; i < articles.snapshotLength; i++) {
+    const article = articles.snapshotItem(i);
+    for (const layout of ["a", "div"]) {
+        result.push({
+            layout: layout,
+            tickers: texts(`./${layout}/div/div[2]/div/span`, article),
+            timestamp:
+                texts(`./${layout}/div/div[1]/div/span`, article)[0] || "",
+            headline:
+                texts(`./${layout}/div/div[3]/div/span[1]`, article)[0] || "",
+        });
+    }
+}
+return result;
+"""
+
+# Processed (ticker, headline) pairs are remembered for one to two windows
+SEEN_WINDOW = int(os.getenv("QUANTEX_SEEN_WINDOW", 6 * 60 * 60))
+SEEN_CAPACITY = int(os.getenv("QUANTEX_SEEN_CAPACITY", 100_000))
+
+SYSTEM_PROMPT = (
+    "Act as a financial expert. "
+    "You are a financial expert with stock recommendation experience."
+)
+ANALYSIS_PROMPT = (
+    'Answer "YES" if good news, "NO" if bad news, or "UNKNOWN" if uncertain. '
+    "Then elaborate with one short and concise sentence and split elaborate "
+    'and result with dash "-". Is this headline good or bad for the stock '
+    "price of {ticker} in the {term} term? Headline: {headline}"
+)
+BATCHED_ANALYSIS_PROMPT = (
+    "Is this headline good or bad for the stock price of each of the "
+    "following tickers in the short and in the long term? For every ticker "
+    'and term answer "YES" if good news, "NO" if bad news, or "UNKNOWN" if '
+    "uncertain, and elaborate with one short and concise sentence. Respond "
+    "only with a JSON object mapping every ticker to "
+    '{{"short": {{"answer": ..., "explanation": ...}}, '
+    '"long": {{"answer": ..., "explanation": ...}}}}. '
+    "Tickers: {tickers}. Headline: {headline}"
+)
 
 listener = EventListener()
 telegram_bot = TelegramBot(os.getenv("QUANTEX_TELEGRAM_BOT_API_KEY"))
@@ -61,6 +146,58 @@ def convert_relative_timestamp(timestamp):
     return datetime.now() - delta
 
 
+def parse_verdict(answer):
+    """
+    Convert a YES/NO/UNKNOWN answer to a result.
+
+    Args:
+        answer (str): The answer given by the model.
+
+    Returns:
+        str: "positive", "negative" or "neutral", or None if the answer is
+            invalid.
+    """
+    if not isinstance(answer, str):
+        return
+
+    return {
+        "YES": "positive",
+        "NO": "negative",
+        "UNKNOWN": "neutral",
+    }.get(answer.strip().strip('"').upper())
+
+
+def parse_batched_answer(text):
+    """
+    Parse the JSON answer to a batched analysis prompt.
+
+    Args:
+        text (str): The answer given by the model, optionally wrapped in prose
+            or a code block.
+
+    Returns:
+        dict: Answers keyed by upper-cased ticker, then by term. Empty if the
+            answer is not valid JSON.
+    """
+    try:
+        answers = json.loads(text[text.index("{") : text.rindex("}") + 1])
+    except ValueError:
+        return {}
+
+    if not isinstance(answers, dict):
+        return {}
+
+    return {
+        str(ticker).upper(): {
+            term: answer
+            for term, answer in terms.items()
+            if isinstance(answer, dict)
+        }
+        for ticker, terms in answers.items()
+        if isinstance(terms, dict)
+    }
+
+
 class NewsScraper:
     def __init__(self, user, password, edenai_key):
         self.URL = "https://newsfilter.io/latest/news"
@@ -75,6 +212,15 @@ class NewsScraper:
         self.password = password
         self.edenai_key = edenai_key
 
+        self.cache = AnalysisCache(
+            ANALYSIS_CACHE_PATH, max_entries=ANALYSIS_CACHE_SIZE
+        )
+        self.seen = SeenSet(window=SEEN_WINDOW, capacity=SEEN_CAPACITY)
+        self.analysis = AnalysisExecutor(
+            TokenBucket(ANALYSIS_RATE_LIMIT, capacity=ANALYSIS_WORKERS),
+            max_workers=ANALYSIS_WORKERS,
+        )
+
     def setup(self):
         """
         Sets up the initial state of the function by performing the following steps:
@@ -152,32 +298,29 @@ class NewsScraper:
 
         return True
 
-    def analyze(self, ticker, term, headline):
+    def chat(self, text, max_tokens=150):
         """
-        Analyzes a given headline to determine if it is good or bad for the stock price of
-        a given ticker in a specified term.
+        Sends a single prompt to the EdenAI chat API.
 
         Args:
-            ticker (str): The ticker symbol of the stock.
-            term (str): The term or time period for which the analysis is being done.
-            headline (str): The headline to be analyzed.
+            text (str): The prompt.
+            max_tokens (int): The maximum length of the answer.
 
         Returns:
-            dict: A dictionary containing the analysis result, including the term, ticker,
-            headline, explanation, and result.
+            str: The generated answer, or None if the response was invalid.
+
+        Raises:
+            ProviderLimitationError: If EdenAI rejected the request due to
+                rate limits, or failed to handle it.
         """
         url = "https://api.edenai.run/v2/text/chat"
         payload = {
             "providers": "openai",
-            "text": f'Answer “YES” if good news, “NO” if bad news, or “UNKNOWN” \
-                      if uncertain. Then elaborate with one short and \
-                      concise sentence and split elaborate and result with dash\' "-". Is this headline good or bad for \
-                      the stock price of {ticker} in the {term} term? Headline: {headline}',
-            "chat_global_action": "Act as a financial expert. You are a financial expert \
-                                   with stock recommendation experience.",
+            "text": text,
+            "chat_global_action": SYSTEM_PROMPT,
             "previous_history": [],
             "temperature": 0.0,
-            "max_tokens": 150,
+            "max_tokens": max_tokens,
             "settings": {"openai": "gpt-3.5-turbo"},
         }
         headers = {
@@ -185,39 +328,127 @@ class NewsScraper:
             "Content-Type": "application/json",
         }
 
-        r = requests.post(url, json=payload, headers=headers)
+        r = requests.post(url, json=payload, headers=headers, timeout=60)
+        # Both go away after a while, so they are retried with backoff
+        if r.status_code == 429 or r.status_code >= 500:
+            raise ProviderLimitationError(f"{r.status_code} {r.reason}")
         data = r.json()["openai"]
 
         if "generated_text" not in data:
             if "error" in data:
                 self.logger.error(f"Error: {data['error']}")
                 if data["error"].get("type") == "ProviderLimitationError":
-                    self.logger.error("Sleeping 30 seconds and retrying")
-                    time.sleep(30)
-                    return self.analyze(ticker, term, headline)
+                    raise ProviderLimitationError(data["error"])
             self.logger.error(f"Invalid response: {data}")
             return
 
-        result = data["generated_text"].split("-")[0].strip()
-        if result == "UNKNOWN":
-            result = "neutral"
-        elif result == "YES":
-            result = "positive"
-        elif result == "NO":
-            result = "negative"
-        else:
-            self.logger.error(f"Invalid result: {result}")
+        return data["generated_text"]
+
+    def analyze(self, ticker, term, headline):
+        """
+        Analyzes a given headline to determine if it is good or bad for the stock price of
+        a given ticker in a specified term.
+
+        Args:
+            ticker (str): The ticker symbol of the stock.
+            term (str): The term or time period for which the analysis is being done.
+            headline (str): The headline to be analyzed.
+
+        Returns:
+            dict: A dictionary containing the analysis result, including the term, ticker,
+            headline, explanation, and result.
+
+        Raises:
+            ProviderLimitationError: If EdenAI rejected the request due to rate limits.
+        """
+        text = self.chat(
+            ANALYSIS_PROMPT.format(ticker=ticker, term=term, headline=headline)
+        )
+        if text is None:
             return
 
-        explanation = "".join(data["generated_text"].split("\n")[1:]).strip()
+        result = parse_verdict(text.split("-")[0])
+        if not result:
+            self.logger.error(f"Invalid result: {text.split('-')[0].strip()}")
+            return
 
-        return {
+        explanation = "".join(text.split("\n")[1:]).strip()
+
+        result = {
             "term": term,
             "ticker": ticker,
             "headline": headline,
             "explanation": explanation,
             "result": result,
         }
+        self.cache.set(result)
+
+        return result
+
+    def analyze_headline(self, tickers, headline):
+        """
+        Analyzes a headline for all its tickers and both terms in one request.
+
+        Tickers missing from the answer, or with an answer that can't be
+        parsed, are analyzed again one term at a time with `analyze`.
+
+        Args:
+            tickers (tuple): The ticker symbols mentioned by the headline.
+            headline (str): The headline to be analyzed.
+
+        Returns:
+            list: Results shaped like the ones returned by `check_headline`.
+
+        Raises:
+            ProviderLimitationError: If EdenAI rejected the request due to
+                rate limits.
+        """
+        text = self.chat(
+            BATCHED_ANALYSIS_PROMPT.format(
+                tickers=", ".join(tickers), headline=headline
+            ),
+            max_tokens=BATCHED_ANALYSIS_TOKENS * len(tickers),
+        )
+        answers = parse_batched_answer(text) if text else {}
+
+        results = []
+
+        for ticker in tickers:
+            terms = {}
+
+            for term in ("short", "long"):
+                answer = answers.get(ticker.upper(), {}).get(term, {})
+                result = parse_verdict(answer.get("answer"))
+
+                if result:
+                    explanation = str(answer.get("explanation") or "").strip()
+                    terms[term] = {
+                        "term": term,
+                        "ticker": ticker,
+                        "headline": headline,
+                        # Same format as the single-term prompt produces
+                        "explanation": f"- {explanation}"
+                        if explanation
+                        else "",
+                        "result": result,
+                    }
+                    self.cache.set(terms[term])
+                else:
+                    self.logger.warning(
+                        f"No batched answer for {ticker} ({term}), "
+                        "falling back to single analysis"
+                    )
+                    terms[term] = self.analysis.call(
+                        self.analyze, ticker, term, headline
+                    )
+
+            if not terms["short"] or not terms["long"]:
+                self.logger.error("Invalid result")
+                continue
+
+            results.append(self._combine_terms(terms["short"], terms["long"]))
+
+        return results
 
     def check_headline(self, ticker, headline):
         """
@@ -241,53 +472,179 @@ class NewsScraper:
                     - short (str): The explanation for the short term sentiment score.
                     - long (str): The explanation for the long term sentiment score.
         """
-        result_short = self.analyze(ticker, "short", headline)
-        result_long = self.analyze(ticker, "long", headline)
+        result_short = self.cache.get(
+            ticker, "short", headline
+        ) or self.analysis.call(self.analyze, ticker, "short", headline)
+        result_long = self.cache.get(
+            ticker, "long", headline
+        ) or self.analysis.call(self.analyze, ticker, "long", headline)
 
         if not result_short or not result_long:
             self.logger.error("Invalid result")
             return
 
+        return self._combine_terms(result_short, result_long)
+
+    def check_headlines(self, data):
+        """
+        Analyzes every ticker of every article concurrently.
+
+        Args:
+            data (list): A list of scraped articles.
+
+        Yields:
+            dict: Results shaped like the ones returned by `check_headline`, in
+                the order their analysis finishes.
+        """
+        calls = dict.fromkeys(
+            (ticker, term, item["headline"])
+            for item in data
+            for ticker in item["ticker"]
+            for term in ("short", "long")
+        )
+        pending = {}
+        misses = []
+
+        for ticker, term, headline in calls:
+            if result := self.cache.get(ticker, term, headline):
+                pending.setdefault((ticker, headline), {})[term] = result
+            else:
+                misses.append((ticker, term, headline))
+
+        for (ticker, headline), terms in list(pending.items()):
+            if len(terms) == 2:
+                del pending[(ticker, headline)]
+                yield self._combine_terms(terms["short"], terms["long"])
+
+        if BATCHED_ANALYSIS:
+            headlines = {}
+            for ticker, _, headline in misses:
+                headlines.setdefault(headline, {})[ticker] = None
+
+            for _, results in self.analysis.map(
+                self.analyze_headline,
+                [
+                    (tuple(tickers), headline)
+                    for headline, tickers in headlines.items()
+                ],
+            ):
+                yield from results or []
+
+            return
+
+        for (ticker, term, headline), result in self.analysis.map(
+            self.analyze, misses
+        ):
+            terms = pending.setdefault((ticker, headline), {})
+            terms[term] = result
+
+            if len(terms) < 2:
+                continue
+
+            del pending[(ticker, headline)]
+
+            if not terms["short"] or not terms["long"]:
+                self.logger.error("Invalid result")
+                continue
+
+            yield self._combine_terms(terms["short"], terms["long"])
+
+    @staticmethod
+    def _combine_terms(result_short, result_long):
         return {
             "term": {
                 "short": result_short["result"],
                 "long": result_long["result"],
             },
-            "ticker": ticker,
-            "headline": headline,
+            "ticker": result_short["ticker"],
+            "headline": result_short["headline"],
             "explanation": {
                 "short": result_short["explanation"],
                 "long": result_long["explanation"],
             },
         }
 
+    def filter_seen(self, data):
+        """
+        Filters out tickers of articles that were already processed recently.
+
+        Args:
+            data (list): A list of scraped articles.
+
+        Returns:
+            list: Articles that have at least one ticker not seen yet, with
+                `ticker` narrowed down to those tickers.
+        """
+        unseen = []
+
+        for item in data:
+            tickers = [
+                ticker
+                for ticker in item["ticker"]
+                if (ticker, item["headline"]) not in self.seen
+            ]
+            if tickers:
+                unseen.append({**item, "ticker": tickers})
+
+        return unseen
+
     def check_for_unique(self, data):
         """
-        Checks a list of dictionaries for unique values for a given key.
+        Filters out scraped articles that are already stored in the database.
+
+        All (ticker, headline) pairs are looked up in bulk, so a whole cycle
+        costs a single request (or one per `LOOKUP_BATCH_SIZE` pairs).
 
         Args:
-            data (list): A list of dictionaries.
+            data (list): A list of scraped articles.
 
         Returns:
-            list: A list of dictionaries containing unique values for the given key.
+            list: Articles that have at least one ticker not stored yet, with
+                `ticker` narrowed down to those new tickers.
         """
+        pairs = list(
+            dict.fromkeys(
+                (ticker, item["headline"])
+                for item in data
+                for ticker in item["ticker"]
+            )
+        )
 
-        unique = []
+        existing = set()
 
-        for item in data:
-            r = requests.get(
-                self.API_URL,
-                params={
-                    "headline": item["headline"],
-                    "ticker": item["ticker"],
+        for index in range(0, len(pairs), LOOKUP_BATCH_SIZE):
+            batch = pairs[index : index + LOOKUP_BATCH_SIZE]
+            r = requests.post(
+                f"{self.API_URL}/exists",
+                json={
+                    "items": [
+                        {"ticker": ticker, "headline": headline}
+                        for ticker, headline in batch
+                    ]
                 },
                 headers={
                     "x-secret": self.API_SECRET,
                 },
             )
 
-            if r.json()["count"] == 0:
-                unique.append(item)
+            existing.update(
+                (item["ticker"], item["headline"])
+                for item in r.json()["existing"]
+            )
+
+        for ticker, headline in existing:
+            self.seen.add(ticker, headline)
+
+        unique = []
+
+        for item in data:
+            tickers = [
+                ticker
+                for ticker in item["ticker"]
+                if (ticker, item["headline"]) not in existing
+            ]
+            if tickers:
+                unique.append({**item, "ticker": tickers})
 
         return unique
 
@@ -295,13 +652,25 @@ class NewsScraper:
         """
         Inserts the given data into the database.
 
+        Both terms of every item are sent in batches of up to
+        `INSERT_BATCH_SIZE` rows, each written by the API in one transaction.
+
         Args:
-            data (list): A list of dictionaries containing the data to be inserted.
+            data (list): A list of dictionaries containing the data to be
+                inserted.
 
         Returns:
-            (int): The number of items inserted.
+            (list): The items with at least one term created, items that
+                were stored before or rejected as invalid are left out.
+
+        Raises:
+            requests.HTTPError: If the API fails to write a batch.
         """
-        for item in data:
+        payloads = []
+        # Position in `data` of every payload, items have a payload per term
+        positions = []
+
+        for position, item in enumerate(data):
             payload_short = {
                 "term": "short",
                 "result": item["term"]["short"],
@@ -316,16 +685,33 @@ class NewsScraper:
                 "headline": item["headline"],
                 "explanation": item["explanation"]["long"],
             }
-            payloads = [payload_short, payload_long]
+            payloads.extend([payload_short, payload_long])
+            positions.extend([position, position])
 
-            headers = {
-                "x-secret": self.API_SECRET,
-            }
+        headers = {
+            "x-secret": self.API_SECRET,
+        }
+
+        created = set()
 
-            for payload in payloads:
-                requests.post(self.API_URL, json=payload, headers=headers)
+        for index in range(0, len(payloads), INSERT_BATCH_SIZE):
+            r = requests.post(
+                f"{self.API_URL}/batch",
+                json=payloads[index : index + INSERT_BATCH_SIZE],
+                headers=headers,
+            )
+            r.raise_for_status()
 
-        return len(data) * 2
+            for position, result in zip(
+                positions[index : index + INSERT_BATCH_SIZE],
+                r.json()["results"],
+            ):
+                if result["status"] == "created":
+                    created.add(position)
+
+        return [
+            item for position, item in enumerate(data) if position in created
+        ]
 
     def scrape(self, with_a: bool = True):
         """
@@ -388,31 +774,57 @@ class NewsScraper:
                 f"//div[{index + 1}]/{'a' if with_a else 'div'}/div/div[1]/div/span",
             ).text
 
-            self.logger.info(f"Scraped timestamp: {timestamp}")
-
             headline = article.find_element(
                 By.XPATH,
                 f"//div[{index + 1}]/{'a' if with_a else 'div'}/div/div[3]/div/span[1]",
             ).text
 
-            self.logger.info(f"Scraped headline: {headline}")
+            if data := self._build_article(tickers, timestamp, headline):
+                results.append(data)
+
+        if results:
+            self.logger.info(f"Scraped {len(results)} articles")
+        else:
+            self.logger.warning("No articles scraped")
+
+        return results
+
+    def scrape_all(self):
+        """
+        Scrape articles in both HTML layouts in a single WebDriver round trip.
+
+        All the text is collected in the browser by `EXTRACT_ARTICLES_SCRIPT`
+        and returned as JSON; filtering and timestamp parsing happen in Python.
+
+        Returns:
+            list: Scraped articles, same as `scrape` returns for both layouts.
+        """
+        self.logger.debug("Scraping newsfilter.io")
+
+        results = []
+
+        # None if the page has no articles yet
+        articles = self.driver.execute_script(EXTRACT_ARTICLES_SCRIPT) or []
+
+        for article in articles:
+            tickers = article.get("tickers") or []
 
-            if not timestamp or not headline:
-                self.logger.debug("Invalid timestamp or headline")
+            if article.get("layout") == "a":
+                tickers = tickers[:-1]
+            elif article.get("layout") == "div":
+                tickers = tickers[:1]
+            else:
                 continue
 
-            try:
-                datetime_obj = convert_relative_timestamp(timestamp)
-            except ValueError:
-                self.logger.debug("Invalid timestamp")
+            if not tickers or " " in tickers or "" in tickers:
                 continue
 
-            data = {
-                "timestamp": datetime_obj,
-                "ticker": tickers,
-                "headline": headline,
-            }
-            results.append(data)
+            self.logger.info(f"Scraped tickers: {tickers}")
+
+            if data := self._build_article(
+                tickers, article.get("timestamp"), article.get("headline")
+            ):
+                results.append(data)
 
         if results:
             self.logger.info(f"Scraped {len(results)} articles")
@@ -421,6 +833,91 @@ class NewsScraper:
 
         return results
 
+    def _build_article(self, tickers, timestamp, headline):
+        self.logger.info(f"Scraped timestamp: {timestamp}")
+        self.logger.info(f"Scraped headline: {headline}")
+
+        if not timestamp or not headline:
+            self.logger.debug("Invalid timestamp or headline")
+            return
+
+        try:
+            datetime_obj = convert_relative_timestamp(timestamp)
+        except ValueError:
+            self.logger.debug("Invalid timestamp")
+            return
+
+        return {
+            "timestamp": datetime_obj,
+            "ticker": tickers,
+            "headline": headline,
+        }
+
+    def scrape_page(self):
+        """
+        Scrape articles in both HTML layouts with the configured `SCRAPE_MODE`.
+
+        Returns:
+            list: Scraped articles.
+        """
+        if SCRAPE_MODE == "script":
+            return self.scrape_all()
+
+        data = []
+
+        self.logger.info("Scraping with a tag")
+        data.extend(self.scrape())
+
+        self.logger.info("Scraping without a tag")
+        data.extend(self.scrape(with_a=False))
+
+        return data
+
+    def compare_extraction(self, rounds=5):
+        """
+        Times scraping the current page with XPath lookups and with a script.
+
+        Args:
+            rounds (int): How many times to scrape the page with each method.
+
+        Returns:
+            dict: Mean seconds per page and articles found for both methods.
+        """
+        timings = {}
+
+        for name, scrape in (
+            ("xpath", lambda: self.scrape() + self.scrape(with_a=False)),
+            ("script", self.scrape_all),
+        ):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                articles = scrape()
+            timings[name] = {
+                "seconds": (time.perf_counter() - start) / rounds,
+                "articles": len(articles),
+            }
+
+        self.logger.info(
+            f"XPath extraction: {timings['xpath']['seconds']:.3f}s "
+            f"({timings['xpath']['articles']} articles), "
+            f"script extraction: {timings['script']['seconds']:.3f}s "
+            f"({timings['script']['articles']} articles)"
+        )
+
+        return timings
+
+    def run_extraction_comparison(self, rounds=5):
+        """Opens the news page once and runs `compare_extraction` on it."""
+        with uc.Chrome(
+            options=self.options,
+            driver_executable_path=get_chromedriver_path(),
+        ) as self.driver:
+            self.setup()
+            self.driver.execute_script("location.reload(true);")
+            time.sleep(4)
+
+            return self.compare_extraction(rounds)
+
     def run(self):
         try:
             with uc.Chrome(
@@ -429,59 +926,20 @@ class NewsScraper:
             ) as self.driver:
                 self.setup()
 
-                while True:
-                    self.driver.execute_script("location.reload(true);")
-                    time.sleep(4)
-
-                    data = []
-
-                    self.logger.info("Scraping with a tag")
-                    d = self.scrape()
-                    data.extend(d)
-
-                    self.logger.info("Scraping without a tag")
-                    d = self.scrape(with_a=False)
-                    data.extend(d)
-
-                    data = self.check_for_unique(data)
-
-                    self.logger.info(
-                        f"Found {len(data)} new articles"
-                        if len(data) > 0
-                        else "No new articles found"
-                    )
-                    if data:
-                        results = []
-                        for index, _item in enumerate(data):
-                            self.logger.info(
-                                f"Analyzing {index + 1}/{len(data)}"
-                            )
-
-                            ticker_list = _item["ticker"]
-                            headline = _item["headline"]
-                            for ticker in ticker_list:
-                                result = self.check_headline(ticker, headline)
-                                if not result:
-                                    continue
-                                results.append(result)
-
-                                self.logger.info(
-                                    "Sending result to telegram chat"
-                                )
-                                listener.call("unique_data", item=result)
-
-                        self.logger.info("Inserting results into database")
-                        self.insert_results(results)
-
-                    self.logger.info(f"Sleeping for {INTERVAL} seconds")
-                    telegram_bot.send_message(
-                        os.getenv("QUANTEX_TELEGRAM_CHAT_ID"),
-                        f"Sleeping until {time.strftime('%H:%M', time.localtime(time.time() + INTERVAL))} UTC",
-                    )
-                    time.sleep(INTERVAL)
+                ScraperPipeline(
+                    self,
+                    listener,
+                    INTERVAL,
+                    analyzer_workers=ANALYSIS_WORKERS,
+                ).run()
         except Exception as e:
             traceback.print_exc()
             self.logger.error("An error occurred: %s", str(e))
+        finally:
+            self.analysis.shutdown()
+            self.cache.close()
+            listener.drain(timeout=30)
+            telegram_bot.close(timeout=30)
 
 
 def preconfigure():
@@ -546,11 +1004,16 @@ def on_unique_data(item: list):
         if payload["explanation"]:
             message += f"Explanation: {payload['explanation'].strip()[2:]}"
 
-        r = telegram_bot.send_message(
-            os.getenv("QUANTEX_TELEGRAM_CHAT_ID"), message
-        )
+        telegram_bot.enqueue(os.getenv("QUANTEX_TELEGRAM_CHAT_ID"), message)
+
 
-        logging.info(r)
+@listener.on("poll_finished")
+def on_poll_finished(next_poll: float):
+    telegram_bot.enqueue(
+        os.getenv("QUANTEX_TELEGRAM_CHAT_ID"),
+        "Sleeping until "
+        f"{time.strftime('%H:%M', time.localtime(next_poll))} UTC",
+    )
 
 
 if __name__ == "__main__":
@@ -563,4 +1026,9 @@ if __name__ == "__main__":
     )
 
     _user, _password, _edenai_key = preconfigure()
-    NewsScraper(_user, _password, _edenai_key).run()
+    scraper = NewsScraper(_user, _password, _edenai_key)
+
+    if "--compare-extraction" in sys.argv[1:]:
+        scraper.run_extraction_comparison()
+    else:
+        scraper.run()
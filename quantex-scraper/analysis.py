@@ -0,0 +1,85 @@
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from .ratelimit import TokenBucket
+
+
+class ProviderLimitationError(Exception):
+    """Raised when the analysis provider is over rate limits or failing."""
+
+
+class AnalysisExecutor:
+    """
+    Runs analysis calls concurrently under a shared rate limiter.
+
+    Every call takes a token from the shared bucket before it is made. When the
+    provider reports a limitation, the whole bucket is paused with exponential
+    backoff and the call is retried, so other workers back off as well.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: TokenBucket,
+        max_workers: int = 4,
+        max_retries: int = 5,
+        backoff_base: float = 2.0,
+        backoff_max: float = 60.0,
+    ):
+        self.rate_limiter = rate_limiter
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.logger = logging.getLogger(__name__)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="analysis"
+        )
+
+    def call(self, func: Callable[..., Any], *args) -> Optional[Any]:
+        """
+        Calls `func` with `args` in the current thread, respecting rate limits.
+
+        Returns:
+            The result of `func`, or None if it failed or retries ran out.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+
+            try:
+                return func(*args)
+            except ProviderLimitationError:
+                delay = min(
+                    self.backoff_max, self.backoff_base * 2**attempt
+                ) * random.uniform(0.5, 1.0)
+                self.logger.warning(
+                    f"Provider limitation, backing off for {delay:.1f} seconds"
+                )
+                self.rate_limiter.pause(delay)
+            except Exception:
+                self.logger.exception(f"Analysis of {args} failed")
+                return None
+
+        self.logger.error(f"Giving up on {args} after {attempt + 1} attempts")
+        return None
+
+    def map(
+        self, func: Callable[..., Any], calls: Iterable[Tuple]
+    ) -> Iterator[Tuple[Tuple, Optional[Any]]]:
+        """
+        Runs `func` for every argument tuple in `calls` on the worker pool.
+
+        Yields:
+            (args, result) pairs in the order the calls finish.
+        """
+        futures = {
+            self._pool.submit(self.call, func, *args): args for args in calls
+        }
+
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
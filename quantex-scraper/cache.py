@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+import time
+
+
+def normalize_headline(headline: str) -> str:
+    """Collapse whitespace and casing, so republished headlines match."""
+    return " ".join(headline.split()).lower()
+
+
+class AnalysisCache:
+    """
+    Disk-backed cache of analysis results.
+
+    Results are keyed by (ticker, term, normalized headline) and kept in a
+    SQLite database, so they survive scraper restarts. Once the cache holds
+    more than `max_entries` results, the least recently used ones are evicted.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        self.path = path
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS analysis (
+                ticker TEXT NOT NULL,
+                term TEXT NOT NULL,
+                headline TEXT NOT NULL,
+                result TEXT NOT NULL,
+                explanation TEXT NOT NULL,
+                used_at REAL NOT NULL,
+                PRIMARY KEY (ticker, term, headline)
+            );
+            CREATE INDEX IF NOT EXISTS analysis_used_at_idx
+                ON analysis (used_at);
+            """
+        )
+        self._size = self._db.execute(
+            "SELECT COUNT(*) FROM analysis"
+        ).fetchone()[0]
+
+    @staticmethod
+    def _key(ticker: str, term: str, headline: str):
+        return ticker.upper(), term, normalize_headline(headline)
+
+    def get(self, ticker: str, term: str, headline: str):
+        """
+        Get a cached result of `NewsScraper.analyze`.
+
+        Returns:
+            dict: The cached result for the given `headline`, or None.
+        """
+        key = self._key(ticker, term, headline)
+
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT result, explanation FROM analysis "
+                "WHERE ticker = ? AND term = ? AND headline = ?",
+                key,
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return
+
+            self.hits += 1
+            self._db.execute(
+                "UPDATE analysis SET used_at = ? "
+                "WHERE ticker = ? AND term = ? AND headline = ?",
+                (time.time(), *key),
+            )
+
+        return {
+            "term": term,
+            "ticker": ticker,
+            "headline": headline,
+            "explanation": row[1],
+            "result": row[0],
+        }
+
+    def set(self, result: dict):
+        """Store a result of `NewsScraper.analyze`."""
+        key = self._key(result["ticker"], result["term"], result["headline"])
+
+        with self._lock, self._db:
+            inserted = self._db.execute(
+                "INSERT OR IGNORE INTO analysis VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, result["result"], result["explanation"], time.time()),
+            ).rowcount
+            self._size += inserted
+
+            if self._size > self.max_entries:
+                self._size -= self._db.execute(
+                    "DELETE FROM analysis WHERE rowid IN ("
+                    "SELECT rowid FROM analysis ORDER BY used_at LIMIT ?)",
+                    (self._size - self.max_entries,),
+                ).rowcount
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": self._size}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
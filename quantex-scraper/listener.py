@@ -1,17 +1,199 @@
+import asyncio
+import collections
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+
 class EventListener:
-    def __init__(self):
+    """
+    Registry of event handlers.
+
+    Handlers can be plain functions or coroutine functions. `call` runs them
+    inline and waits for them, while `emit` dispatches them and returns right
+    away: plain functions run on a thread pool, coroutines on an event loop
+    running in a background thread. `drain` waits for everything emitted.
+
+    Runs of a limited event over its limit wait in a queue of that event, so
+    they don't hold pool threads needed by other events.
+    """
+
+    def __init__(self, max_workers: int = 8):
         self.listeners = {}
+        self.max_workers = max_workers
+
+        self.logger = logging.getLogger(__name__)
+
+        self._limits = {}
+        # Runs of limited events that are submitted, and ones that wait
+        self._running = collections.Counter()
+        self._waiting = collections.defaultdict(collections.deque)
+        self._async_semaphores = {}
+        self._executor = None
+        self._loop = None
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    def on(self, event, max_concurrency: int = None):
+        """
+        Registers the decorated function as a handler of `event`.
+
+        Args:
+            event (str): The event name.
+            max_concurrency (int): Maximum number of handler runs of this event
+                at the same time when dispatched with `emit`.
+        """
 
-    def on(self, event):
         def decorator(func):
             if event not in self.listeners:
                 self.listeners[event] = []
             self.listeners[event].append(func)
             return func
 
+        if max_concurrency is not None:
+            self.limit(event, max_concurrency)
+
         return decorator
 
+    def limit(self, event, max_concurrency: int):
+        """Limits handler runs of `event` dispatched with `emit`."""
+        self._limits[event] = max_concurrency
+
     def call(self, event, *args, **kwargs):
         if event in self.listeners:
             for listener in self.listeners[event]:
-                listener(*args, **kwargs)
+                if asyncio.iscoroutinefunction(listener):
+                    asyncio.run_coroutine_threadsafe(
+                        listener(*args, **kwargs), self._get_loop()
+                    ).result()
+                else:
+                    listener(*args, **kwargs)
+
+    def emit(self, event, *args, **kwargs):
+        """
+        Dispatches all handlers of `event` without waiting for them.
+
+        Returns:
+            list: A `concurrent.futures.Future` for every handler.
+        """
+        futures = []
+
+        for listener in self.listeners.get(event, []):
+            if asyncio.iscoroutinefunction(listener):
+                future = asyncio.run_coroutine_threadsafe(
+                    self._run_async(event, listener, *args, **kwargs),
+                    self._get_loop(),
+                )
+            else:
+                future = self._submit(event, listener, args, kwargs)
+
+            with self._lock:
+                self._pending.add(future)
+            future.add_done_callback(self._done)
+            futures.append(future)
+
+        return futures
+
+    def drain(self, timeout: float = None):
+        """
+        Waits for all emitted handlers, then stops the workers.
+
+        Returns:
+            bool: True if all handlers finished within `timeout`.
+        """
+        with self._lock:
+            pending = set(self._pending)
+
+        _, not_done = wait(pending, timeout=timeout)
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+            loop, self._loop = self._loop, None
+            self._async_semaphores = {}
+
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+        return not not_done
+
+    def _submit(self, event, listener, args, kwargs) -> Future:
+        future = Future()
+
+        with self._lock:
+            if event in self._limits:
+                if self._running[event] >= self._limits[event]:
+                    self._waiting[event].append(
+                        (future, listener, args, kwargs)
+                    )
+                    return future
+                self._running[event] += 1
+
+        self._get_executor().submit(
+            self._run, event, future, listener, args, kwargs
+        )
+        return future
+
+    def _run(self, event, future, listener, args, kwargs):
+        if future.set_running_or_notify_cancel():
+            try:
+                result = listener(*args, **kwargs)
+            except BaseException as error:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        if event not in self._limits:
+            return
+
+        # Hand the slot over to the next waiting run, if any
+        with self._lock:
+            if not self._waiting[event]:
+                self._running[event] -= 1
+                return
+            waiting = self._waiting[event].popleft()
+
+        self._get_executor().submit(self._run, event, *waiting)
+
+    async def _run_async(self, event, listener, *args, **kwargs):
+        if event not in self._limits:
+            return await listener(*args, **kwargs)
+
+        # Only touched from the loop thread, so no locking is needed
+        if event not in self._async_semaphores:
+            self._async_semaphores[event] = asyncio.Semaphore(
+                self._limits[event]
+            )
+
+        async with self._async_semaphores[event]:
+            return await listener(*args, **kwargs)
+
+    def _done(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
+
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error(
+                "Event handler failed", exc_info=future.exception()
+            )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="listener",
+                )
+            return self._executor
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="listener-loop",
+                    daemon=True,
+                ).start()
+            return self._loop
@@ -0,0 +1,260 @@
+import logging
+import queue
+import threading
+import time
+
+
+class ScraperPipeline:
+    """
+    Runs the scraper as stages connected by bounded queues.
+
+    The poller reloads and scrapes the page every `interval` seconds and hands
+    the articles over to the dedup stage. Unique articles are analyzed by a
+    pool of analyzer threads, their results go to the DB writer and, once
+    created, to the notifier. Every queue is bounded, so a slow stage blocks
+    the one before it instead of piling up work, while the poller keeps its
+    own cadence. On shutdown, queued events are still sent and queued
+    results still written.
+    """
+
+    def __init__(
+        self,
+        scraper,
+        listener,
+        interval: float,
+        analyzer_workers: int = 4,
+        queue_size: int = 256,
+        write_batch_size: int = 100,
+        write_delay: float = 1.0,
+    ):
+        self.scraper = scraper
+        self.listener = listener
+        self.interval = interval
+        self.analyzer_workers = analyzer_workers
+        self.write_batch_size = write_batch_size
+        self.write_delay = write_delay
+
+        self.logger = logging.getLogger(__name__)
+
+        self.queues = {
+            "dedup": queue.Queue(maxsize=4),
+            "analysis": queue.Queue(maxsize=queue_size),
+            "writer": queue.Queue(maxsize=queue_size),
+            "notifier": queue.Queue(maxsize=queue_size),
+        }
+
+        self._stop = threading.Event()
+        self._threads = []
+        # (ticker, headline) pairs that were queued, but not stored yet
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+
+    def depths(self) -> dict:
+        """Number of items waiting in front of every stage."""
+        return {name: q.qsize() for name, q in self.queues.items()}
+
+    def _put(self, name: str, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self.queues[name].put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _drain(self, name: str) -> list:
+        items = []
+        while (item := self._get(name, timeout=0)) is not None:
+            items.append(item)
+        return items
+
+    def _get(self, name: str, timeout: float = 1):
+        try:
+            return self.queues[name].get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _release(self, pairs):
+        with self._in_flight_lock:
+            self._in_flight.difference_update(pairs)
+
+    def _stage(self, name, func):
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    func()
+                except Exception:
+                    self.logger.exception(f"Stage {name} failed")
+
+        thread = threading.Thread(target=loop, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _dedup(self):
+        data = self._get("dedup")
+        if not data:
+            return
+
+        with self._in_flight_lock:
+            data = [
+                {
+                    **item,
+                    "ticker": [
+                        ticker
+                        for ticker in item["ticker"]
+                        if (ticker, item["headline"]) not in self._in_flight
+                    ],
+                }
+                for item in data
+            ]
+            data = [item for item in data if item["ticker"]]
+            pairs = {
+                (ticker, item["headline"])
+                for item in data
+                for ticker in item["ticker"]
+            }
+            self._in_flight.update(pairs)
+
+        try:
+            unique = self.scraper.check_for_unique(data) if data else []
+        except Exception:
+            self._release(pairs)
+            raise
+
+        self._release(
+            pairs
+            - {
+                (ticker, item["headline"])
+                for item in unique
+                for ticker in item["ticker"]
+            }
+        )
+
+        self.logger.info(
+            f"Found {len(unique)} new articles"
+            if unique
+            else "No new articles found"
+        )
+
+        for item in unique:
+            self._put("analysis", item)
+
+    def _analyze(self):
+        item = self._get("analysis")
+        if not item:
+            return
+
+        analyzed = set()
+
+        try:
+            for result in self.scraper.check_headlines([item]):
+                analyzed.add(result["ticker"])
+                self._put("writer", result)
+        finally:
+            # Failed tickers are retried on one of the next polls
+            self._release(
+                (ticker, item["headline"])
+                for ticker in item["ticker"]
+                if ticker not in analyzed
+            )
+
+    def _write(self):
+        result = self._get("writer")
+        if not result:
+            return
+
+        results = [result]
+        deadline = time.monotonic() + self.write_delay
+
+        while len(results) < self.write_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not (
+                result := self._get("writer", remaining)
+            ):
+                break
+            results.append(result)
+
+        pairs = [(result["ticker"], result["headline"]) for result in results]
+
+        try:
+            self.logger.info(f"Inserting {len(results)} results into database")
+            created = self.scraper.insert_results(results)
+
+            for ticker, headline in pairs:
+                self.scraper.seen.add(ticker, headline)
+        finally:
+            self._release(pairs)
+
+        # Only created results are sent, failed ones are analyzed again later
+        for result in created:
+            event = ("unique_data", {"item": result})
+            if not self._put("notifier", event):
+                # Stopping, the notifier is done already
+                self.listener.emit(event[0], **event[1])
+
+    def _notify(self):
+        event = self._get("notifier")
+        if not event:
+            return
+
+        name, kwargs = event
+        self.listener.emit(name, **kwargs)
+
+    def _poll(self):
+        self.scraper.driver.execute_script("location.reload(true);")
+        time.sleep(4)
+
+        data = self.scraper.scrape_page()
+        data = self.scraper.filter_seen(data)
+
+        if data:
+            self._put("dedup", data)
+
+        self.logger.info(f"Queue depths: {self.depths()}")
+
+        stats = self.scraper.cache.stats()
+        self.logger.info(
+            f"Analysis cache: {stats['hits']} hits, "
+            f"{stats['misses']} misses, {stats['size']} entries"
+        )
+
+    def run(self):
+        """Starts all stages and polls the page until an error occurs."""
+        self._stage("dedup", self._dedup)
+        for index in range(self.analyzer_workers):
+            self._stage(f"analyzer-{index}", self._analyze)
+        self._stage("writer", self._write)
+        self._stage("notifier", self._notify)
+
+        try:
+            while True:
+                self._poll()
+
+                self.logger.info(f"Sleeping for {self.interval} seconds")
+                self._put(
+                    "notifier",
+                    (
+                        "poll_finished",
+                        {"next_poll": time.time() + self.interval},
+                    ),
+                )
+                time.sleep(self.interval)
+        finally:
+            self._stop.set()
+            for thread in self._threads:
+                thread.join()
+
+            self._flush()
+
+    def _flush(self):
+        events = self._drain("notifier")
+        if events:
+            self.logger.info(f"Sending {len(events)} remaining events")
+        for name, kwargs in events:
+            self.listener.emit(name, **kwargs)
+
+        results = self._drain("writer")
+        if results:
+            self.logger.info(f"Inserting {len(results)} remaining results")
+            for result in self.scraper.insert_results(results):
+                self.listener.emit("unique_data", item=result)
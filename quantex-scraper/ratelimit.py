@@ -0,0 +1,61 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are refilled continuously at `rate` per second, up to `capacity`.
+    Every consumer sharing the bucket can also pause it, e.g. after the remote
+    side reported that we are going too fast.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        """
+        Takes `tokens` from the bucket if they are available.
+
+        Returns:
+            float: 0 if tokens were taken, otherwise seconds to wait before
+                trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            self._refill(now)
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: int = 1):
+        """Blocks until `tokens` are taken from the bucket."""
+        while wait := self.try_acquire(tokens):
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stops handing out tokens for the next `seconds` seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated_at = self._paused_until
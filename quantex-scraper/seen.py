@@ -0,0 +1,105 @@
+import hashlib
+import math
+import threading
+import time
+
+from .cache import normalize_headline
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for `capacity` keys at `error_rate`."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.num_bits = math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class SeenSet:
+    """
+    Time-windowed set of already processed (ticker, headline) pairs.
+
+    Pairs are kept in two Bloom filter generations. The current generation is
+    retired every `window` seconds, or once it holds `capacity` pairs, so a
+    pair is remembered for one to two windows and memory stays bounded no
+    matter how long the scraper runs. False positives happen at roughly
+    `error_rate`.
+    """
+
+    def __init__(
+        self,
+        window: float = 6 * 60 * 60,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+    ):
+        self.window = window
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self._lock = threading.Lock()
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous = BloomFilter(capacity, error_rate)
+        self._rotated_at = time.monotonic()
+
+    @staticmethod
+    def _fingerprint(ticker: str, headline: str) -> str:
+        return f"{ticker.upper()}\x1f{normalize_headline(headline)}"
+
+    def _rotate(self):
+        now = time.monotonic()
+
+        if (
+            now - self._rotated_at >= self.window
+            or self._current.count >= self.capacity
+        ):
+            self._previous = self._current
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._rotated_at = now
+
+    def add(self, ticker: str, headline: str):
+        key = self._fingerprint(ticker, headline)
+
+        with self._lock:
+            self._rotate()
+            if key not in self._current:
+                self._current.add(key)
+
+    def __contains__(self, pair) -> bool:
+        key = self._fingerprint(*pair)
+
+        with self._lock:
+            self._rotate()
+
+            if key in self._current:
+                return True
+
+            if key in self._previous:
+                # Keep pairs that are still around from expiring
+                self._current.add(key)
+                return True
+
+            return False
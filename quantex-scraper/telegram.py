@@ -1,13 +1,163 @@
 # This is my implementation for the Telegram API
+import logging
+import queue
+import threading
+import time
+
 import requests
 
+from .ratelimit import TokenBucket
+
 
 class TelegramBot:
-    def __init__(self, token):
+    """
+    Telegram bot API client.
+
+    Messages can be sent synchronously with `send_message`, or handed over to
+    a background worker with `enqueue`. Both share one keep-alive HTTP session
+    and respect Telegram's limits: about 30 messages per second overall and 20
+    per minute in a single group or channel.
+    """
+
+    def __init__(
+        self,
+        token,
+        chat_rate: float = 20 / 60,
+        global_rate: float = 30,
+        max_retries: int = 3,
+        queue_size: int = 1000,
+        timeout: float = 10,
+    ):
         self.token = token
         self.api_url = f"https://api.telegram.org/bot{token}/"
 
+        self.chat_rate = chat_rate
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self.logger = logging.getLogger(__name__)
+        self.session = requests.Session()
+
+        self._global_bucket = TokenBucket(
+            global_rate, capacity=int(global_rate)
+        )
+        self._chat_buckets = {}
+        self._buckets_lock = threading.Lock()
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def _chat_bucket(self, chat: str) -> TokenBucket:
+        with self._buckets_lock:
+            if chat not in self._chat_buckets:
+                self._chat_buckets[chat] = TokenBucket(self.chat_rate, 3)
+            return self._chat_buckets[chat]
+
     def send_message(self, chat: str, text: str):
+        """
+        Sends a message, waiting for rate limits and retrying when throttled.
+
+        Returns:
+            dict: The Telegram API response.
+        """
         data = {"chat_id": chat, "text": text, "parse_mode": "markdown"}
-        r = requests.post(f"{self.api_url}sendMessage", data=data)
-        return r.json()
+        bucket = self._chat_bucket(chat)
+
+        for _ in range(self.max_retries + 1):
+            bucket.acquire()
+            self._global_bucket.acquire()
+
+            r = self.session.post(
+                f"{self.api_url}sendMessage", data=data, timeout=self.timeout
+            )
+            response = r.json()
+
+            if r.status_code != 429:
+                return response
+
+            retry_after = response.get("parameters", {}).get("retry_after", 1)
+            self.logger.warning(
+                "Telegram rate limit hit, "
+                f"retrying after {retry_after} seconds"
+            )
+            bucket.pause(retry_after)
+
+        return response
+
+    def enqueue(self, chat: str, text: str) -> bool:
+        """
+        Queues a message to be sent by the background worker.
+
+        Returns:
+            bool: False if the queue is full and the message was dropped.
+        """
+        self._ensure_worker()
+
+        try:
+            self._queue.put_nowait((chat, text))
+        except queue.Full:
+            self.logger.error("Telegram queue is full, dropping message")
+            return False
+
+        return True
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._work, name="telegram", daemon=True
+                )
+                self._worker.start()
+
+    def _work(self):
+        while True:
+            message = self._queue.get()
+
+            try:
+                if message is None:
+                    return
+
+                response = self.send_message(*message)
+                if not response.get("ok"):
+                    self.logger.error(f"Telegram error: {response}")
+            except Exception:
+                self.logger.exception("Sending Telegram message failed")
+            finally:
+                self._queue.task_done()
+
+    def close(self, timeout: float = None):
+        """
+        Sends all queued messages, then stops the worker.
+
+        Messages that aren't sent within `timeout` seconds are dropped. The
+        HTTP session is only closed once the worker stopped, so a message
+        being sent doesn't fail on a closed session.
+        """
+        with self._worker_lock:
+            worker = self._worker
+
+        if worker is not None and worker.is_alive():
+            deadline = None if timeout is None else time.monotonic() + timeout
+
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                self.logger.error(
+                    f"Telegram queue not sent within {timeout} seconds, "
+                    f"dropping {self._queue.qsize()} messages"
+                )
+            else:
+                worker.join(
+                    None
+                    if deadline is None
+                    else max(deadline - time.monotonic(), 0)
+                )
+
+            if worker.is_alive():
+                self.logger.error(
+                    "Telegram worker didn't stop, leaving its session open"
+                )
+                return
+
+        self.session.close()
@@ -0,0 +1,22 @@
+import importlib
+
+import pytest
+
+scraper_main = importlib.import_module("quantex-scraper.__main__")
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    """
+    Create a scraper with an empty analysis cache and no browser.
+
+    :yield: the scraper.
+    """
+    monkeypatch.setattr(
+        scraper_main, "ANALYSIS_CACHE_PATH", str(tmp_path / "analysis.db")
+    )
+    scraper = scraper_main.NewsScraper("user", "password", "key")
+    try:
+        yield scraper
+    finally:
+        scraper.analysis.shutdown()
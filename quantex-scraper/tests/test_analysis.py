@@ -0,0 +1,93 @@
+import importlib
+import json
+
+import pytest
+
+scraper_main = importlib.import_module("quantex-scraper.__main__")
+
+
+def test_parse_batched_answer():
+    """Checks that answers are parsed from prose and code blocks."""
+    text = (
+        "Here you go:\n```json\n"
+        + json.dumps(
+            {
+                "aapl": {
+                    "short": {"answer": "YES", "explanation": "Good."},
+                    "long": "not an answer",
+                },
+                "MSFT": "not an answer",
+            }
+        )
+        + "\n```"
+    )
+
+    assert scraper_main.parse_batched_answer(text) == {
+        "AAPL": {"short": {"answer": "YES", "explanation": "Good."}},
+    }
+
+
+@pytest.mark.parametrize(
+    "text", ["", "NO\n- Bad.", "{not json}", '["AAPL"]', "} {"]
+)
+def test_parse_batched_answer_invalid(text):
+    """Checks that invalid answers are parsed as no answers."""
+    assert scraper_main.parse_batched_answer(text) == {}
+
+
+def test_analyze_headline_fallback(scraper):
+    """Checks that terms missing from a batched answer are analyzed alone."""
+    prompts = []
+
+    def chat(text, max_tokens=150):
+        prompts.append(text)
+        if "Tickers:" in text:
+            return json.dumps(
+                {
+                    "AAPL": {
+                        "short": {"answer": "YES", "explanation": "Good."},
+                        "long": {"answer": "maybe"},
+                    },
+                }
+            )
+        return "NO\n- Bad."
+
+    scraper.chat = chat
+    results = scraper.analyze_headline(["AAPL", "MSFT"], "Headline")
+
+    assert results == [
+        {
+            "term": {"short": "positive", "long": "negative"},
+            "ticker": "AAPL",
+            "headline": "Headline",
+            "explanation": {"short": "- Good.", "long": "- Bad."},
+        },
+        {
+            "term": {"short": "negative", "long": "negative"},
+            "ticker": "MSFT",
+            "headline": "Headline",
+            "explanation": {"short": "- Bad.", "long": "- Bad."},
+        },
+    ]
+    # One batched prompt, then one per missing term
+    assert len(prompts) == 4
+    assert scraper.cache.get("AAPL", "short", "Headline")["result"] == (
+        "positive"
+    )
+
+
+def test_analyze_headline_without_answer(scraper):
+    """Checks that every term is analyzed alone without a batched answer."""
+    prompts = []
+
+    def chat(text, max_tokens=150):
+        prompts.append(text)
+        return None if "Tickers:" in text else "YES\n- Good."
+
+    scraper.chat = chat
+    results = scraper.analyze_headline(["AAPL"], "Headline")
+
+    assert [result["term"] for result in results] == [
+        {"short": "positive", "long": "positive"},
+    ]
+    assert len(prompts) == 3
@@ -0,0 +1,93 @@
+import importlib
+import itertools
+import types
+
+import pytest
+
+cache_module = importlib.import_module("quantex-scraper.cache")
+
+
+def result(ticker, term, headline, verdict="positive"):
+    return {
+        "term": term,
+        "ticker": ticker,
+        "headline": headline,
+        "explanation": "- Explanation.",
+        "result": verdict,
+    }
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """
+    Create an empty cache of three results with a ticking clock.
+
+    :yield: the cache.
+    """
+    clock = itertools.count()
+    monkeypatch.setattr(
+        cache_module, "time", types.SimpleNamespace(time=lambda: next(clock))
+    )
+    cache = cache_module.AnalysisCache(
+        str(tmp_path / "analysis.db"), max_entries=3
+    )
+    try:
+        yield cache
+    finally:
+        cache.close()
+
+
+def test_normalize_headline():
+    """Checks that whitespace and casing are normalized."""
+    assert cache_module.normalize_headline("  Foo\tBAR\n baz ") == (
+        "foo bar baz"
+    )
+
+
+def test_get_normalized(cache):
+    """Checks that results are found by ticker and headline in any form."""
+    cache.set(result("AAPL", "short", "Apple beats  estimates"))
+
+    cached = cache.get("aapl", "short", " apple BEATS estimates")
+
+    assert cached == result("aapl", "short", " apple BEATS estimates")
+    assert cache.get("AAPL", "long", "Apple beats estimates") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_set_existing(cache):
+    """Checks that storing a result again keeps the first one."""
+    cache.set(result("AAPL", "short", "Headline"))
+    cache.set(result("AAPL", "short", "Headline", verdict="negative"))
+
+    assert cache.get("AAPL", "short", "Headline")["result"] == "positive"
+    assert cache.stats()["size"] == 1
+
+
+def test_evicts_least_recently_used(cache):
+    """Checks that the least recently used results are evicted."""
+    for headline in ("First", "Second", "Third"):
+        cache.set(result("AAPL", "short", headline))
+    cache.get("AAPL", "short", "First")
+
+    cache.set(result("AAPL", "short", "Fourth"))
+
+    assert cache.get("AAPL", "short", "Second") is None
+    for headline in ("First", "Third", "Fourth"):
+        assert cache.get("AAPL", "short", headline) is not None
+    assert cache.stats()["size"] == 3
+
+
+def test_survives_restart(tmp_path):
+    """Checks that results are kept on disk."""
+    path = str(tmp_path / "analysis.db")
+    cache = cache_module.AnalysisCache(path)
+    cache.set(result("AAPL", "short", "Headline"))
+    cache.close()
+
+    cache = cache_module.AnalysisCache(path)
+    try:
+        assert cache.stats()["size"] == 1
+        assert cache.get("AAPL", "short", "Headline") is not None
+    finally:
+        cache.close()
@@ -0,0 +1,83 @@
+import importlib
+
+import pytest
+import requests
+
+scraper_main = importlib.import_module("quantex-scraper.__main__")
+
+
+class Response:
+    """Response of the news API with the given statuses of /batch."""
+
+    def __init__(self, statuses, status_code=200):
+        self.statuses = statuses
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+    def json(self):
+        if self.status_code >= 400:
+            return {"detail": "Internal Server Error"}
+        return {
+            "results": [{"status": status} for status in self.statuses],
+            "count": self.statuses.count("created"),
+        }
+
+
+def result(ticker):
+    return {
+        "term": {"short": "positive", "long": "negative"},
+        "ticker": ticker,
+        "headline": "Headline",
+        "explanation": {"short": "- Good.", "long": "- Bad."},
+    }
+
+
+def test_insert_results_returns_created(scraper, monkeypatch):
+    """Checks that only items with a created term are returned."""
+    requests_sent = []
+
+    def post(url, json, headers):
+        requests_sent.append(json)
+        return Response(
+            ["created", "duplicate", "duplicate", "duplicate"]
+            + ["invalid", "invalid"]
+        )
+
+    monkeypatch.setattr(scraper_main.requests, "post", post)
+    results = [result("AAPL"), result("MSFT"), result("GOOGLEGOOGLE")]
+
+    assert scraper.insert_results(results) == [result("AAPL")]
+    assert [payload["term"] for payload in requests_sent[0]] == [
+        "short",
+        "long",
+    ] * 3
+
+
+def test_insert_results_batches(scraper, monkeypatch):
+    """Checks that statuses of later batches belong to their items."""
+    monkeypatch.setattr(scraper_main, "INSERT_BATCH_SIZE", 2)
+    statuses = iter([["duplicate", "duplicate"], ["duplicate", "created"]])
+    monkeypatch.setattr(
+        scraper_main.requests,
+        "post",
+        lambda url, json, headers: Response(next(statuses)),
+    )
+
+    assert scraper.insert_results([result("AAPL"), result("MSFT")]) == [
+        result("MSFT"),
+    ]
+
+
+def test_insert_results_error(scraper, monkeypatch):
+    """Checks that failed batches raise instead of counting garbage."""
+    monkeypatch.setattr(
+        scraper_main.requests,
+        "post",
+        lambda url, json, headers: Response([], status_code=500),
+    )
+
+    with pytest.raises(requests.HTTPError):
+        scraper.insert_results([result("AAPL")])
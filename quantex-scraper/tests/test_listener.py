@@ -0,0 +1,97 @@
+import importlib
+import threading
+import time
+
+import pytest
+
+listener_module = importlib.import_module("quantex-scraper.listener")
+
+
+@pytest.fixture
+def listener():
+    """
+    Create a listener with two pool threads.
+
+    :yield: the listener.
+    """
+    listener = listener_module.EventListener(max_workers=2)
+    try:
+        yield listener
+    finally:
+        listener.drain(timeout=5)
+
+
+def test_emit_returns_results(listener):
+    """Checks that futures of emitted handlers hold their results."""
+    listener.on("event")(lambda value: value * 2)
+
+    (future,) = listener.emit("event", 21)
+
+    assert future.result(timeout=1) == 42
+
+
+def test_emit_failed_handler(listener):
+    """Checks that failures of handlers end up in their futures."""
+
+    @listener.on("event", max_concurrency=1)
+    def fail():
+        raise ValueError("failed")
+
+    futures = listener.emit("event") + listener.emit("event")
+
+    for future in futures:
+        assert isinstance(future.exception(timeout=1), ValueError)
+
+
+def test_max_concurrency(listener):
+    """Checks that runs of an event over its limit wait for a free slot."""
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    @listener.on("slow", max_concurrency=1)
+    def slow(index):
+        with lock:
+            running.append(index)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(index)
+        return index
+
+    futures = [listener.emit("slow", index)[0] for index in range(3)]
+
+    assert [future.result(timeout=1) for future in futures] == [0, 1, 2]
+    assert max(peak) == 1
+
+
+def test_max_concurrency_doesnt_block_other_events(listener):
+    """Checks that waiting runs of one event don't delay other events."""
+    release = threading.Event()
+    listener.on("slow", max_concurrency=1)(release.wait)
+    listener.on("fast")(time.monotonic)
+
+    slow = [listener.emit("slow")[0] for _ in range(3)]
+    start = time.monotonic()
+    (fast,) = listener.emit("fast")
+
+    assert fast.result(timeout=1) - start < 0.5
+    release.set()
+    for future in slow:
+        future.result(timeout=1)
+
+
+def test_drain(listener):
+    """Checks that drain waits for waiting runs too."""
+    done = []
+
+    @listener.on("slow", max_concurrency=1)
+    def slow(index):
+        time.sleep(0.02)
+        done.append(index)
+
+    for index in range(3):
+        listener.emit("slow", index)
+
+    assert listener.drain(timeout=5)
+    assert done == [0, 1, 2]
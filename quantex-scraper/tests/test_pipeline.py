@@ -0,0 +1,132 @@
+import importlib
+
+import pytest
+
+pipeline_module = importlib.import_module("quantex-scraper.pipeline")
+seen_module = importlib.import_module("quantex-scraper.seen")
+
+
+class Scraper:
+    """Scraper that stores results in memory, or fails to."""
+
+    def __init__(self, fail: bool = False, stored=()):
+        self.fail = fail
+        self.inserted = []
+        self.stored = set(stored)
+        self.seen = seen_module.SeenSet()
+
+    def insert_results(self, results):
+        if self.fail:
+            raise RuntimeError("API is down")
+        self.inserted.extend(results)
+        return [
+            result for result in results if result["ticker"] not in self.stored
+        ]
+
+
+class Listener:
+    """Listener that records emitted events."""
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, name, **kwargs):
+        self.events.append((name, kwargs))
+
+
+def result(ticker):
+    return {"ticker": ticker, "headline": "Headline"}
+
+
+def test_write_notifies_stored_results():
+    """Checks that results are sent to the notifier once stored."""
+    scraper = Scraper()
+    pipeline = pipeline_module.ScraperPipeline(
+        scraper, listener=None, interval=60, write_delay=0
+    )
+    pipeline._in_flight.update({("AAPL", "Headline"), ("MSFT", "Headline")})
+    for ticker in ("AAPL", "MSFT"):
+        pipeline._put("writer", result(ticker))
+
+    pipeline._write()
+    pipeline._write()
+
+    assert scraper.inserted == [result("AAPL"), result("MSFT")]
+    assert pipeline._drain("notifier") == [
+        ("unique_data", {"item": result("AAPL")}),
+        ("unique_data", {"item": result("MSFT")}),
+    ]
+    assert ("AAPL", "Headline") in scraper.seen
+    assert not pipeline._in_flight
+
+
+def test_write_skips_rejected_results():
+    """Checks that duplicate or invalid results aren't sent."""
+    scraper = Scraper(stored={"MSFT"})
+    pipeline = pipeline_module.ScraperPipeline(
+        scraper, listener=None, interval=60, write_delay=0
+    )
+    for ticker in ("AAPL", "MSFT"):
+        pipeline._put("writer", result(ticker))
+
+    pipeline._write()
+    pipeline._write()
+
+    assert pipeline._drain("notifier") == [
+        ("unique_data", {"item": result("AAPL")}),
+    ]
+    # Rejected results aren't analyzed again either
+    assert ("MSFT", "Headline") in scraper.seen
+
+
+def test_failed_write_does_not_notify():
+    """Checks that results that weren't stored aren't sent."""
+    scraper = Scraper(fail=True)
+    pipeline = pipeline_module.ScraperPipeline(
+        scraper, listener=None, interval=60, write_delay=0
+    )
+    pipeline._in_flight.add(("AAPL", "Headline"))
+    pipeline._put("writer", result("AAPL"))
+
+    with pytest.raises(RuntimeError):
+        pipeline._write()
+
+    assert not pipeline._drain("notifier")
+    assert ("AAPL", "Headline") not in scraper.seen
+    # Released, so the next poll analyzes it again
+    assert not pipeline._in_flight
+
+
+def test_write_while_stopping():
+    """Checks that results written during shutdown are sent right away."""
+    listener = Listener()
+    pipeline = pipeline_module.ScraperPipeline(
+        Scraper(), listener, interval=60, write_delay=0
+    )
+    pipeline._put("writer", result("AAPL"))
+    pipeline._stop.set()
+
+    pipeline._write()
+
+    assert listener.events == [("unique_data", {"item": result("AAPL")})]
+
+
+def test_flush():
+    """Checks that queued events are sent and queued results written."""
+    listener = Listener()
+    pipeline = pipeline_module.ScraperPipeline(
+        Scraper(stored={"TSLA"}), listener, interval=60
+    )
+    pipeline._put("notifier", ("unique_data", {"item": result("AAPL")}))
+    pipeline._put("notifier", ("poll_finished", {"next_poll": 0}))
+    pipeline._put("writer", result("MSFT"))
+    pipeline._put("writer", result("TSLA"))
+    pipeline._stop.set()
+
+    pipeline._flush()
+
+    assert listener.events == [
+        ("unique_data", {"item": result("AAPL")}),
+        ("poll_finished", {"next_poll": 0}),
+        ("unique_data", {"item": result("MSFT")}),
+    ]
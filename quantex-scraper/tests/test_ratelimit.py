@@ -0,0 +1,172 @@
+import importlib
+import types
+
+import pytest
+
+analysis_module = importlib.import_module("quantex-scraper.analysis")
+ratelimit_module = importlib.import_module("quantex-scraper.ratelimit")
+scraper_main = importlib.import_module("quantex-scraper.__main__")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Replace the clock of token buckets, sleeping moves it forward.
+
+    Rates in tests are powers of two, so waits add up exactly.
+
+    :return: the clock, with the `sleeps` made so far.
+    """
+    clock = types.SimpleNamespace(now=0.0, sleeps=[])
+
+    def sleep(seconds):
+        clock.sleeps.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(
+        ratelimit_module,
+        "time",
+        types.SimpleNamespace(monotonic=lambda: clock.now, sleep=sleep),
+    )
+    # Backoff without jitter
+    monkeypatch.setattr(
+        analysis_module,
+        "random",
+        types.SimpleNamespace(uniform=lambda low, high: high),
+    )
+    return clock
+
+
+def test_refill(clock):
+    """Checks that tokens are refilled at the rate, up to the capacity."""
+    bucket = ratelimit_module.TokenBucket(rate=2, capacity=2)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    clock.now = 0.5
+    assert bucket.try_acquire() == 0
+
+    clock.now = 10
+    assert bucket.try_acquire(2) == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+
+def test_acquire_waits(clock):
+    """Checks that acquiring sleeps until a token is refilled."""
+    bucket = ratelimit_module.TokenBucket(rate=4)
+
+    bucket.acquire()
+    bucket.acquire()
+
+    assert clock.sleeps == [pytest.approx(0.25)]
+
+
+def test_pause(clock):
+    """Checks that paused buckets start refilling when the pause ends."""
+    bucket = ratelimit_module.TokenBucket(rate=1)
+    bucket.pause(3)
+    bucket.pause(1)
+
+    assert bucket.try_acquire() == 3
+
+    clock.now = 3
+    assert bucket.try_acquire() == 1
+
+    clock.now = 4
+    assert bucket.try_acquire() == 0
+
+
+def test_backoff(clock):
+    """Checks that limited calls back off exponentially up to the cap."""
+    bucket = ratelimit_module.TokenBucket(rate=4)
+    executor = analysis_module.AnalysisExecutor(
+        bucket, max_workers=1, max_retries=3, backoff_max=10
+    )
+    calls = []
+
+    def analyze(headline):
+        calls.append(clock.now)
+        if len(calls) < 4:
+            raise analysis_module.ProviderLimitationError("429")
+        return headline
+
+    try:
+        assert executor.call(analyze, "Headline") == "Headline"
+    finally:
+        executor.shutdown()
+
+    # Every call waits for the pause and a token refilled after it
+    assert [now - before for before, now in zip(calls, calls[1:])] == [
+        2.25,
+        4.25,
+        8.25,
+    ]
+
+
+def test_backoff_gives_up(clock):
+    """Checks that retries stop after `max_retries`, with capped pauses."""
+    pauses = []
+
+    class Bucket:
+        def acquire(self):
+            pass
+
+        def pause(self, seconds):
+            pauses.append(seconds)
+
+    executor = analysis_module.AnalysisExecutor(
+        Bucket(), max_workers=1, max_retries=5, backoff_max=20
+    )
+    calls = []
+
+    def analyze():
+        calls.append(None)
+        raise analysis_module.ProviderLimitationError("429")
+
+    try:
+        assert executor.call(analyze) is None
+    finally:
+        executor.shutdown()
+
+    assert len(calls) == 6
+    assert pauses == [2, 4, 8, 16, 20, 20]
+
+
+class Response:
+    """Response of the chat API."""
+
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self.reason = "Too Many Requests" if status_code == 429 else "Error"
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+def test_chat_retries_errors(scraper, clock, monkeypatch):
+    """Checks that 429 and 5xx responses of the chat API are retried."""
+    responses = iter(
+        [
+            Response(429),
+            Response(503),
+            Response(200, {"openai": {"generated_text": "YES\n- Good."}}),
+        ]
+    )
+    monkeypatch.setattr(
+        scraper_main.requests,
+        "post",
+        lambda url, json, headers, timeout: next(responses),
+    )
+    executor = analysis_module.AnalysisExecutor(
+        ratelimit_module.TokenBucket(rate=4), max_workers=1
+    )
+
+    try:
+        assert executor.call(scraper.chat, "Prompt") == "YES\n- Good."
+    finally:
+        executor.shutdown()
+
+    assert clock.sleeps == [2, 0.25, 4, 0.25]
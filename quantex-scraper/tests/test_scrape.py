@@ -0,0 +1,68 @@
+import datetime
+
+import pytest
+
+
+class Driver:
+    """WebDriver that returns a fixed result of the extraction script."""
+
+    def __init__(self, result):
+        self.result = result
+
+    def execute_script(self, script):
+        return self.result
+
+
+def article(layout, tickers, timestamp="5m ago", headline="Headline"):
+    return {
+        "layout": layout,
+        "tickers": tickers,
+        "timestamp": timestamp,
+        "headline": headline,
+    }
+
+
+def test_scrape_all(scraper):
+    """Checks that tickers are taken from both layouts of articles."""
+    scraper.driver = Driver(
+        [
+            # Tickers of the "a" layout end with a link to the article
+            article("a", ["AAPL", "MSFT", "Read"], headline="Apple"),
+            article("div", ["TSLA", "NIO"], timestamp="2h", headline="Tesla"),
+            article("a", [], timestamp="", headline=""),
+        ]
+    )
+
+    results = scraper.scrape_all()
+
+    assert [(item["ticker"], item["headline"]) for item in results] == [
+        (["AAPL", "MSFT"], "Apple"),
+        (["TSLA"], "Tesla"),
+    ]
+    assert all(
+        isinstance(item["timestamp"], datetime.datetime) for item in results
+    )
+
+
+@pytest.mark.parametrize("result", [None, []])
+def test_scrape_all_empty(scraper, result):
+    """Checks that a page without articles scrapes nothing."""
+    scraper.driver = Driver(result)
+
+    assert scraper.scrape_all() == []
+
+
+@pytest.mark.parametrize(
+    "field", ["layout", "tickers", "timestamp", "headline"]
+)
+def test_scrape_all_missing_field(scraper, field):
+    """Checks that articles missing a field are skipped, not fatal."""
+    broken = article("div", ["AAPL"], headline="Broken")
+    del broken[field]
+    scraper.driver = Driver(
+        [broken, article("div", ["MSFT"], headline="Microsoft")]
+    )
+
+    assert [item["headline"] for item in scraper.scrape_all()] == [
+        "Microsoft",
+    ]
@@ -0,0 +1,75 @@
+import importlib
+import types
+
+import pytest
+
+seen_module = importlib.import_module("quantex-scraper.seen")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Replace the monotonic clock of seen sets with a settable one.
+
+    :return: the clock, set its `now` to move time.
+    """
+    clock = types.SimpleNamespace(now=0.0)
+    monkeypatch.setattr(
+        seen_module,
+        "time",
+        types.SimpleNamespace(monotonic=lambda: clock.now),
+    )
+    return clock
+
+
+def test_bloom_filter():
+    """Checks that added keys are found and false positives are rare."""
+    bloom = seen_module.BloomFilter(1000, error_rate=0.01)
+    for key in range(1000):
+        bloom.add(f"added {key}")
+
+    assert all(f"added {key}" in bloom for key in range(1000))
+    false_positives = sum(f"other {key}" in bloom for key in range(10_000))
+    assert false_positives < 300
+
+
+def test_normalized(clock):
+    """Checks that pairs are matched by ticker and headline in any form."""
+    seen = seen_module.SeenSet(window=60)
+    seen.add("aapl", "Apple  beats estimates")
+
+    assert ("AAPL", "apple beats ESTIMATES ") in seen
+    assert ("MSFT", "Apple beats estimates") not in seen
+
+
+def test_expires_after_two_windows(clock):
+    """Checks that pairs are remembered for one to two windows."""
+    seen = seen_module.SeenSet(window=60)
+    seen.add("AAPL", "Headline")
+
+    clock.now = 90
+    seen.add("MSFT", "Headline")
+
+    clock.now = 150
+    assert ("AAPL", "Headline") not in seen
+    assert ("MSFT", "Headline") in seen
+
+
+def test_lookup_keeps_pair(clock):
+    """Checks that pairs that are still around don't expire."""
+    seen = seen_module.SeenSet(window=60)
+    seen.add("AAPL", "Headline")
+
+    for now in (60, 120, 180):
+        clock.now = now
+        assert ("AAPL", "Headline") in seen
+
+
+def test_rotates_at_capacity(clock):
+    """Checks that a full generation is retired before its window ends."""
+    seen = seen_module.SeenSet(window=60, capacity=2)
+    for headline in ("First", "Second", "Third", "Fourth", "Fifth"):
+        seen.add("AAPL", headline)
+
+    assert ("AAPL", "First") not in seen
+    assert ("AAPL", "Fifth") in seen
@@ -0,0 +1,77 @@
+import importlib
+import threading
+import time
+
+telegram_module = importlib.import_module("quantex-scraper.telegram")
+
+
+class Session:
+    """HTTP session that records whether the worker was alive on close."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.closed_with_worker = None
+
+    def close(self):
+        self.closed_with_worker = self.bot._worker.is_alive()
+
+
+def test_close_sends_queued_messages():
+    """Checks that queued messages are sent before the worker stops."""
+    bot = telegram_module.TelegramBot("token")
+    bot.session = Session(bot)
+    sent = []
+    bot.send_message = lambda chat, text: sent.append((chat, text)) or {
+        "ok": True
+    }
+
+    for index in range(3):
+        bot.enqueue("chat", f"Message {index}")
+    bot.close(timeout=5)
+
+    assert sent == [("chat", f"Message {index}") for index in range(3)]
+    assert not bot._worker.is_alive()
+    assert bot.session.closed_with_worker is False
+
+
+def test_close_full_queue_times_out():
+    """Checks that closing doesn't hang when the worker is stuck."""
+    bot = telegram_module.TelegramBot("token", queue_size=2)
+    bot.session = Session(bot)
+    sending = threading.Event()
+    release = threading.Event()
+
+    def send_message(chat, text):
+        sending.set()
+        release.wait()
+        return {"ok": True}
+
+    bot.send_message = send_message
+
+    # The worker gets stuck on the first message, the others fill the queue
+    bot.enqueue("chat", "Message 0")
+    assert sending.wait(5)
+    for index in range(1, 3):
+        assert bot.enqueue("chat", f"Message {index}")
+
+    start = time.monotonic()
+    bot.close(timeout=0.2)
+
+    assert time.monotonic() - start < 1
+    # The message being sent still needs the session
+    assert bot.session.closed_with_worker is None
+    release.set()
+
+
+def test_close_worker_times_out():
+    """Checks that the session stays open while a message is being sent."""
+    bot = telegram_module.TelegramBot("token")
+    bot.session = Session(bot)
+    release = threading.Event()
+    bot.send_message = lambda chat, text: release.wait() and {"ok": True}
+
+    bot.enqueue("chat", "Message")
+    bot.close(timeout=0.2)
+
+    assert bot.session.closed_with_worker is None
+    release.set()
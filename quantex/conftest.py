@@ -10,8 +10,14 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from quantex.database.dependencies import get_db_session
+from quantex.database.dependencies import (
+    get_db_readonly_session,
+    get_db_replica_session,
+    get_db_session,
+)
 from quantex.database.utils import create_database, drop_database
+from quantex.services.news_events import NewsEvents
+from quantex.services.response_cache import ResponseCache
 from quantex.settings import settings
 from quantex.web.application import get_app
 
@@ -92,6 +98,14 @@ def fastapi_app(
     """
     application = get_app()
     application.dependency_overrides[get_db_session] = lambda: dbsession
+    application.dependency_overrides[
+        get_db_readonly_session
+    ] = lambda: dbsession
+    application.dependency_overrides[
+        get_db_replica_session
+    ] = lambda: dbsession
+    application.state.news_cache = ResponseCache()
+    application.state.news_events = NewsEvents()
     return application  # noqa: WPS331
 
 
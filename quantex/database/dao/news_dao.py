@@ -1,14 +1,102 @@
+import collections
+import datetime
 import typing
 
+import orjson
 from fastapi import Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import Select, delete, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from quantex.database.dependencies import get_db_session
-from quantex.database.models.news_model import NewsModel
+from quantex.database.dependencies import (
+    get_db_readonly_session,
+    get_db_replica_session,
+    get_db_session,
+)
+from quantex.database.models.news_model import (
+    NEWS_CHANNEL,
+    SEARCH_CONFIG,
+    TERM,
+    NewsDedupModel,
+    NewsModel,
+    news_content_hash,
+)
+from quantex.database.models.news_sentiment_model import (
+    NewsSentimentHourlyModel,
+)
 
-from quantex.web.api.news.schema import NewsModelCreateDTO, NewsModelDTO
+if typing.TYPE_CHECKING:
+    # The news API imports this module, so its schemas are only annotations
+    from quantex.web.api.news.schema import (
+        NewsLookupItemDTO,
+        NewsModelCreateDTO,
+    )
+
+
+# News as returned by the API, the fields of NewsModelDTO
+NewsRow = typing.Dict[str, typing.Any]
+NEWS_FIELDS = (
+    "id",
+    "created_at",
+    "term",
+    "ticker",
+    "headline",
+    "explanation",
+    "result",
+)
+NEWS_COLUMNS = tuple(NewsModel.__table__.c[name] for name in NEWS_FIELDS)
+# Mapped attributes of NEWS_COLUMNS, ORM inserts can only return these
+NEWS_ATTRIBUTES = tuple(getattr(NewsModel, name) for name in NEWS_FIELDS)
+# NOTIFY payloads must be shorter than 8000 bytes
+NOTIFY_MAX_PAYLOAD = 7999
+# Transaction of streamed reads, server-side cursors can't run without one
+STREAM_OPTIONS = {
+    "isolation_level": "REPEATABLE READ",
+    "postgresql_readonly": True,
+}
+
+
+def _fits_columns(news: "NewsModelCreateDTO") -> bool:
+    """Check that news values fit into the sized columns of the news table."""
+    columns = NewsModel.__table__.c
+    return (
+        len(news.ticker) <= columns.ticker.type.length
+        and len(news.headline) <= columns.headline.type.length
+    )
+
+
+def _notification(news: NewsRow) -> str:
+    """Encode news for NOTIFY, without the explanation if it's too long."""
+    payload = orjson.dumps(news)
+    if len(payload) > NOTIFY_MAX_PAYLOAD:
+        payload = orjson.dumps({**news, "explanation": None})
+    return payload.decode()
+
+
+def _filter_news(
+    query: Select,
+    ticker: typing.Optional[str] = None,
+    term: typing.Optional[str] = None,
+    headline: typing.Optional[str] = None,
+    result: typing.Optional[str] = None,
+    since: typing.Optional[datetime.datetime] = None,
+    until: typing.Optional[datetime.datetime] = None,
+) -> Select:
+    """Narrow down a news query by ticker, term, headline, result or time."""
+    if since:
+        query = query.where(NewsModel.created_at >= since)
+    if until:
+        query = query.where(NewsModel.created_at < until)
+    if ticker:
+        query = query.where(NewsModel.ticker == ticker)
+    if term:
+        query = query.where(NewsModel.term == term)
+    if headline:
+        query = query.where(NewsModel.headline == headline)
+    if result:
+        query = query.where(NewsModel.result == result)
+    return query
 
 
 class NewsDAO:
@@ -17,24 +105,283 @@ class NewsDAO:
     def __init__(self, session: AsyncSession = Depends(get_db_session)):
         self.session = session
 
-    async def create_news(self, news: NewsModelCreateDTO) -> None:
-        """Create news."""
-        news_model = NewsModel()
-        news_model.headline = news.headline
-        news_model.ticker = news.ticker
-        news_model.term = news.term
-        news_model.result = news.result
-        news_model.explanation = news.explanation
+    @classmethod
+    def readonly(
+        cls,
+        session: AsyncSession = Depends(get_db_readonly_session),
+    ) -> "NewsDAO":
+        """
+        Get DAO for reads that runs queries without a transaction.
+
+        :param session: read-only session.
+        :return: DAO.
+        """
+        return cls(session)
+
+    @classmethod
+    def replica(
+        cls,
+        session: AsyncSession = Depends(get_db_replica_session),
+    ) -> "NewsDAO":
+        """
+        Get DAO for reads that may lag behind, served by read replicas.
 
-        self.session.add(news_model)
+        :param session: read-only session on a replica.
+        :return: DAO.
+        """
+        return cls(session)
+
+    async def _fetch(self, query: Select) -> typing.List[NewsRow]:
+        """
+        Get news rows of a query and end the transaction.
+
+        The connection goes back to the pool before the rows are encoded into
+        a response, read-only sessions skip the commit round trip entirely.
+        """
+        r = await self.session.execute(query)
+        rows = [row._asdict() for row in r]
         await self.session.commit()
+        return rows
 
-    async def get_news(self, news_id: int) -> typing.List[NewsModelDTO]:
-        """Get news by id."""
-        query = select(NewsModel).where(NewsModel.id == news_id)
+    async def create_news(self, news: "NewsModelCreateDTO") -> bool:
+        """
+        Create news, unless the same analysis is already stored.
+
+        :param news: news to create.
+        :return: whether a new row was created.
+        """
+        query = (
+            insert(NewsModel)
+            .values(**news.model_dump())
+            .returning(*NEWS_ATTRIBUTES)
+        )
         r = await self.session.execute(query)
-        if news := r.scalars().first():
-            return [NewsModelDTO.from_orm(news)]
+        created = r.all()
+        if created:
+            await self._count_sentiment(created)
+            await self._notify(created)
+        await self.session.commit()
+        return bool(created)
+
+    async def create_many_news(
+        self,
+        news: typing.List["NewsModelCreateDTO"],
+    ) -> typing.List[typing.Tuple[str, typing.Optional[int]]]:
+        """
+        Create many news in a single transaction.
+
+        Rows are written with multi-row INSERT statements. Items that don't fit
+        the table's column sizes are skipped instead of failing the whole
+        batch, and analyses that are already stored are skipped as duplicates.
+
+        :param news: news to create.
+        :return: status ("created", "duplicate" or "invalid") and id
+            of every item.
+        """
+        hashes = [
+            news_content_hash(item.ticker, item.headline, item.term)
+            if _fits_columns(item)
+            else None
+            for item in news
+        ]
+        rows: typing.Dict[bytes, typing.Dict[str, typing.Any]] = {}
+        for item, content_hash in zip(news, hashes):
+            if content_hash is not None:
+                rows.setdefault(
+                    content_hash,
+                    {**item.model_dump(), "content_hash": content_hash},
+                )
+
+        ids = {}
+        if rows:
+            r = await self.session.execute(
+                insert(NewsModel).returning(
+                    NewsModel.content_hash,
+                    *NEWS_ATTRIBUTES,
+                ),
+                list(rows.values()),
+            )
+            created = r.all()
+            ids = {row.content_hash: row.id for row in created}
+            if created:
+                await self._count_sentiment(created)
+                await self._notify(created)
+            await self.session.commit()
+
+        statuses = []
+        for content_hash in hashes:
+            if content_hash is None:
+                statuses.append(("invalid", None))
+            elif content_hash in ids:
+                statuses.append(("created", ids.pop(content_hash)))
+            else:
+                statuses.append(("duplicate", None))
+
+        return statuses
+
+    async def _count_sentiment(
+        self,
+        news: typing.Iterable[typing.Any],
+    ) -> None:
+        """
+        Add created news to the hourly sentiment rollups.
+
+        :param news: rows with ticker, created_at, term and result of created
+            news.
+        """
+        counts = collections.Counter(
+            (
+                row.ticker,
+                row.created_at.replace(minute=0, second=0, microsecond=0),
+                row.term,
+                row.result,
+            )
+            for row in news
+        )
+        query = insert(NewsSentimentHourlyModel).values(
+            [
+                {
+                    "ticker": ticker,
+                    "bucket": bucket,
+                    "term": term,
+                    "result": result,
+                    "count": count,
+                }
+                # Sorted, so concurrent writers lock rows in the same order
+                for (ticker, bucket, term, result), count in sorted(
+                    counts.items(),
+                )
+            ],
+        )
+        query = query.on_conflict_do_update(
+            index_elements=NewsSentimentHourlyModel.__table__.primary_key,
+            set_={
+                "count": NewsSentimentHourlyModel.count
+                + query.excluded["count"],
+            },
+        )
+        await self.session.execute(query)
+
+    async def _notify(self, news: typing.Iterable[typing.Any]) -> None:
+        """
+        Send created news to subscribers, once the transaction commits.
+
+        :param news: rows with NEWS_COLUMNS of created news.
+        """
+        payloads = [
+            _notification(
+                {
+                    column.name: getattr(row, column.name)
+                    for column in NEWS_COLUMNS
+                },
+            )
+            for row in news
+        ]
+        await self.session.execute(
+            text(
+                "SELECT pg_notify(:channel, payload) "
+                "FROM unnest(CAST(:payloads AS text[])) AS payload",
+            ),
+            {"channel": NEWS_CHANNEL, "payloads": payloads},
+        )
+
+    async def get_sentiment(
+        self,
+        ticker: str,
+        since: datetime.datetime,
+        until: datetime.datetime,
+        term: typing.Optional[str] = None,
+        result: typing.Optional[str] = None,
+        bucket: typing.Literal["hour", "day"] = "hour",
+    ) -> typing.List[NewsRow]:
+        """
+        Get number of news of a ticker per time bucket, term and result.
+
+        Counts are read from the hourly rollups only, never from news.
+
+        :param ticker: ticker of the news.
+        :param since: start of the first bucket.
+        :param until: end of the last bucket, exclusive.
+        :param term: term of the analysis.
+        :param result: result of the analysis.
+        :param bucket: size of the time buckets.
+        :return: counts sorted by bucket.
+        """
+        rollup = NewsSentimentHourlyModel
+        truncated = func.date_trunc(bucket, rollup.bucket).label("bucket")
+        query = select(
+            truncated,
+            rollup.term,
+            rollup.result,
+            func.sum(rollup.count).label("count"),
+        ).where(
+            rollup.ticker == ticker,
+            rollup.bucket >= since,
+            rollup.bucket < until,
+        )
+        if term:
+            query = query.where(rollup.term == term)
+        if result:
+            query = query.where(rollup.result == result)
+        query = query.group_by(truncated, rollup.term, rollup.result).order_by(
+            truncated,
+            rollup.term,
+            rollup.result,
+        )
+        return await self._fetch(query)
+
+    async def rebuild_sentiment(
+        self,
+        since: datetime.datetime,
+        until: datetime.datetime,
+    ) -> int:
+        """
+        Recount the hourly sentiment rollups from news.
+
+        Writers are blocked from updating rollups until the transaction
+        commits, so the recount can't race with news created meanwhile.
+
+        :param since: start of the first hour to recount.
+        :param until: end of the last hour to recount, exclusive.
+        :return: number of rollup rows written.
+        """
+        rollup = NewsSentimentHourlyModel.__table__
+        await self.session.execute(
+            text(f"LOCK TABLE {rollup.name} IN SHARE ROW EXCLUSIVE MODE"),
+        )
+        await self.session.execute(
+            delete(rollup).where(
+                rollup.c.bucket >= since,
+                rollup.c.bucket < until,
+            ),
+        )
+
+        hour = func.date_trunc("hour", NewsModel.created_at)
+        counts = (
+            select(
+                NewsModel.ticker,
+                hour,
+                NewsModel.term,
+                NewsModel.result,
+                func.count(),
+            )
+            .where(NewsModel.created_at >= since, NewsModel.created_at < until)
+            .group_by(NewsModel.ticker, hour, NewsModel.term, NewsModel.result)
+        )
+        r = await self.session.execute(
+            insert(rollup).from_select(
+                ["ticker", "bucket", "term", "result", "count"],
+                counts,
+            ),
+        )
+        await self.session.commit()
+        return r.rowcount
+
+    async def get_news(self, news_id: int) -> typing.List[NewsRow]:
+        """Get news by id."""
+        query = select(*NEWS_COLUMNS).where(NewsModel.id == news_id)
+        if news := await self._fetch(query):
+            return news
         else:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="News not found"
@@ -46,17 +393,176 @@ class NewsDAO:
         term: typing.Optional[str] = None,
         headline: typing.Optional[str] = None,
         result: typing.Optional[str] = None,
-    ) -> typing.List[NewsModelDTO]:
-        """Get news by ticker, term or result."""
-        query = select(NewsModel)
-        if ticker:
-            query = query.where(NewsModel.ticker == ticker)
-        if term:
-            query = query.where(NewsModel.term == term)
-        if headline:
-            query = query.where(NewsModel.headline == headline)
-        if result:
-            query = query.where(NewsModel.result == result)
-        r = await self.session.execute(query)
-        news = r.scalars().all()
-        return [NewsModelDTO.from_orm(n) for n in news] if news else []
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
+        limit: int = 100,
+        after: typing.Optional[typing.Tuple[datetime.datetime, int]] = None,
+    ) -> typing.List[NewsRow]:
+        """
+        Get a page of news by ticker, term or result, newest first.
+
+        Pages are fetched with keyset pagination, so every page costs the same
+        no matter how deep it is. Limiting news to a time span with `since`
+        and `until` only reads the partitions of that span.
+
+        :param since: oldest creation time of the news.
+        :param until: newest creation time of the news, exclusive.
+        :param limit: maximum number of news to return.
+        :param after: (created_at, id) of the last news of the previous page.
+        :return: news sorted by created_at and id, descending.
+        """
+        query = _filter_news(
+            select(*NEWS_COLUMNS),
+            ticker,
+            term,
+            headline,
+            result,
+            since,
+            until,
+        )
+        if after:
+            query = query.where(
+                tuple_(NewsModel.created_at, NewsModel.id) < after,
+            )
+        query = query.order_by(
+            NewsModel.created_at.desc(),
+            NewsModel.id.desc(),
+        ).limit(limit)
+        return await self._fetch(query)
+
+    async def stream_many_news(
+        self,
+        ticker: typing.Optional[str] = None,
+        term: typing.Optional[str] = None,
+        headline: typing.Optional[str] = None,
+        result: typing.Optional[str] = None,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
+        batch_size: int = 1000,
+    ) -> typing.AsyncIterator[typing.List[NewsRow]]:
+        """
+        Stream all news by ticker, term or result, newest first.
+
+        Rows are fetched from a server-side cursor `batch_size` at a time,
+        so memory use doesn't depend on the number of matching news. On
+        read-only sessions the rows are read in a read-only transaction, all
+        from the same snapshot.
+
+        :param since: oldest creation time of the news.
+        :param until: newest creation time of the news, exclusive.
+        :param batch_size: number of rows fetched at once.
+        :yield: batches of news.
+        """
+        query = _filter_news(
+            select(*NEWS_COLUMNS),
+            ticker,
+            term,
+            headline,
+            result,
+            since,
+            until,
+        )
+        query = query.order_by(
+            NewsModel.created_at.desc(),
+            NewsModel.id.desc(),
+        ).execution_options(yield_per=batch_size)
+
+        options = self.session.bind.get_execution_options()
+        if options.get("isolation_level") == "AUTOCOMMIT":
+            await self.session.connection(execution_options=STREAM_OPTIONS)
+        r = await self.session.stream(query)
+        async for news in r.partitions():
+            yield [row._asdict() for row in news]
+        await self.session.commit()
+
+    async def search_news(
+        self,
+        phrase: str,
+        ticker: typing.Optional[str] = None,
+        since: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
+        fuzzy: bool = False,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> typing.List[NewsRow]:
+        """
+        Search news by headline, best matches first.
+
+        Full-text search matches headlines containing all words of `phrase`,
+        which supports "quoted phrases", OR and -negation. Fuzzy search matches
+        headlines containing words similar to `phrase` instead, so it tolerates
+        typos.
+
+        Every match is ranked, so searches for common words should be limited
+        to a time span with `since` and `until`.
+
+        :param phrase: text to search for.
+        :param ticker: ticker of the news.
+        :param since: oldest creation time of the news.
+        :param until: newest creation time of the news, exclusive.
+        :param fuzzy: use trigram similarity instead of full-text search.
+        :param limit: maximum number of news to return.
+        :param offset: number of best matches to skip.
+        :return: news with their `rank`, sorted by rank and recency.
+        """
+        if fuzzy:
+            rank = func.word_similarity(phrase, NewsModel.headline)
+            match = NewsModel.headline.bool_op("%>")(phrase)
+        else:
+            tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, phrase)
+            rank = func.ts_rank_cd(NewsModel.headline_tsv, tsquery)
+            match = NewsModel.headline_tsv.bool_op("@@")(tsquery)
+
+        query = _filter_news(
+            select(*NEWS_COLUMNS, rank.label("rank")).where(match),
+            ticker,
+            since=since,
+            until=until,
+        )
+        query = (
+            query.order_by(
+                rank.desc(),
+                NewsModel.created_at.desc(),
+                NewsModel.id.desc(),
+            )
+            .limit(limit)
+            .offset(offset)
+        )
+        return await self._fetch(query)
+
+    async def get_existing_news(
+        self,
+        items: typing.List["NewsLookupItemDTO"],
+    ) -> typing.List[typing.Tuple[str, str]]:
+        """
+        Get (ticker, headline) pairs from `items` that are already stored.
+
+        Pairs are matched by content hash, with any term.
+        """
+        # Pairs differing only in casing or whitespace share their hashes
+        hashes: typing.DefaultDict[
+            bytes,
+            typing.List[typing.Tuple[str, str]],
+        ] = collections.defaultdict(list)
+        for item in items:
+            for term in typing.get_args(TERM):
+                content_hash = news_content_hash(
+                    item.ticker,
+                    item.headline,
+                    term,
+                )
+                hashes[content_hash].append((item.ticker, item.headline))
+        if not hashes:
+            return []
+
+        query = select(NewsDedupModel.content_hash).where(
+            NewsDedupModel.content_hash.in_(hashes),
+        )
+        r = await self.session.scalars(query)
+        existing = list(
+            dict.fromkeys(
+                pair for content_hash in r for pair in hashes[content_hash]
+            ),
+        )
+        await self.session.commit()
+        return existing
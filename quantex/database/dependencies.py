@@ -20,3 +20,44 @@ async def get_db_session(
     finally:
         await session.commit()
         await session.close()
+
+
+async def get_db_readonly_session(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Create and get database session for reads.
+
+    Queries run in autocommit mode, so no transaction is begun or committed
+    around them. Commit the session after reading to release its connection
+    early, it doesn't reach the database.
+
+    :param request: current request.
+    :yield: database session.
+    """
+    session: AsyncSession = request.app.state.db_readonly_session_factory()
+
+    try:  # noqa: WPS501
+        yield session
+    finally:
+        await session.close()
+
+
+async def get_db_replica_session(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Create and get read-only session on a read replica.
+
+    Falls back to the primary database when no replica is usable. Replicas
+    may lag behind, so news created just before may be missing.
+
+    :param request: current request.
+    :yield: database session.
+    """
+    session: AsyncSession = request.app.state.db_replicas.session()
+
+    try:  # noqa: WPS501
+        yield session
+    finally:
+        await session.close()
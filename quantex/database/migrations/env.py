@@ -1,4 +1,5 @@
 import asyncio
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -18,6 +19,21 @@ if config.config_file_name is not None:
 
 target_metadata = meta
 
+# Partitions of the news table are created outside of migrations
+NEWS_PARTITION = re.compile(r"news_(\d{4}_\d{2}|default)")
+
+
+def include_name(name, type_, parent_names) -> bool:  # noqa: WPS110
+    """
+    Leave news partitions out of autogenerate.
+
+    :param name: name of the database object.
+    :param type_: type of the database object.
+    :param parent_names: names of the objects it belongs to.
+    :return: whether to compare the object.
+    """
+    return type_ != "table" or not NEWS_PARTITION.fullmatch(name)
+
 
 async def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -48,7 +64,11 @@ def do_run_migrations(connection: Connection) -> None:
 
     :param connection: connection to the database.
     """
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,44 @@
+"""Create news table
+
+Revision ID: a992b1a243a4
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a992b1a243a4"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "news",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "term",
+            sa.Enum("short", "long", name="term"),
+            nullable=False,
+        ),
+        sa.Column("ticker", sa.String(length=8), nullable=False),
+        sa.Column("headline", sa.String(length=256), nullable=False),
+        sa.Column("explanation", sa.String(), nullable=False),
+        sa.Column(
+            "result",
+            sa.Enum("positive", "negative", "neutral", name="result"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("news")
+    sa.Enum(name="term").drop(op.get_bind())
+    sa.Enum(name="result").drop(op.get_bind())
@@ -0,0 +1,44 @@
+"""Add news indexes
+
+Revision ID: 09f2e4002db7
+Revises: a992b1a243a4
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "09f2e4002db7"
+down_revision = "a992b1a243a4"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_news_ticker_created_at": ["ticker", sa.text("created_at DESC")],
+    "ix_news_ticker_term_result": ["ticker", "term", "result"],
+    "ix_news_headline_ticker": ["headline", "ticker"],
+}
+
+
+def upgrade() -> None:
+    # Build indexes without blocking the scraper's inserts
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name,
+                "news",
+                columns,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name,
+                table_name="news",
+                postgresql_concurrently=True,
+            )
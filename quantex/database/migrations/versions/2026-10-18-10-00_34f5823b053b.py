@@ -0,0 +1,115 @@
+"""Add news content hash
+
+Revision ID: 34f5823b053b
+Revises: 09f2e4002db7
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "34f5823b053b"
+down_revision = "09f2e4002db7"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+news = sa.table(
+    "news",
+    sa.column("id", sa.Integer),
+    sa.column("ticker", sa.String),
+    sa.column("headline", sa.String),
+    sa.column("term", sa.String),
+    sa.column("content_hash", sa.LargeBinary),
+)
+
+
+def content_hash(ticker: str, headline: str, term: str) -> bytes:
+    """
+    Copy of quantex.database.models.news_model.news_content_hash.
+
+    Hashes are computed in Python, because whitespace and casing rules of
+    Postgres differ from str.split and str.lower for some characters.
+    """
+    normalized = " ".join(headline.split()).lower()
+    return hashlib.md5(  # noqa: S324
+        f"{ticker.upper()}\x1f{normalized}\x1f{term}".encode(),
+    ).digest()
+
+
+def upgrade() -> None:
+    op.add_column(
+        "news",
+        sa.Column("content_hash", sa.LargeBinary(length=16), nullable=True),
+    )
+
+    conn = op.get_bind()
+    update = (
+        news.update()
+        .where(news.c.id == sa.bindparam("news_id"))
+        .values(content_hash=sa.bindparam("news_hash"))
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(
+                news.c.id,
+                news.c.ticker,
+                news.c.headline,
+                sa.cast(news.c.term, sa.String),
+            )
+            .where(news.c.id > last_id)
+            .order_by(news.c.id)
+            .limit(BACKFILL_BATCH_SIZE),
+        ).all()
+        if not rows:
+            break
+
+        conn.execute(
+            update,
+            [
+                {
+                    "news_id": news_id,
+                    "news_hash": content_hash(ticker, headline, term),
+                }
+                for news_id, ticker, headline, term in rows
+            ],
+        )
+        last_id = rows[-1][0]
+    # Keep the first of the rows stored before uniqueness was enforced
+    op.execute(
+        """
+        DELETE FROM news
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT
+                    id,
+                    row_number() OVER (
+                        PARTITION BY content_hash ORDER BY id
+                    ) AS position
+                FROM news
+            ) AS ranked
+            WHERE position > 1
+        )
+        """,
+    )
+    op.alter_column("news", "content_hash", nullable=False)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ux_news_content_hash",
+            "news",
+            ["content_hash"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_news_content_hash", table_name="news")
+    op.drop_column("news", "content_hash")
@@ -0,0 +1,58 @@
+"""Add news keyset pagination indexes
+
+Revision ID: 5c1e7d2b9a40
+Revises: 34f5823b053b
+Create Date: 2026-10-18 10:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5c1e7d2b9a40"
+down_revision = "34f5823b053b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Pages are read in (created_at, id) order, with or without a ticker
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_news_created_at_id",
+            "news",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_news_ticker_created_at_id",
+            "news",
+            ["ticker", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_news_ticker_created_at",
+            table_name="news",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_news_ticker_created_at",
+            "news",
+            ["ticker", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_news_ticker_created_at_id",
+            table_name="news",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_news_created_at_id",
+            table_name="news",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,51 @@
+"""Add hourly news sentiment rollups
+
+Revision ID: b7e4f1a0c2d8
+Revises: 5c1e7d2b9a40
+Create Date: 2026-10-18 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "b7e4f1a0c2d8"
+down_revision = "5c1e7d2b9a40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "news_sentiment_hourly",
+        sa.Column("ticker", sa.String(length=8), nullable=False),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column(
+            "term",
+            postgresql.ENUM(name="term", create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            "result",
+            postgresql.ENUM(name="result", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("ticker", "bucket", "term", "result"),
+    )
+
+    # Count news stored so far, new ones are counted when created
+    op.execute(
+        """
+        INSERT INTO news_sentiment_hourly (ticker, bucket, term, result, count)
+        SELECT ticker, date_trunc('hour', created_at), term, result, count(*)
+        FROM news
+        GROUP BY ticker, date_trunc('hour', created_at), term, result
+        """,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("news_sentiment_hourly")
@@ -0,0 +1,53 @@
+"""Add news headline search
+
+Revision ID: e3a9c6d15f72
+Revises: b7e4f1a0c2d8
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "e3a9c6d15f72"
+down_revision = "b7e4f1a0c2d8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Stored generated columns are filled by rewriting the table
+    op.add_column(
+        "news",
+        sa.Column(
+            "headline_tsv",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', headline)", persisted=True),
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_news_headline_tsv",
+            "news",
+            ["headline_tsv"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_news_headline_trgm",
+            "news",
+            ["headline"],
+            postgresql_using="gin",
+            postgresql_ops={"headline": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_news_headline_trgm", table_name="news")
+    op.drop_index("ix_news_headline_tsv", table_name="news")
+    op.drop_column("news", "headline_tsv")
@@ -0,0 +1,208 @@
+"""Partition news by month
+
+Revision ID: 7d2c5e8f4b16
+Revises: e3a9c6d15f72
+Create Date: 2026-10-18 10:40:00.000000
+
+The news table is rebuilt as a partitioned table and all news are copied
+into it, so the table is locked until the migration finishes.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from quantex.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = "7d2c5e8f4b16"
+down_revision = "e3a9c6d15f72"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    "id, created_at, term, ticker, headline, explanation, result, content_hash"
+)
+
+INDEXES = {
+    "ix_news_created_at_id": {
+        "columns": [sa.text("created_at DESC"), sa.text("id DESC")],
+    },
+    "ix_news_ticker_created_at_id": {
+        "columns": ["ticker", sa.text("created_at DESC"), sa.text("id DESC")],
+    },
+    "ix_news_ticker_term_result": {"columns": ["ticker", "term", "result"]},
+    "ix_news_headline_ticker": {"columns": ["headline", "ticker"]},
+    "ix_news_headline_tsv": {
+        "columns": ["headline_tsv"],
+        "postgresql_using": "gin",
+    },
+    "ix_news_headline_trgm": {
+        "columns": ["headline"],
+        "postgresql_using": "gin",
+        "postgresql_ops": {"headline": "gin_trgm_ops"},
+    },
+}
+
+CREATE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_create_partitions(
+    since timestamp,
+    until timestamp
+) RETURNS void AS $$
+DECLARE
+    month timestamp := date_trunc('month', since);
+BEGIN
+    -- Workers create partitions at the same time on startup
+    PERFORM pg_advisory_xact_lock(hashtext('news_create_partitions'));
+    WHILE month < until LOOP
+        EXECUTE 'CREATE TABLE IF NOT EXISTS '
+            || quote_ident('news_' || to_char(month, 'YYYY_MM'))
+            || ' PARTITION OF news FOR VALUES FROM ('
+            || quote_literal(month) || ') TO ('
+            || quote_literal(month + interval '1 month') || ')';
+        month := month + interval '1 month';
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+DEDUPLICATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_deduplicate() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO news_dedup (content_hash) VALUES (NEW.content_hash)
+    ON CONFLICT DO NOTHING;
+    IF NOT FOUND THEN
+        -- Skip news that was created before
+        RETURN NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def _news_columns() -> list:
+    return [
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('news_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "term",
+            postgresql.ENUM(name="term", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("ticker", sa.String(length=8), nullable=False),
+        sa.Column("headline", sa.String(length=256), nullable=False),
+        sa.Column("explanation", sa.String(), nullable=False),
+        sa.Column(
+            "result",
+            postgresql.ENUM(name="result", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("content_hash", sa.LargeBinary(length=16), nullable=False),
+        sa.Column(
+            "headline_tsv",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', headline)", persisted=True),
+        ),
+    ]
+
+
+def _create_indexes() -> None:
+    for name, index in INDEXES.items():
+        index = dict(index)
+        op.create_index(name, "news", index.pop("columns"), **index)
+
+
+def upgrade() -> None:
+    op.rename_table("news", "news_unpartitioned")
+    op.execute(
+        "ALTER TABLE news_unpartitioned "
+        "RENAME CONSTRAINT news_pkey TO news_unpartitioned_pkey",
+    )
+    op.drop_index("ux_news_content_hash", table_name="news_unpartitioned")
+    for name in INDEXES:
+        op.drop_index(name, table_name="news_unpartitioned")
+
+    op.create_table(
+        "news",
+        *_news_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.execute("CREATE TABLE news_default PARTITION OF news DEFAULT")
+    op.execute(CREATE_PARTITIONS_FUNCTION)
+    # Same months ahead as quantex.database.utils.create_news_partitions
+    op.execute(
+        sa.text(
+            """
+            SELECT news_create_partitions(
+                coalesce(
+                    (SELECT min(created_at) FROM news_unpartitioned),
+                    timezone('utc', now())
+                ),
+                timezone('utc', now()) + make_interval(months => :months)
+            )
+            """,
+        ).bindparams(months=settings.news_partitions_ahead),
+    )
+
+    op.create_table(
+        "news_dedup",
+        sa.Column("content_hash", sa.LargeBinary(length=16), nullable=False),
+        sa.PrimaryKeyConstraint("content_hash"),
+    )
+    op.execute(
+        "INSERT INTO news_dedup SELECT content_hash FROM news_unpartitioned",
+    )
+    op.execute(
+        f"INSERT INTO news ({COLUMNS}) "  # noqa: S608
+        f"SELECT {COLUMNS} FROM news_unpartitioned",
+    )
+    op.execute("ALTER SEQUENCE news_id_seq OWNED BY news.id")
+    op.drop_table("news_unpartitioned")
+
+    op.execute(DEDUPLICATE_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER news_deduplicate BEFORE INSERT ON news "
+        "FOR EACH ROW EXECUTE FUNCTION news_deduplicate()",
+    )
+    _create_indexes()
+
+
+def downgrade() -> None:
+    op.rename_table("news", "news_partitioned")
+    op.execute(
+        "ALTER TABLE news_partitioned "
+        "RENAME CONSTRAINT news_pkey TO news_partitioned_pkey",
+    )
+    for name in INDEXES:
+        op.drop_index(name, table_name="news_partitioned")
+
+    op.create_table(
+        "news",
+        *_news_columns(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        f"INSERT INTO news ({COLUMNS}) "  # noqa: S608
+        f"SELECT {COLUMNS} FROM news_partitioned",
+    )
+    op.execute("ALTER SEQUENCE news_id_seq OWNED BY news.id")
+    op.drop_table("news_partitioned")
+    op.drop_table("news_dedup")
+    op.execute("DROP FUNCTION news_deduplicate()")
+    op.execute("DROP FUNCTION news_create_partitions(timestamp, timestamp)")
+
+    op.create_index(
+        "ux_news_content_hash",
+        "news",
+        ["content_hash"],
+        unique=True,
+    )
+    _create_indexes()
@@ -0,0 +1,194 @@
+"""Move default news into new partitions and prune content hashes
+
+Revision ID: c4f81a6e2d93
+Revises: 7d2c5e8f4b16
+Create Date: 2026-10-18 10:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c4f81a6e2d93"
+down_revision = "7d2c5e8f4b16"
+branch_labels = None
+depends_on = None
+
+CREATE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_create_partitions(
+    since timestamp,
+    until timestamp
+) RETURNS void AS $$
+DECLARE
+    month timestamp := date_trunc('month', since);
+    partition text;
+    columns text;
+BEGIN
+    -- Workers create partitions at the same time on startup
+    PERFORM pg_advisory_xact_lock(hashtext('news_create_partitions'));
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum)
+    INTO columns
+    FROM pg_attribute
+    WHERE attrelid = 'news'::regclass
+        AND attnum > 0
+        AND NOT attisdropped
+        AND attgenerated = '';
+
+    WHILE month < until LOOP
+        partition := 'news_' || to_char(month, 'YYYY_MM');
+        IF to_regclass(partition) IS NOT NULL THEN
+            NULL;
+        ELSIF EXISTS (
+            SELECT FROM news_default
+            WHERE created_at >= month
+                AND created_at < month + interval '1 month'
+        ) THEN
+            -- A partition can't be created over news in the default
+            -- partition, so they are moved into it before it's attached
+            EXECUTE format(
+                'CREATE TABLE %I '
+                '(LIKE news INCLUDING DEFAULTS INCLUDING GENERATED)',
+                partition
+            );
+            EXECUTE format(
+                'WITH moved AS ('
+                'DELETE FROM news_default '
+                'WHERE created_at >= $1 AND created_at < $2 '
+                'RETURNING %s'
+                ') INSERT INTO %I (%s) SELECT %s FROM moved',
+                columns, partition, columns, columns
+            ) USING month, month + interval '1 month';
+            EXECUTE format(
+                'ALTER TABLE news ATTACH PARTITION %I '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition, month, month + interval '1 month'
+            );
+        ELSE
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF news '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition, month, month + interval '1 month'
+            );
+        END IF;
+        month := month + interval '1 month';
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+DROP_PARTITIONS_FUNCTION = r"""
+CREATE OR REPLACE FUNCTION news_drop_partitions(
+    before timestamp
+) RETURNS void AS $$
+DECLARE
+    cutoff timestamp := date_trunc('month', before);
+    partition text;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('news_create_partitions'));
+    FOR partition IN
+        SELECT relname
+        FROM pg_inherits
+        JOIN pg_class ON pg_class.oid = inhrelid
+        WHERE inhparent = 'news'::regclass
+            AND relname ~ '^news_\d{4}_\d{2}$'
+            AND to_date(substr(relname, 6), 'YYYY_MM') < cutoff
+    LOOP
+        EXECUTE format('DROP TABLE %I', partition);
+    END LOOP;
+    DELETE FROM news_default WHERE created_at < cutoff;
+    -- Dropped news can be created again
+    DELETE FROM news_dedup WHERE created_at < cutoff;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+DEDUPLICATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_deduplicate() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO news_dedup (content_hash, created_at)
+    VALUES (NEW.content_hash, NEW.created_at)
+    ON CONFLICT DO NOTHING;
+    IF NOT FOUND THEN
+        -- Skip news that was created before
+        RETURN NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Functions as created by revision 7d2c5e8f4b16
+OLD_CREATE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_create_partitions(
+    since timestamp,
+    until timestamp
+) RETURNS void AS $$
+DECLARE
+    month timestamp := date_trunc('month', since);
+BEGIN
+    -- Workers create partitions at the same time on startup
+    PERFORM pg_advisory_xact_lock(hashtext('news_create_partitions'));
+    WHILE month < until LOOP
+        EXECUTE 'CREATE TABLE IF NOT EXISTS '
+            || quote_ident('news_' || to_char(month, 'YYYY_MM'))
+            || ' PARTITION OF news FOR VALUES FROM ('
+            || quote_literal(month) || ') TO ('
+            || quote_literal(month + interval '1 month') || ')';
+        month := month + interval '1 month';
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+OLD_DEDUPLICATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_deduplicate() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO news_dedup (content_hash) VALUES (NEW.content_hash)
+    ON CONFLICT DO NOTHING;
+    IF NOT FOUND THEN
+        -- Skip news that was created before
+        RETURN NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "news_dedup",
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE news_dedup SET created_at = news.created_at
+        FROM news
+        WHERE news.content_hash = news_dedup.content_hash
+        """,
+    )
+    # Hashes without news are kept until everything older is dropped
+    op.execute(
+        "UPDATE news_dedup SET created_at = timezone('utc', now()) "
+        "WHERE created_at IS NULL",
+    )
+    op.alter_column("news_dedup", "created_at", nullable=False)
+    op.create_index(
+        "ix_news_dedup_created_at",
+        "news_dedup",
+        ["created_at"],
+    )
+
+    op.execute(DEDUPLICATE_FUNCTION)
+    op.execute(CREATE_PARTITIONS_FUNCTION)
+    op.execute(DROP_PARTITIONS_FUNCTION)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION news_drop_partitions(timestamp)")
+    op.execute(OLD_CREATE_PARTITIONS_FUNCTION)
+    op.execute(OLD_DEDUPLICATE_FUNCTION)
+
+    op.drop_index("ix_news_dedup_created_at", table_name="news_dedup")
+    op.drop_column("news_dedup", "created_at")
@@ -1,18 +1,62 @@
+import hashlib
 from datetime import datetime
 from typing import Literal
 
 import sqlalchemy
+from sqlalchemy import Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.sql.sqltypes import String, Integer, DateTime
+from sqlalchemy.sql.sqltypes import String, Integer, DateTime, LargeBinary
 
 from quantex.database.base import Base
+from quantex.settings import settings
+
+# Text search configuration used for headlines
+SEARCH_CONFIG = "english"
+# Channel that created news are sent to with NOTIFY
+NEWS_CHANNEL = "news"
 
 TERM = Literal["short", "long"]
 RESULT = Literal["positive", "negative", "neutral"]
 
 
+def news_content_hash(ticker: str, headline: str, term: str) -> bytes:
+    """
+    Fingerprint of an analysis, used to deduplicate news.
+
+    Headlines differing only in whitespace or casing get the same hash.
+
+    :param ticker: ticker of the news.
+    :param headline: headline of the news.
+    :param term: term of the analysis.
+    :return: 16 bytes MD5 digest.
+    """
+    normalized = " ".join(headline.split()).lower()
+    return hashlib.md5(  # noqa: S324
+        f"{ticker.upper()}\x1f{normalized}\x1f{term}".encode(),
+    ).digest()
+
+
+def _content_hash_default(context) -> bytes:
+    params = context.get_current_parameters()
+    return news_content_hash(
+        params["ticker"],
+        params["headline"],
+        params["term"],
+    )
+
+
 class NewsModel(Base):
+    """
+    News, partitioned by month of creation.
+
+    Partitions are created ahead of time by `news_create_partitions`, news
+    outside of them end up in the default partition until the partition of
+    their month is created. `news_drop_partitions` drops old partitions.
+    """
+
     __tablename__ = "news"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[Integer] = mapped_column(
         Integer(),
@@ -22,6 +66,7 @@ class NewsModel(Base):
     )
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(),
+        primary_key=True,
         nullable=False,
         default=datetime.utcnow,
     )
@@ -45,3 +90,204 @@ class NewsModel(Base):
         sqlalchemy.Enum("positive", "negative", "neutral", name="result"),
         nullable=False,
     )
+    content_hash: Mapped[LargeBinary] = mapped_column(
+        LargeBinary(length=16),
+        nullable=False,
+        default=_content_hash_default,
+    )
+    headline_tsv: Mapped[TSVECTOR] = mapped_column(
+        TSVECTOR(),
+        Computed(f"to_tsvector('{SEARCH_CONFIG}', headline)", persisted=True),
+        deferred=True,
+    )
+
+
+# Indexes for the query shapes served by NewsDAO
+sqlalchemy.Index(
+    "ix_news_created_at_id",
+    NewsModel.created_at.desc(),
+    NewsModel.id.desc(),
+)
+sqlalchemy.Index(
+    "ix_news_ticker_created_at_id",
+    NewsModel.ticker,
+    NewsModel.created_at.desc(),
+    NewsModel.id.desc(),
+)
+sqlalchemy.Index(
+    "ix_news_ticker_term_result",
+    NewsModel.ticker,
+    NewsModel.term,
+    NewsModel.result,
+)
+sqlalchemy.Index(
+    "ix_news_headline_ticker",
+    NewsModel.headline,
+    NewsModel.ticker,
+)
+sqlalchemy.Index(
+    "ix_news_headline_tsv",
+    NewsModel.headline_tsv,
+    postgresql_using="gin",
+)
+sqlalchemy.Index(
+    "ix_news_headline_trgm",
+    NewsModel.headline,
+    postgresql_using="gin",
+    postgresql_ops={"headline": "gin_trgm_ops"},
+)
+
+
+class NewsDedupModel(Base):
+    """
+    Content hashes of all news ever created.
+
+    Unique indexes of the partitioned news table have to include created_at,
+    so news are deduplicated against this table by a trigger instead. Hashes
+    are deleted with the partitions of their news.
+    """
+
+    __tablename__ = "news_dedup"
+
+    content_hash: Mapped[LargeBinary] = mapped_column(
+        LargeBinary(length=16),
+        primary_key=True,
+    )
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(),
+        nullable=False,
+        index=True,
+    )
+
+
+NEWS_CREATE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_create_partitions(
+    since timestamp,
+    until timestamp
+) RETURNS void AS $$
+DECLARE
+    month timestamp := date_trunc('month', since);
+    partition text;
+    columns text;
+BEGIN
+    -- Workers create partitions at the same time on startup
+    PERFORM pg_advisory_xact_lock(hashtext('news_create_partitions'));
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum)
+    INTO columns
+    FROM pg_attribute
+    WHERE attrelid = 'news'::regclass
+        AND attnum > 0
+        AND NOT attisdropped
+        AND attgenerated = '';
+
+    WHILE month < until LOOP
+        partition := 'news_' || to_char(month, 'YYYY_MM');
+        IF to_regclass(partition) IS NOT NULL THEN
+            NULL;
+        ELSIF EXISTS (
+            SELECT FROM news_default
+            WHERE created_at >= month
+                AND created_at < month + interval '1 month'
+        ) THEN
+            -- A partition can't be created over news in the default
+            -- partition, so they are moved into it before it's attached
+            EXECUTE format(
+                'CREATE TABLE %I '
+                '(LIKE news INCLUDING DEFAULTS INCLUDING GENERATED)',
+                partition
+            );
+            EXECUTE format(
+                'WITH moved AS ('
+                'DELETE FROM news_default '
+                'WHERE created_at >= $1 AND created_at < $2 '
+                'RETURNING %s'
+                ') INSERT INTO %I (%s) SELECT %s FROM moved',
+                columns, partition, columns, columns
+            ) USING month, month + interval '1 month';
+            EXECUTE format(
+                'ALTER TABLE news ATTACH PARTITION %I '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition, month, month + interval '1 month'
+            );
+        ELSE
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF news '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition, month, month + interval '1 month'
+            );
+        END IF;
+        month := month + interval '1 month';
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+NEWS_DROP_PARTITIONS_FUNCTION = r"""
+CREATE OR REPLACE FUNCTION news_drop_partitions(
+    before timestamp
+) RETURNS void AS $$
+DECLARE
+    cutoff timestamp := date_trunc('month', before);
+    partition text;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('news_create_partitions'));
+    FOR partition IN
+        SELECT relname
+        FROM pg_inherits
+        JOIN pg_class ON pg_class.oid = inhrelid
+        WHERE inhparent = 'news'::regclass
+            AND relname ~ '^news_\d{4}_\d{2}$'
+            AND to_date(substr(relname, 6), 'YYYY_MM') < cutoff
+    LOOP
+        EXECUTE format('DROP TABLE %I', partition);
+    END LOOP;
+    DELETE FROM news_default WHERE created_at < cutoff;
+    -- Dropped news can be created again
+    DELETE FROM news_dedup WHERE created_at < cutoff;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+NEWS_DEDUPLICATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_deduplicate() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO news_dedup (content_hash, created_at)
+    VALUES (NEW.content_hash, NEW.created_at)
+    ON CONFLICT DO NOTHING;
+    IF NOT FOUND THEN
+        -- Skip news that was created before
+        RETURN NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+NEWS_DEDUPLICATE_TRIGGER = """
+CREATE TRIGGER news_deduplicate BEFORE INSERT ON news
+FOR EACH ROW EXECUTE FUNCTION news_deduplicate()
+"""
+
+# The trigram index needs the pg_trgm extension
+sqlalchemy.event.listen(
+    NewsModel.__table__,
+    "before_create",
+    sqlalchemy.DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
+for ddl in (
+    "CREATE TABLE news_default PARTITION OF news DEFAULT",
+    NEWS_CREATE_PARTITIONS_FUNCTION,
+    NEWS_DROP_PARTITIONS_FUNCTION,
+    # Same range as quantex.database.utils.create_news_partitions
+    "SELECT news_create_partitions(timezone('utc', now()), "
+    "timezone('utc', now()) + "
+    f"make_interval(months => {settings.news_partitions_ahead}))",
+    NEWS_DEDUPLICATE_FUNCTION,
+    NEWS_DEDUPLICATE_TRIGGER,
+):
+    sqlalchemy.event.listen(
+        NewsModel.__table__,
+        "after_create",
+        # DDL formats statements with %, format() of PL/pgSQL uses it too
+        sqlalchemy.DDL(ddl.replace("%", "%%")),
+    )
@@ -0,0 +1,33 @@
+import sqlalchemy
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.sqltypes import String, Integer, DateTime
+
+from quantex.database.base import Base
+from quantex.database.models.news_model import RESULT, TERM
+
+
+class NewsSentimentHourlyModel(Base):
+    """Number of news per ticker, term and result in every hour."""
+
+    __tablename__ = "news_sentiment_hourly"
+
+    ticker: Mapped[String] = mapped_column(
+        String(length=8),
+        primary_key=True,
+    )
+    bucket: Mapped[DateTime] = mapped_column(
+        DateTime(),
+        primary_key=True,
+    )
+    term: Mapped[TERM] = mapped_column(
+        sqlalchemy.Enum("short", "long", name="term"),
+        primary_key=True,
+    )
+    result: Mapped[RESULT] = mapped_column(
+        sqlalchemy.Enum("positive", "negative", "neutral", name="result"),
+        primary_key=True,
+    )
+    count: Mapped[Integer] = mapped_column(
+        Integer(),
+        nullable=False,
+    )
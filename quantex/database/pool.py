@@ -0,0 +1,125 @@
+import asyncio
+import time
+import typing
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from quantex.settings import settings
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Connection pool that records how long checkouts wait for a connection.
+
+    Waiting includes opening a new connection when the pool has none left.
+    """
+
+    def __init__(
+        self,
+        *args: typing.Any,
+        max_overflow: int = 10,
+        **kwargs: typing.Any,
+    ):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        self.max_overflow = max_overflow
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def _do_get(self) -> typing.Any:  # noqa: WPS120
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+
+
+def create_engine(url: typing.Optional[str] = None) -> AsyncEngine:
+    """
+    Create engine with the pool configured in settings.
+
+    :param url: database URL, defaults to the primary database.
+    :return: new engine.
+    """
+    return create_async_engine(
+        url or str(settings.db_url),
+        echo=settings.db_echo,
+        poolclass=InstrumentedPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={
+            # SQLAlchemy prepares statements itself and caches them per
+            # connection, asyncpg caches statements of its own queries
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "statement_cache_size": settings.db_statement_cache_size,
+        },
+    )
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> None:
+    """
+    Open connections of the pool ahead of the first requests.
+
+    :param engine: engine with the pool.
+    :param connections: number of connections to open, at most pool size.
+    """
+    pool = engine.pool
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        connections = min(connections, pool.size())
+
+    opened = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)),
+        return_exceptions=True,
+    )
+    for conn in opened:
+        if not isinstance(conn, BaseException):
+            await conn.close()
+
+    errors = [conn for conn in opened if isinstance(conn, BaseException)]
+    if errors:
+        raise errors[0]
+
+
+def pool_stats(engine: AsyncEngine) -> typing.Dict[str, typing.Any]:
+    """
+    Get statistics of the connection pool of this worker.
+
+    :param engine: engine with the pool.
+    :return: pool statistics.
+    """
+    pool = engine.pool
+    stats: typing.Dict[str, typing.Any] = {"pool": type(pool).__name__}
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+
+    if isinstance(pool, InstrumentedPool):
+        stats.update(
+            max_overflow=pool.max_overflow,
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            wait_time=pool.wait_time,
+            avg_wait_time=pool.wait_time / pool.checkouts
+            if pool.checkouts
+            else 0.0,
+            max_wait_time=pool.max_wait_time,
+        )
+
+    return stats
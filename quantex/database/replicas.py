@@ -0,0 +1,140 @@
+import asyncio
+import collections
+import logging
+import typing
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from quantex.database.pool import create_engine
+
+logger = logging.getLogger(__name__)
+
+# Seconds a replica lags behind, 0 when it replayed all WAL it received.
+# NULL when it doesn't receive WAL from the primary, or hasn't replayed any
+# yet, as its lag can't be told then.
+LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN NOT EXISTS (SELECT FROM pg_stat_wal_receiver) THEN NULL
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+
+class Replica:
+    """Read replica with its engine and last measured lag."""
+
+    def __init__(self, url: str):
+        url = make_url(url).set(drivername="postgresql+asyncpg")
+        self.name = url.render_as_string(hide_password=True)
+        self.engine = create_engine(url.render_as_string(hide_password=False))
+        self.session_factory = async_sessionmaker(
+            self.engine.execution_options(isolation_level="AUTOCOMMIT"),
+            expire_on_commit=False,
+        )
+        # Unknown until checked, or when the replica can't be reached or
+        # doesn't stream from the primary
+        self.lag: typing.Optional[float] = None
+
+    async def check_lag(self) -> None:
+        """Measure how many seconds the replica lags behind the primary."""
+        async with self.engine.connect() as conn:
+            lag = await conn.scalar(text(LAG_SQL))
+        self.lag = None if lag is None else float(lag)
+
+
+class ReplicaRouter:
+    """
+    Routes read-only sessions to read replicas.
+
+    Sessions go to the replica with the fewest checked out connections,
+    replicas with as many are taken in turns. Replicas that lag behind more
+    than `max_lag` seconds, that don't stream WAL from the primary, or that
+    weren't checked yet, are skipped. Without any usable replica sessions go
+    to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: typing.Callable[[], AsyncSession],
+        urls: typing.Sequence[str],
+        max_lag: float,
+    ):
+        self.primary = primary
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag = max_lag
+
+        self._turn = 0
+
+    def usable(self) -> typing.List[Replica]:
+        """
+        Get replicas that are close enough behind the primary.
+
+        :return: usable replicas.
+        """
+        return [
+            replica
+            for replica in self.replicas
+            if replica.lag is not None and replica.lag <= self.max_lag
+        ]
+
+    def session(self) -> AsyncSession:
+        """
+        Create read-only session on a replica, or on the primary.
+
+        :return: new session.
+        """
+        replicas = self.usable()
+        if not replicas:
+            return self.primary()
+
+        # Start at the next replica, so ties are taken in turns
+        self._turn += 1
+        rotated = collections.deque(replicas)
+        rotated.rotate(-self._turn)
+        replica = min(
+            rotated,
+            key=lambda replica: replica.engine.pool.checkedout(),
+        )
+        return replica.session_factory()
+
+    async def check_lag(self, timeout: float) -> None:
+        """
+        Measure lag of all replicas.
+
+        Replicas that can't be reached in `timeout` seconds aren't used until
+        the next check.
+
+        :param timeout: seconds to wait for every replica.
+        """
+
+        async def check(replica: Replica) -> None:
+            try:
+                await asyncio.wait_for(replica.check_lag(), timeout)
+            except Exception:
+                replica.lag = None
+                logger.warning(
+                    f"Checking replica {replica.name} failed",
+                    exc_info=True,
+                )
+            else:
+                if replica.lag is None:
+                    logger.warning(
+                        f"Replica {replica.name} isn't streaming from the "
+                        "primary",
+                    )
+                elif replica.lag > self.max_lag:
+                    logger.warning(
+                        f"Replica {replica.name} lags {replica.lag:.1f}s "
+                        "behind",
+                    )
+
+        await asyncio.gather(*(check(replica) for replica in self.replicas))
+
+    async def dispose(self) -> None:
+        """Close connections of all replicas."""
+        for replica in self.replicas:
+            await replica.engine.dispose()
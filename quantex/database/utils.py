@@ -1,44 +1,96 @@
 from sqlalchemy import text
 from sqlalchemy.engine import make_url
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from quantex.settings import settings
 
 
-async def create_database() -> None:
-    """Create a databse."""
+async def create_database(name: str = settings.db_base) -> None:
+    """
+    Create a databse.
+
+    :param name: name of the database, drops it first if it exists.
+    """
     db_url = make_url(str(settings.db_url.with_path("/postgres")))
     engine = create_async_engine(db_url, isolation_level="AUTOCOMMIT")
 
     async with engine.connect() as conn:
         database_existance = await conn.execute(
             text(
-                f"SELECT 1 FROM pg_database WHERE datname='{settings.db_base}'",  # noqa: E501, S608
+                f"SELECT 1 FROM pg_database WHERE datname='{name}'",  # noqa: E501, S608
             ),
         )
         database_exists = database_existance.scalar() == 1
 
     if database_exists:
-        await drop_database()
+        await drop_database(name)
 
     async with engine.connect() as conn:  # noqa: WPS440
         await conn.execute(
             text(
-                f'CREATE DATABASE "{settings.db_base}" ENCODING "utf8" TEMPLATE template1',  # noqa: E501
+                f'CREATE DATABASE "{name}" ENCODING "utf8" TEMPLATE template1',  # noqa: E501
             ),
         )
 
 
-async def drop_database() -> None:
-    """Drop current database."""
+async def drop_database(name: str = settings.db_base) -> None:
+    """
+    Drop a database.
+
+    :param name: name of the database.
+    """
     db_url = make_url(str(settings.db_url.with_path("/postgres")))
     engine = create_async_engine(db_url, isolation_level="AUTOCOMMIT")
     async with engine.connect() as conn:
         disc_users = (
             "SELECT pg_terminate_backend(pg_stat_activity.pid) "  # noqa: S608
             "FROM pg_stat_activity "
-            f"WHERE pg_stat_activity.datname = '{settings.db_base}' "
+            f"WHERE pg_stat_activity.datname = '{name}' "
             "AND pid <> pg_backend_pid();"
         )
         await conn.execute(text(disc_users))
-        await conn.execute(text(f'DROP DATABASE "{settings.db_base}"'))
+        await conn.execute(text(f'DROP DATABASE "{name}"'))
+
+
+async def create_news_partitions(
+    engine: AsyncEngine,
+    months_ahead: int = settings.news_partitions_ahead,
+) -> None:
+    """
+    Create monthly news partitions that don't exist yet.
+
+    :param engine: engine connected to the database.
+    :param months_ahead: number of months after the current one to cover.
+    """
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "SELECT news_create_partitions("
+                "timezone('utc', now()), "
+                "timezone('utc', now()) + make_interval(months => :months))",
+            ),
+            {"months": months_ahead},
+        )
+
+
+async def drop_news_partitions(
+    engine: AsyncEngine,
+    months_kept: int = settings.news_retention_months,
+) -> None:
+    """
+    Drop monthly news partitions older than the retention period.
+
+    Content hashes of the dropped news are deleted too, so they can be
+    created again.
+
+    :param engine: engine connected to the database.
+    :param months_kept: number of months before the current one to keep.
+    """
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "SELECT news_drop_partitions("
+                "timezone('utc', now()) - make_interval(months => :months))",
+            ),
+            {"months": months_kept},
+        )
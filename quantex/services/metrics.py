@@ -0,0 +1,202 @@
+import bisect
+import contextlib
+import contextvars
+import time
+import typing
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Upper bounds of histogram buckets in seconds
+BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Timings = typing.Dict[str, float]
+
+# Seconds spent in every stage of the current request
+request_timings: "contextvars.ContextVar[typing.Optional[Timings]]"
+request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def add_stage_time(name: str, seconds: float) -> None:
+    """
+    Add time spent in a stage to the current request.
+
+    Does nothing outside of requests.
+
+    :param name: name of the stage.
+    :param seconds: time spent.
+    """
+    timings = request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextlib.contextmanager
+def stage(name: str) -> typing.Iterator[None]:
+    """
+    Time a block as a stage of the current request.
+
+    :param name: name of the stage.
+    :yield: nothing.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_stage_time(name, time.perf_counter() - start)
+
+
+def time_queries(engine: AsyncEngine) -> None:
+    """
+    Time queries of an engine as the "db" stage of requests.
+
+    :param engine: engine to time.
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start"].pop()
+        add_stage_time("db", time.perf_counter() - start)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _error(context):
+        if context.connection is not None:
+            starts = context.connection.info.get("query_start")
+            if starts:
+                start = starts.pop()
+                add_stage_time("db", time.perf_counter() - start)
+
+
+def _labels(names: typing.Sequence[str], values: typing.Sequence[str]) -> str:
+    escaped = (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for value in values
+    )
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+class Histogram:
+    """Prometheus histogram with labels."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: typing.Sequence[str],
+        buckets: typing.Sequence[float] = BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+
+        # Observations per bucket, the last one is +Inf, and their sum
+        self._series: typing.Dict[
+            typing.Tuple[str, ...],
+            typing.Tuple[typing.List[int], typing.List[float]],
+        ] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record an observation.
+
+        :param value: observed value.
+        :param labels: label values, in the order of `labels`.
+        """
+        counts, total = self._series.setdefault(
+            labels,
+            ([0] * (len(self.buckets) + 1), [0.0]),
+        )
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> typing.Iterator[str]:
+        """
+        Render the histogram in the Prometheus text format.
+
+        :yield: lines of the histogram.
+        """
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+
+        bounds = [repr(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            label_text = _labels(self.labels, labels)
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket"
+                    f'{{{label_text},le="{bound}"}} {cumulative}'
+                )
+            yield f"{self.name}_sum{{{label_text}}} {total[0]}"
+            yield f"{self.name}_count{{{label_text}}} {cumulative}"
+
+
+class Metrics:
+    """
+    Latency histograms of HTTP requests.
+
+    Every worker keeps its own metrics, they are only recorded from the event
+    loop, so they need no locking.
+    """
+
+    def __init__(self):
+        self.requests = Histogram(
+            "quantex_http_request_duration_seconds",
+            "Time to handle HTTP requests.",
+            ("method", "route", "status"),
+        )
+        self.stages = Histogram(
+            "quantex_http_request_stage_duration_seconds",
+            "Time spent in auth, db and serialize stages of HTTP requests.",
+            ("method", "route", "stage"),
+        )
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        timings: Timings,
+    ) -> None:
+        """
+        Record a handled request.
+
+        :param method: HTTP method.
+        :param route: path template of the route.
+        :param status: response status code.
+        :param duration: time to handle the request.
+        :param timings: time spent in every stage.
+        """
+        self.requests.observe(duration, method, route, str(status))
+        for name, seconds in timings.items():
+            self.stages.observe(seconds, method, route, name)
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text format.
+
+        :return: metrics.
+        """
+        lines = [*self.requests.render(), *self.stages.render()]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,207 @@
+import asyncio
+import collections
+import contextlib
+import logging
+import typing
+
+import asyncpg
+import orjson
+
+from quantex.database.models.news_model import NEWS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Queue of server-sent events of news matching a subscriber's filters."""
+
+    def __init__(
+        self,
+        ticker: typing.Optional[str],
+        term: typing.Optional[str],
+        result: typing.Optional[str],
+        max_queued: int,
+    ):
+        self.ticker = ticker
+        self.term = term
+        self.result = result
+
+        # None tells the subscriber that it was dropped
+        self._queue: "asyncio.Queue[typing.Optional[bytes]]"
+        self._queue = asyncio.Queue(max_queued)
+        self.dropped = False
+
+    def matches(self, news: typing.Dict[str, typing.Any]) -> bool:
+        """
+        Check whether news pass the term and result filters.
+
+        :param news: created news.
+        :return: whether to send the news.
+        """
+        return (self.term is None or news["term"] == self.term) and (
+            self.result is None or news["result"] == self.result
+        )
+
+    def put(self, event: bytes) -> None:
+        """
+        Queue an event, or drop the subscriber if it doesn't keep up.
+
+        :param event: encoded event.
+        """
+        if self.dropped:
+            return
+
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._drop()
+
+    def close(self) -> None:
+        """
+        End the subscription after the queued events.
+
+        Subscribers without room for the end are dropped right away.
+        """
+        if self.dropped:
+            return
+
+        try:
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            self._drop()
+        else:
+            self.dropped = True
+
+    async def get(self) -> typing.Optional[bytes]:
+        """
+        Wait for the next event.
+
+        :return: encoded event, or None if the subscriber was dropped.
+        """
+        return await self._queue.get()
+
+    def _drop(self) -> None:
+        self.dropped = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+
+class NewsEvents:
+    """
+    Fans out created news to subscribers of this worker.
+
+    A single LISTEN connection per worker receives news of all tickers, so
+    subscribers don't cost database connections. Every event is encoded once
+    and queued for all matching subscribers, subscribers that fall behind
+    are dropped instead of buffering without limit.
+    """
+
+    def __init__(self, max_queued: int = 100):
+        self.max_queued = max_queued
+
+        # Subscribers by ticker, None for subscribers of all tickers
+        self._subscribers: typing.DefaultDict[
+            typing.Optional[str],
+            typing.Set[Subscription],
+        ] = collections.defaultdict(set)
+        # Subscriptions made once closed end right away
+        self.closed = False
+
+    @contextlib.contextmanager
+    def subscribe(
+        self,
+        ticker: typing.Optional[str] = None,
+        term: typing.Optional[str] = None,
+        result: typing.Optional[str] = None,
+    ) -> typing.Iterator[Subscription]:
+        """
+        Subscribe to created news by optional ticker, term or result.
+
+        :param ticker: ticker of the news.
+        :param term: term of the analysis.
+        :param result: result of the analysis.
+        :yield: subscription, that ends when the block exits.
+        """
+        subscription = Subscription(ticker, term, result, self.max_queued)
+        if self.closed:
+            subscription.close()
+        self._subscribers[ticker].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers[ticker]
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[ticker]
+
+    def publish(self, payload: str) -> None:
+        """
+        Send news from a notification to matching subscribers.
+
+        :param payload: news encoded as JSON.
+        """
+        news = orjson.loads(payload)
+        event = b"id: %d\nevent: news\ndata: %s\n\n" % (
+            news["id"],
+            payload.encode(),
+        )
+
+        for ticker in (news["ticker"], None):
+            for subscription in self._subscribers.get(ticker, ()):
+                if subscription.matches(news):
+                    subscription.put(event)
+
+    def close(self) -> None:
+        """End all subscriptions, so their responses finish."""
+        self.closed = True
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+    def _on_notification(
+        self,
+        connection: asyncpg.Connection,
+        pid: int,
+        channel: str,
+        payload: str,
+    ) -> None:
+        try:
+            self.publish(payload)
+        except Exception:
+            logger.exception("Publishing news failed")
+
+    async def listen(self, dsn: str, retry: float = 5) -> None:
+        """
+        Receive created news until cancelled.
+
+        The connection is opened again when it's lost. News created meanwhile
+        aren't sent.
+
+        :param dsn: URL of the primary database.
+        :param retry: seconds to wait before connecting again.
+        """
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except Exception:
+                logger.exception("Connecting to receive news failed")
+                await asyncio.sleep(retry)
+                continue
+
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda _: lost.set())
+            try:
+                await connection.add_listener(
+                    NEWS_CHANNEL,
+                    self._on_notification,
+                )
+                await lost.wait()
+            except Exception:
+                logger.exception("Receiving news failed")
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+
+            logger.warning("Connection receiving news was lost")
+            await asyncio.sleep(retry)
@@ -0,0 +1,170 @@
+import collections
+import hashlib
+import time
+import typing
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+CacheKey = typing.Tuple[typing.Tuple[str, typing.Any], ...]
+
+
+class CachedResponse(typing.NamedTuple):
+    """Encoded response body with its ETag."""
+
+    body: bytes
+    etag: str
+    expires_at: float
+    ticker: typing.Optional[str]
+
+
+class ResponseCache:
+    """
+    LRU cache of encoded GET responses with a TTL.
+
+    Every worker has its own cache, so a write handled by one worker only
+    invalidates entries of that worker. Entries of other workers expire after
+    `ttl` seconds at the latest. The cache is only used from the event loop,
+    so it needs no locking.
+
+    Reads from replicas may lag up to `stale_for` seconds behind, so
+    responses read that soon before an invalidation of their ticker are
+    returned without being cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 30,
+        stale_for: float = 0,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_for = stale_for
+
+        self._entries: typing.OrderedDict[CacheKey, CachedResponse]
+        self._entries = collections.OrderedDict()
+        # Last invalidation by ticker, None for invalidation of any ticker
+        self._invalidated: typing.Dict[typing.Optional[str], float] = {}
+
+    @staticmethod
+    def key(**filters: typing.Any) -> CacheKey:
+        """
+        Normalize query filters into a cache key.
+
+        Empty filters are left out, since they don't narrow down a query.
+
+        :param filters: query parameters of a request.
+        :return: hashable key.
+        """
+        return tuple(
+            sorted((name, value) for name, value in filters.items() if value)
+        )
+
+    def get(self, key: CacheKey) -> typing.Optional[CachedResponse]:
+        """
+        Get a cached response.
+
+        :param key: key created by `key`.
+        :return: the response, or None if it isn't cached or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self,
+        key: CacheKey,
+        body: bytes,
+        ticker: typing.Optional[str] = None,
+        read_at: typing.Optional[float] = None,
+    ) -> CachedResponse:
+        """
+        Cache an encoded response.
+
+        :param key: key created by `key`.
+        :param body: encoded response body.
+        :param ticker: ticker the response is limited to, if any.
+        :param read_at: `time.monotonic()` before the response was read,
+            defaults to now.
+        :return: the response, not cached if it may be stale.
+        """
+        now = time.monotonic()
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        entry = CachedResponse(body, etag, now + self.ttl, ticker)
+
+        invalidated = self._invalidated.get(ticker)
+        if invalidated is not None and invalidated > (
+            (now if read_at is None else read_at) - self.stale_for
+        ):
+            return entry
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return entry
+
+    def invalidate(self, tickers: typing.Iterable[str]) -> None:
+        """
+        Drop responses that news of `tickers` could change.
+
+        These are responses limited to one of the tickers, and all responses
+        that aren't limited to a ticker.
+
+        :param tickers: tickers of created news.
+        """
+        tickers = set(tickers)
+        if not tickers:
+            return
+
+        if self.stale_for:
+            now = time.monotonic()
+            self._invalidated = {
+                ticker: invalidated
+                for ticker, invalidated in self._invalidated.items()
+                if invalidated > now - self.stale_for
+            }
+            self._invalidated.update(dict.fromkeys(tickers | {None}, now))
+
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if entry.ticker is None or entry.ticker in tickers
+        ]
+        for key in stale:
+            del self._entries[key]
+
+
+def cached_response(
+    request: Request,
+    entry: CachedResponse,
+    media_type: str = "application/json",
+) -> Response:
+    """
+    Respond with a cached body, or with 304 if the client already has it.
+
+    :param request: current request.
+    :param entry: cached response.
+    :param media_type: media type of the body.
+    :return: response.
+    """
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    etags = {
+        tag.strip()[2:] if tag.strip().startswith("W/") else tag.strip()
+        for tag in if_none_match.split(",")
+    }
+    if entry.etag in etags or "*" in etags:
+        return Response(status_code=304, headers=headers)
+
+    return Response(entry.body, headers=headers, media_type=media_type)
@@ -0,0 +1,87 @@
+"""
+Recount the hourly sentiment rollups from news.
+
+New news are counted when they are created, this is only needed for news
+stored before the rollups existed, or to repair them.
+
+Usage::
+
+    poetry run python -m quantex.services.rollups --since 2023-01-01
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+import typing
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from quantex.database.dao.news_dao import NewsDAO
+from quantex.database.models.news_model import NewsModel
+from quantex.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _truncate(moment: datetime.datetime) -> datetime.datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+async def backfill(
+    since: typing.Optional[datetime.datetime] = None,
+    until: typing.Optional[datetime.datetime] = None,
+    window: datetime.timedelta = datetime.timedelta(days=1),
+) -> int:
+    """
+    Recount the rollups one window at a time.
+
+    Every window is recounted in its own short transaction, so writers are
+    only blocked for a moment.
+
+    :param since: start of the first hour, defaults to the oldest news.
+    :param until: end of the last hour, defaults to the current hour.
+    :param window: time span recounted per transaction.
+    :return: number of rollup rows written.
+    """
+    engine = create_async_engine(str(settings.db_url))
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    written = 0
+
+    try:
+        async with session_factory() as session:
+            if since is None:
+                since = await session.scalar(
+                    select(func.min(NewsModel.created_at)),
+                )
+                await session.commit()
+            if since is None:
+                return 0
+
+            # Rollups are recounted in whole hours only
+            since = _truncate(since)
+            until = until or datetime.datetime.utcnow()
+            if until != _truncate(until):
+                until = _truncate(until) + datetime.timedelta(hours=1)
+
+            dao = NewsDAO(session)
+            while since < until:
+                end = min(since + window, until)
+                written += await dao.rebuild_sentiment(since, end)
+                logger.info(f"Recounted news from {since} to {end}")
+                since = end
+    finally:
+        await engine.dispose()
+
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--since", type=datetime.datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.datetime.fromisoformat)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.log_level.value)
+    rows = asyncio.run(backfill(args.since, args.until))
+    logger.info(f"Wrote {rows} rollup rows")
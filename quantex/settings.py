@@ -47,6 +47,43 @@ class Settings(BaseSettings):  # type: ignore
     db_pass: str = "quantex"
     db_base: str = "quantex"
     db_echo: bool = False
+    # Connection pool of every worker, keep workers_count times
+    # (db_pool_size + db_max_overflow) below max_connections of Postgres
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    # Seconds after which connections are replaced, -1 to keep them
+    db_pool_recycle: int = -1
+    db_pool_pre_ping: bool = False
+    # Connections opened on startup, at most db_pool_size
+    db_pool_prewarm: int = 5
+    # Prepared statements cached per connection, 0 behind pgbouncer
+    db_statement_cache_size: int = 100
+    # Read replicas as a JSON list of database URLs, news reads go to them
+    db_replica_urls: typing.List[str] = []
+    # Replicas lagging behind more seconds are skipped until they catch up
+    db_replica_max_lag: float = 10
+    db_replica_check_interval: float = 5
+    # Months of news partitions created ahead of time
+    news_partitions_ahead: int = 3
+    # Months of news kept before the current one, older partitions are
+    # dropped with their content hashes, 0 to keep all news
+    news_retention_months: int = 0
+
+    # Page sizes of GET /api/news
+    news_page_size: int = 100
+    news_max_page_size: int = 1000
+    # Deepest result of GET /api/news/search that can be paged to
+    news_search_max_results: int = 1000
+    # Days searched by GET /api/news/search, unless `since` is given
+    news_search_days: int = 90
+    # Per-worker cache of GET /api/news responses
+    news_cache_size: int = 1024
+    news_cache_ttl: float = 30
+    # Events queued per subscriber of GET /api/news/subscribe before it's
+    # dropped, and seconds between keepalives sent to idle subscribers
+    news_events_queue_size: int = 100
+    news_events_keepalive: float = 15
 
     secret_key: str = "secret"
 
@@ -0,0 +1,204 @@
+import asyncio
+import signal
+import typing
+
+import pytest
+import uvicorn
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from quantex.database.pool import pool_stats
+from quantex.settings import settings
+from quantex.tests.utils import HEADERS
+from quantex.web import lifetime
+from quantex.web.application import get_app
+
+
+async def wait_until(condition: typing.Callable[[], bool]) -> None:
+    """
+    Wait until background tasks of the app meet a condition.
+
+    :param condition: checked every 10ms, for at most 5 seconds.
+    """
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Condition wasn't met in time")
+
+
+@pytest.fixture
+async def started_app(
+    _engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> typing.AsyncGenerator[FastAPI, None]:
+    """
+    Run startup and shutdown of an app connected to the test database.
+
+    The app has a single replica, which is the test database itself.
+
+    :param _engine: engine of the test database.
+    :param monkeypatch: patches settings.
+    :yield: started app.
+    """
+    monkeypatch.setattr(settings, "db_replica_urls", [str(settings.db_url)])
+    application = get_app()
+    await application.router.startup()
+    # Checks cancelled while connecting fail after the test ends
+    await wait_until(lambda: bool(application.state.db_replicas.usable()))
+    try:
+        yield application
+    finally:
+        await application.router.shutdown()
+
+
+@pytest.mark.anyio
+async def test_startup(started_app: FastAPI) -> None:
+    state = started_app.state
+    stats = pool_stats(state.db_engine)
+    assert stats["pool"] == "InstrumentedPool"
+    # Partitions may be created on one of the connections meanwhile
+    assert stats["checked_in"] + stats["checked_out"] == min(
+        settings.db_pool_prewarm,
+        settings.db_pool_size,
+    )
+    assert stats["max_overflow"] == settings.db_max_overflow
+    assert state.news_cache.ttl == settings.news_cache_ttl
+    assert state.news_cache.stale_for == settings.db_replica_max_lag
+
+    async with state.db_readonly_session_factory() as session:
+        assert await session.scalar(text("SELECT 1")) == 1
+
+
+@pytest.mark.anyio
+async def test_pool_api(started_app: FastAPI) -> None:
+    async with AsyncClient(app=started_app, base_url="http://test") as ac:
+        response = await ac.get("/api/internal/pool", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["size"] == settings.db_pool_size
+
+
+@pytest.mark.anyio
+async def test_replicas(started_app: FastAPI) -> None:
+    replicas = started_app.state.db_replicas
+    assert replicas.usable()[0].lag == 0
+    async with replicas.session() as session:
+        assert session.bind.pool is replicas.replicas[0].engine.pool
+        assert await session.scalar(text("SELECT 1")) == 1
+
+
+@pytest.mark.anyio
+async def test_news_events(started_app: FastAPI, _engine: AsyncEngine) -> None:
+    events = started_app.state.news_events
+    payload = (
+        '{"id": 1, "ticker": "AAPL", "term": "short", "result": "positive"}'
+    )
+
+    with events.subscribe("AAPL") as subscription:
+        # The LISTEN connection is opened in the background, so news are
+        # sent until it receives them
+        async def receive() -> typing.Optional[bytes]:
+            while True:  # noqa: WPS457
+                async with _engine.connect() as conn:
+                    await conn.execute(
+                        text("SELECT pg_notify('news', :payload)"),
+                        {"payload": payload},
+                    )
+                    await conn.commit()
+                try:
+                    return await asyncio.wait_for(subscription.get(), 0.1)
+                except asyncio.TimeoutError:
+                    continue
+
+        event = await asyncio.wait_for(receive(), 5)
+
+    assert event == b"id: 1\nevent: news\ndata: %s\n\n" % payload.encode()
+
+
+@pytest.mark.anyio
+async def test_partitions(
+    _engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls = []
+
+    async def drop_news_partitions(engine: AsyncEngine) -> None:
+        calls.append(engine)
+        raise RuntimeError("Dropping failed")
+
+    monkeypatch.setattr(settings, "news_retention_months", 12)
+    monkeypatch.setattr(lifetime, "drop_news_partitions", drop_news_partitions)
+    application = get_app()
+    await application.router.startup()
+    try:
+        # Failures are logged and the task keeps running
+        await wait_until(lambda: bool(calls))
+        assert not application.state.partitions_task.done()
+        assert calls == [application.state.db_engine]
+    finally:
+        await application.router.shutdown()
+
+
+@pytest.mark.anyio
+async def test_shutdown(started_app: FastAPI) -> None:
+    state = started_app.state
+    tasks = (
+        state.partitions_task,
+        state.replicas_task,
+        state.news_events_task,
+    )
+
+    with state.news_events.subscribe() as subscription:
+        await started_app.router.shutdown()
+        assert await subscription.get() is None
+
+    assert all(task.cancelled() for task in tasks)
+    assert pool_stats(state.db_engine)["checked_in"] == 0
+
+
+async def read_all(lines: typing.AsyncIterator[str]) -> typing.List[str]:
+    """
+    Read lines until the response ends.
+
+    :param lines: lines of a streamed response.
+    :return: all remaining lines.
+    """
+    return [line async for line in lines]
+
+
+@pytest.mark.anyio
+async def test_server_exit(_engine: AsyncEngine) -> None:
+    """Checks that a server with subscribers exits when it's asked to."""
+    exits: typing.List[int] = []
+    # The server raises the signal again once it stopped
+    original = signal.signal(signal.SIGTERM, lambda sig, _: exits.append(sig))
+    server = uvicorn.Server(
+        uvicorn.Config(get_app(), port=0, log_level="warning"),
+    )
+    serving = asyncio.create_task(server.serve())
+    try:
+        await wait_until(lambda: server.started)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as ac:
+            async with ac.stream(
+                "GET",
+                "/api/news/subscribe",
+                headers=HEADERS,
+            ) as response:
+                lines = response.aiter_lines()
+                assert await anext(lines) == ": subscribed"
+
+                signal.raise_signal(signal.SIGTERM)
+                rest = await asyncio.wait_for(read_all(lines), 5)
+        await asyncio.wait_for(asyncio.shield(serving), 5)
+    finally:
+        signal.signal(signal.SIGTERM, original)
+        if not serving.done():
+            server.force_exit = True
+            await serving
+
+    assert not "".join(rest).strip()
+    assert exits == [signal.SIGTERM]
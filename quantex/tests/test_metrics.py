@@ -0,0 +1,67 @@
+import re
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from quantex.tests.utils import HEADERS
+
+
+@pytest.mark.anyio
+async def test_server_timing(client: AsyncClient) -> None:
+    """Checks that responses get the time spent per stage."""
+    response = await client.get(
+        "/api/news/search",
+        params={"q": "earnings"},
+        headers=HEADERS,
+    )
+
+    assert response.status_code == 200
+    stages = dict(
+        re.fullmatch(r"(\w+);dur=(\d+\.\d{3})", timing).groups()
+        for timing in response.headers["Server-Timing"].split(", ")
+    )
+    assert list(stages)[-1] == "total"
+    assert {"auth", "serialize"} <= set(stages)
+    assert float(stages["total"]) >= float(stages["auth"])
+    assert float(response.headers["X-Process-Time"]) > 0
+
+
+@pytest.mark.anyio
+async def test_route_labels(fastapi_app: FastAPI, client: AsyncClient) -> None:
+    """Checks that requests are labelled by route template, not by URL."""
+    for phrase in ("earnings", "apple", "beat estimates"):
+        await client.get(
+            "/api/news/search",
+            params={"q": phrase},
+            headers=HEADERS,
+        )
+    for path in ("/api/news/1", "/unknown", "/unknown/path"):
+        await client.get(path, headers=HEADERS)
+
+    response = await client.get("/metrics", headers=HEADERS)
+
+    assert response.status_code == 200
+    counts = dict(
+        re.findall(
+            r"^quantex_http_request_duration_seconds_count\{(.*)\} (\d+)$",
+            response.text,
+            flags=re.MULTILINE,
+        ),
+    )
+    assert counts == {
+        'method="GET",route="/api/news/search",status="200"': "3",
+        'method="GET",route="unmatched",status="404"': "3",
+    }
+    # Stages of the metrics request itself are recorded once it's sent
+    assert {
+        route for _, route, _ in fastapi_app.state.metrics.stages._series
+    } == {"/api/news/search", "/metrics"}
+
+
+@pytest.mark.anyio
+async def test_metrics_secret(client: AsyncClient) -> None:
+    """Checks that metrics need the secret header."""
+    response = await client.get("/metrics", headers={"X-Secret": "wrong"})
+
+    assert response.status_code == 403
@@ -0,0 +1,168 @@
+import collections
+import datetime
+from unittest import mock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from quantex.database.dao.news_dao import NEWS_FIELDS, NewsDAO
+from quantex.database.models.news_model import NewsModel
+from quantex.database.models.news_sentiment_model import (
+    NewsSentimentHourlyModel,
+)
+from quantex.tests.utils import news
+from quantex.web.api.news.schema import NewsModelCreateDTO, NewsModelDTO
+
+
+def test_news_fields() -> None:
+    """Checks that news are read with all fields of the API schema."""
+    assert NEWS_FIELDS == tuple(NewsModelDTO.model_fields)
+
+
+async def rollups(dbsession: AsyncSession, ticker: str) -> dict:
+    """
+    Get hourly sentiment rollups of a ticker.
+
+    :param dbsession: session to the database.
+    :param ticker: ticker of the news.
+    :return: counts by (bucket, term, result).
+    """
+    rollup = NewsSentimentHourlyModel
+    r = await dbsession.execute(
+        select(rollup.bucket, rollup.term, rollup.result, rollup.count).where(
+            rollup.ticker == ticker,
+        ),
+    )
+    return {(bucket, term, result): count for bucket, term, result, count in r}
+
+
+async def counted_news(dbsession: AsyncSession, ticker: str) -> dict:
+    """
+    Count stored news of a ticker by hour, term and result.
+
+    :param dbsession: session to the database.
+    :param ticker: ticker of the news.
+    :return: counts by (bucket, term, result), like `rollups`.
+    """
+    r = await dbsession.execute(
+        select(NewsModel.created_at, NewsModel.term, NewsModel.result).where(
+            NewsModel.ticker == ticker,
+        ),
+    )
+    return dict(
+        collections.Counter(
+            (
+                created_at.replace(minute=0, second=0, microsecond=0),
+                term,
+                result,
+            )
+            for created_at, term, result in r
+        ),
+    )
+
+
+@pytest.mark.anyio
+async def test_count_sentiment(dbsession: AsyncSession) -> None:
+    """Checks that created news are counted in the bucket of their hour."""
+    dao = NewsDAO(dbsession)
+    await dao.create_news(NewsModelCreateDTO(**news("ROLL", "First")))
+    await dao.create_many_news(
+        [
+            NewsModelCreateDTO(**news("ROLL", "Second")),
+            NewsModelCreateDTO(**news("ROLL", "Second", term="long")),
+            NewsModelCreateDTO(**news("ROLL", "Third", result="negative")),
+            NewsModelCreateDTO(**news("OTHER", "Second")),
+        ],
+    )
+
+    counts = await rollups(dbsession, "ROLL")
+    assert counts == await counted_news(dbsession, "ROLL")
+    assert sum(counts.values()) == 4
+    assert sum((await rollups(dbsession, "OTHER")).values()) == 1
+
+
+@pytest.mark.anyio
+async def test_count_sentiment_duplicates(dbsession: AsyncSession) -> None:
+    """Checks that duplicates rejected by the trigger aren't counted."""
+    dao = NewsDAO(dbsession)
+    assert await dao.create_news(NewsModelCreateDTO(**news("ROLL", "Same")))
+    assert not await dao.create_news(
+        NewsModelCreateDTO(**news("roll", "  same ")),
+    )
+    statuses = await dao.create_many_news(
+        [
+            NewsModelCreateDTO(**news("ROLL", "Same")),
+            NewsModelCreateDTO(**news("ROLL", "Other")),
+        ],
+    )
+
+    assert statuses == [("duplicate", None), ("created", mock.ANY)]
+    assert sum((await rollups(dbsession, "ROLL")).values()) == 2
+
+
+@pytest.mark.anyio
+async def test_get_sentiment(dbsession: AsyncSession) -> None:
+    """Checks that counts are summed up per bucket and filtered."""
+    dao = NewsDAO(dbsession)
+    await dao.create_many_news(
+        [
+            NewsModelCreateDTO(**news("ROLL", "First")),
+            NewsModelCreateDTO(**news("ROLL", "Second")),
+            NewsModelCreateDTO(**news("ROLL", "Third", result="negative")),
+        ],
+    )
+    now = datetime.datetime.utcnow()
+    since = now - datetime.timedelta(days=1)
+    until = now + datetime.timedelta(days=1)
+
+    counts = await dao.get_sentiment("ROLL", since, until, bucket="day")
+    assert [(row["term"], row["result"], row["count"]) for row in counts] == [
+        ("short", "positive", 2),
+        ("short", "negative", 1),
+    ]
+    assert {row["bucket"] for row in counts} == {
+        now.replace(hour=0, minute=0, second=0, microsecond=0),
+    }
+
+    negative = await dao.get_sentiment(
+        "ROLL",
+        since,
+        until,
+        result="negative",
+    )
+    assert [row["count"] for row in negative] == [1]
+    assert not await dao.get_sentiment("ROLL", since, until, term="long")
+
+
+@pytest.mark.anyio
+async def test_rebuild_sentiment(dbsession: AsyncSession) -> None:
+    """Checks that recounting reproduces the counts of created news."""
+    dao = NewsDAO(dbsession)
+    await dao.create_many_news(
+        [
+            NewsModelCreateDTO(**news("ROLL", "First")),
+            NewsModelCreateDTO(**news("ROLL", "Second", term="long")),
+            NewsModelCreateDTO(**news("ROLL", "Third", result="neutral")),
+        ],
+    )
+    incremental = await rollups(dbsession, "ROLL")
+    # Stored before the rollups existed, so never counted
+    two_hours_ago = datetime.datetime.utcnow() - datetime.timedelta(hours=2)
+    await dbsession.execute(
+        NewsModel.__table__.insert().values(
+            **news("ROLL", "Older"),
+            created_at=two_hours_ago,
+        ),
+    )
+    assert await rollups(dbsession, "ROLL") == incremental
+
+    since = two_hours_ago.replace(minute=0, second=0, microsecond=0)
+    until = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+    assert await dao.rebuild_sentiment(since, until) >= len(incremental) + 1
+
+    rebuilt = await rollups(dbsession, "ROLL")
+    assert rebuilt == await counted_news(dbsession, "ROLL")
+    assert {
+        key: count for key, count in rebuilt.items() if key[0] != since
+    } == incremental
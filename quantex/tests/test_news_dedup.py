@@ -0,0 +1,126 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from quantex.database.dao.news_dao import NewsDAO
+from quantex.tests.utils import HEADERS, news
+from quantex.web.api.news.schema import NewsLookupItemDTO
+
+
+@pytest.mark.anyio
+async def test_create_duplicate(client: AsyncClient) -> None:
+    """Checks that news differing in casing or whitespace are duplicates."""
+    response = await client.post(
+        "/api/news/",
+        json=news("AAPL", "Apple beats  estimates"),
+        headers=HEADERS,
+    )
+    assert response.json() == {"status": "ok", "created": True}
+
+    response = await client.post(
+        "/api/news/",
+        json=news("aapl", " apple BEATS estimates"),
+        headers=HEADERS,
+    )
+    assert response.json() == {"status": "ok", "created": False}
+
+
+@pytest.mark.anyio
+async def test_batch_statuses(client: AsyncClient) -> None:
+    """Checks that every batch item gets its own status."""
+    await client.post(
+        "/api/news/",
+        json=news("AAPL", "Apple beats estimates"),
+        headers=HEADERS,
+    )
+
+    response = await client.post(
+        "/api/news/batch",
+        json=[
+            news("AAPL", "APPLE BEATS ESTIMATES"),
+            news("MSFT", "Microsoft misses"),
+            news("MSFT", "Microsoft  misses "),
+            news("MSFT", "Microsoft misses", term="long"),
+            news("TOO_LONG_TICKER", "Headline"),
+        ],
+        headers=HEADERS,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["status"] for item in body["results"]] == [
+        "duplicate",
+        "created",
+        "duplicate",
+        "created",
+        "invalid",
+    ]
+    assert [item["id"] is not None for item in body["results"]] == [
+        False,
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert body["count"] == 2
+
+
+@pytest.mark.anyio
+async def test_batch_validation(client: AsyncClient) -> None:
+    """Checks that malformed batches are rejected as a whole."""
+    response = await client.post(
+        "/api/news/batch",
+        json=[{**news("AAPL", "Headline"), "result": "great"}],
+        headers=HEADERS,
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_exists(client: AsyncClient) -> None:
+    """Checks that stored pairs are found with any term."""
+    await client.post(
+        "/api/news/",
+        json=news("AAPL", "Apple beats estimates", term="long"),
+        headers=HEADERS,
+    )
+
+    response = await client.post(
+        "/api/news/exists",
+        json={
+            "items": [
+                {"ticker": "AAPL", "headline": "apple beats estimates"},
+                {"ticker": "MSFT", "headline": "Apple beats estimates"},
+            ],
+        },
+        headers=HEADERS,
+    )
+
+    assert response.json() == {
+        "existing": [{"ticker": "AAPL", "headline": "apple beats estimates"}],
+        "count": 1,
+    }
+
+
+@pytest.mark.anyio
+async def test_existing_pairs_with_same_hash(
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    """Checks that all requested pairs with the same hash are found."""
+    await client.post(
+        "/api/news/",
+        json=news("AAPL", "Foo bar"),
+        headers=HEADERS,
+    )
+
+    existing = await NewsDAO(dbsession).get_existing_news(
+        [
+            NewsLookupItemDTO(ticker="AAPL", headline="Foo bar"),
+            NewsLookupItemDTO(ticker="aapl", headline="foo  bar"),
+            NewsLookupItemDTO(ticker="AAPL", headline="Foo bar"),
+        ],
+    )
+
+    assert existing == [("AAPL", "Foo bar"), ("aapl", "foo  bar")]
@@ -0,0 +1,55 @@
+import pytest
+
+from quantex.services.news_events import NewsEvents
+
+
+def payload(news_id: int, ticker: str = "AAPL") -> str:
+    """
+    Encode created news like the NOTIFY of NewsDAO.
+
+    :param news_id: id of the news.
+    :param ticker: ticker of the news.
+    :return: JSON payload.
+    """
+    return (
+        f'{{"id": {news_id}, "ticker": "{ticker}", "term": "short", '
+        '"result": "positive"}'
+    )
+
+
+@pytest.mark.anyio
+async def test_close() -> None:
+    """Checks that closed subscriptions end after their queued events."""
+    events = NewsEvents()
+    with events.subscribe("AAPL") as apple, events.subscribe() as everything:
+        events.publish(payload(1))
+        events.close()
+        events.publish(payload(2))
+
+        for subscription in (apple, everything):
+            assert (await subscription.get()).startswith(b"id: 1\n")
+            assert await subscription.get() is None
+            assert subscription.dropped
+
+
+@pytest.mark.anyio
+async def test_close_full() -> None:
+    """Checks that closed subscriptions without room are dropped."""
+    events = NewsEvents(max_queued=2)
+    with events.subscribe() as subscription:
+        events.publish(payload(1))
+        events.publish(payload(2))
+        events.close()
+
+        assert await subscription.get() is None
+
+
+@pytest.mark.anyio
+async def test_subscribe_closed() -> None:
+    """Checks that subscriptions made after closing end right away."""
+    events = NewsEvents()
+    events.close()
+    with events.subscribe() as subscription:
+        events.publish(payload(1))
+
+        assert await subscription.get() is None
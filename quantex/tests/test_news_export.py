@@ -0,0 +1,132 @@
+import typing
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
+
+from quantex.database.dao.news_dao import NewsDAO
+from quantex.database.dependencies import get_db_replica_session
+from quantex.database.models.news_model import NewsDedupModel, NewsModel
+from quantex.database.replicas import ReplicaRouter
+from quantex.settings import settings
+from quantex.tests.utils import HEADERS, news
+from quantex.web.api.news.schema import NewsModelCreateDTO
+
+TICKER = "EXPORT"
+
+
+@pytest.fixture
+async def readonly_sessions(
+    _engine: AsyncEngine,
+) -> typing.AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """
+    Create read-only sessions like the app does, with committed news.
+
+    Streamed reads need data outside of the rolled back test transaction,
+    so news are created and deleted by the fixture.
+
+    :param _engine: engine of the test database.
+    :yield: factory of sessions in autocommit mode.
+    """
+    async with async_sessionmaker(_engine)() as session:
+        await NewsDAO(session).create_many_news(
+            [
+                NewsModelCreateDTO(**news(TICKER, f"Headline {index}"))
+                for index in range(5)
+            ],
+        )
+        await session.commit()
+
+    try:
+        yield async_sessionmaker(
+            _engine.execution_options(isolation_level="AUTOCOMMIT"),
+            expire_on_commit=False,
+        )
+    finally:
+        async with _engine.begin() as conn:
+            hashes = await conn.scalars(
+                delete(NewsModel)
+                .where(NewsModel.ticker == TICKER)
+                .returning(NewsModel.content_hash),
+            )
+            await conn.execute(
+                delete(NewsDedupModel).where(
+                    NewsDedupModel.content_hash.in_(hashes.all()),
+                ),
+            )
+
+
+@pytest.mark.anyio
+async def test_stream_autocommit(
+    readonly_sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    """Checks that news are streamed from sessions without transactions."""
+    async with readonly_sessions() as session:
+        batches = [
+            batch
+            async for batch in NewsDAO(session).stream_many_news(
+                ticker=TICKER,
+                batch_size=2,
+            )
+        ]
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [row["headline"] for batch in batches for row in batch] == [
+        f"Headline {index}" for index in reversed(range(5))
+    ]
+
+
+@pytest.mark.anyio
+async def test_export_autocommit(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    readonly_sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    """Checks that news are exported from sessions without transactions."""
+
+    async def get_session() -> typing.AsyncGenerator[AsyncSession, None]:
+        async with readonly_sessions() as session:
+            yield session
+
+    fastapi_app.dependency_overrides[get_db_replica_session] = get_session
+
+    response = await client.get(
+        "/api/news/export",
+        params={"ticker": TICKER},
+        headers=HEADERS,
+    )
+
+    assert response.status_code == 200
+    assert [
+        orjson.loads(line)["headline"]
+        for line in response.content.splitlines()
+    ] == [f"Headline {index}" for index in reversed(range(5))]
+
+
+@pytest.mark.anyio
+async def test_export_replica(
+    readonly_sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    """Checks that news are streamed from sessions on read replicas."""
+    replicas = ReplicaRouter(readonly_sessions, [str(settings.db_url)], 0)
+    try:
+        await replicas.check_lag(timeout=5)
+        async with replicas.session() as session:
+            assert session.bind.pool is replicas.replicas[0].engine.pool
+            batches = [
+                batch
+                async for batch in NewsDAO(session).stream_many_news(
+                    ticker=TICKER,
+                )
+            ]
+    finally:
+        await replicas.dispose()
+
+    assert len(batches[0]) == 5
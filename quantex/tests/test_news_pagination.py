@@ -0,0 +1,95 @@
+import base64
+import datetime
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from quantex.settings import settings
+from quantex.tests.utils import HEADERS, news
+from quantex.web.api.news.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    """Checks that decoding a cursor gives back its position."""
+    created_at = datetime.datetime(2026, 10, 18, 9, 30, 15, 123456)
+
+    cursor = encode_cursor(created_at, 42)
+
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "garbage!",
+        "é",
+        base64.urlsafe_b64encode(b"2026-10-18T09:30:15").decode(),
+        base64.urlsafe_b64encode(b"2026-10-18T09:30:15,abc").decode(),
+        base64.urlsafe_b64encode(b"yesterday,1").decode(),
+        base64.urlsafe_b64encode(b"\xff\xfe,1").decode(),
+    ],
+)
+def test_decode_bad_cursor(cursor: str) -> None:
+    """Checks that malformed cursors are rejected."""
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_pages(client: AsyncClient) -> None:
+    """Checks that following cursors returns every news once, newest first."""
+    await client.post(
+        "/api/news/batch",
+        json=[news("AAPL", f"Headline {index}") for index in range(7)]
+        + [news("MSFT", "Headline")],
+        headers=HEADERS,
+    )
+
+    pages = []
+    params = {"ticker": "AAPL", "limit": 3}
+    while True:
+        response = await client.get(
+            "/api/news/",
+            params=params,
+            headers=HEADERS,
+        )
+        body = response.json()
+        pages.append(body["news"])
+        if body["next_cursor"] is None:
+            break
+        params["cursor"] = body["next_cursor"]
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    positions = [
+        (item["created_at"], item["id"]) for page in pages for item in page
+    ]
+    assert positions == sorted(set(positions), reverse=True)
+
+
+@pytest.mark.anyio
+async def test_bad_cursor(client: AsyncClient) -> None:
+    """Checks that malformed cursors are a bad request."""
+    response = await client.get(
+        "/api/news/",
+        params={"cursor": "garbage!"},
+        headers=HEADERS,
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("limit", [0, settings.news_max_page_size + 1])
+async def test_page_size_limits(client: AsyncClient, limit: int) -> None:
+    """Checks that page sizes out of bounds are rejected."""
+    response = await client.get(
+        "/api/news/",
+        params={"limit": limit},
+        headers=HEADERS,
+    )
+
+    assert response.status_code == 422
@@ -0,0 +1,112 @@
+import datetime
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from quantex.database.dao.news_dao import NewsDAO
+from quantex.database.models.news_model import NewsDedupModel, NewsModel
+from quantex.web.api.news.schema import NewsModelCreateDTO
+
+
+async def create_news(
+    dbsession: AsyncSession,
+    created_at: datetime.datetime,
+    headline: str,
+) -> None:
+    """
+    Create news at a given time.
+
+    :param dbsession: session to the database.
+    :param created_at: creation time of the news.
+    :param headline: headline of the news.
+    """
+    news = NewsModelCreateDTO(
+        term="short",
+        ticker="AAPL",
+        headline=headline,
+        explanation="- Explanation.",
+        result="positive",
+    )
+    await dbsession.execute(
+        NewsModel.__table__.insert().values(
+            **news.model_dump(),
+            created_at=created_at,
+        ),
+    )
+
+
+async def partitions(dbsession: AsyncSession) -> dict:
+    """
+    Get partitions of news by headline.
+
+    :param dbsession: session to the database.
+    :return: partition of every news.
+    """
+    r = await dbsession.execute(
+        text("SELECT headline, tableoid::regclass::text FROM news"),
+    )
+    return dict(r.all())
+
+
+@pytest.mark.anyio
+async def test_create_partitions_moves_default_news(
+    dbsession: AsyncSession,
+) -> None:
+    """Checks that news in the default partition move to new partitions."""
+    await create_news(dbsession, datetime.datetime(2020, 1, 15), "January")
+    await create_news(dbsession, datetime.datetime(2020, 3, 15), "March")
+    assert set((await partitions(dbsession)).values()) == {"news_default"}
+
+    await dbsession.execute(
+        text("SELECT news_create_partitions('2019-12-01', '2020-03-01')"),
+    )
+
+    assert await partitions(dbsession) == {
+        "January": "news_2020_01",
+        "March": "news_default",
+    }
+    r = await dbsession.execute(
+        text(
+            "SELECT to_regclass('news_2019_12'), to_regclass('news_2020_02')",
+        ),
+    )
+    assert None not in r.one()
+
+    # Moved news are still found, and deduplicated
+    news = await NewsDAO(dbsession).get_many_news(
+        since=datetime.datetime(2020, 1, 1),
+        until=datetime.datetime(2020, 2, 1),
+    )
+    assert [item["headline"] for item in news] == ["January"]
+    await create_news(dbsession, datetime.datetime(2020, 1, 16), "January")
+    assert len(await partitions(dbsession)) == 2
+
+
+@pytest.mark.anyio
+async def test_drop_partitions(dbsession: AsyncSession) -> None:
+    """Checks that old partitions are dropped with their content hashes."""
+    await dbsession.execute(
+        text("SELECT news_create_partitions('2020-01-01', '2020-03-01')"),
+    )
+    await create_news(dbsession, datetime.datetime(2019, 12, 31), "Default")
+    await create_news(dbsession, datetime.datetime(2020, 1, 31), "January")
+    await create_news(dbsession, datetime.datetime(2020, 2, 1), "February")
+
+    await dbsession.execute(
+        text("SELECT news_drop_partitions('2020-02-15')"),
+    )
+
+    assert await partitions(dbsession) == {"February": "news_2020_02"}
+    r = await dbsession.execute(text("SELECT to_regclass('news_2020_01')"))
+    assert r.scalar() is None
+    assert (
+        await dbsession.scalar(
+            select(func.count()).select_from(NewsDedupModel),
+        )
+        == 1
+    )
+
+    # Dropped news can be created again
+    await create_news(dbsession, datetime.datetime(2020, 2, 2), "January")
+    assert len(await partitions(dbsession)) == 2
@@ -0,0 +1,73 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from quantex.database.dao.news_dao import NewsDAO
+from quantex.tests.utils import HEADERS, news
+from quantex.web.api.news.schema import NewsModelCreateDTO
+
+HEADLINES = (
+    ("AAPL", "Apple shares slip ahead of quarterly earnings season"),
+    ("AAPL", "Apple earnings beat estimates"),
+    ("AAPL", "Apple unveils new headphones"),
+    ("MSFT", "Microsoft earnings beat estimates"),
+)
+
+
+@pytest.fixture
+async def dao(dbsession: AsyncSession) -> NewsDAO:
+    """
+    Create news to search for.
+
+    :param dbsession: session to the database.
+    :return: DAO of the news.
+    """
+    news_dao = NewsDAO(dbsession)
+    await news_dao.create_many_news(
+        [
+            NewsModelCreateDTO(**news(ticker, headline))
+            for ticker, headline in HEADLINES
+        ],
+    )
+    return news_dao
+
+
+@pytest.mark.anyio
+async def test_search(dao: NewsDAO) -> None:
+    """Checks that stemmed words match, with close words ranked first."""
+    found = await dao.search_news("apple earning")
+
+    assert [row["headline"] for row in found] == [
+        "Apple earnings beat estimates",
+        "Apple shares slip ahead of quarterly earnings season",
+    ]
+    assert found[0]["rank"] > found[1]["rank"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("phrase", ["earni", "earnigs"])
+async def test_search_fuzzy(dao: NewsDAO, phrase: str) -> None:
+    """Checks that prefixes and typos match with fuzzy search only."""
+    assert not await dao.search_news(phrase)
+
+    found = await dao.search_news(phrase, fuzzy=True)
+
+    assert {row["headline"] for row in found} == {
+        headline for _, headline in HEADLINES if "earnings" in headline
+    }
+
+
+@pytest.mark.anyio
+async def test_search_api(dao: NewsDAO, client: AsyncClient) -> None:
+    """Checks that searches are filtered by ticker."""
+    response = await client.get(
+        "/api/news/search",
+        params={"q": "earnings beat", "ticker": "MSFT"},
+        headers=HEADERS,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 1
+    assert body["news"][0]["headline"] == "Microsoft earnings beat estimates"
+    assert body["news"][0]["ticker"] == "MSFT"
@@ -0,0 +1,120 @@
+import logging
+import typing
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from quantex.database import replicas
+from quantex.database.replicas import LAG_SQL, ReplicaRouter
+from quantex.settings import settings
+
+
+async def fake_standby(
+    dbsession: AsyncSession,
+    receiving: bool,
+    receive_lsn: str = "0/3000000",
+    replay_lsn: str = "0/3000000",
+    replayed: typing.Optional[str] = None,
+) -> None:
+    """
+    Make the test database look like a standby to the current transaction.
+
+    Schemas before pg_catalog in the search path shadow its functions and
+    views, so recovery functions and the WAL receiver are replaced.
+
+    :param dbsession: session to the database.
+    :param receiving: whether a WAL receiver is running.
+    :param receive_lsn: last received WAL location.
+    :param replay_lsn: last replayed WAL location.
+    :param replayed: how long ago the last transaction was replayed.
+    """
+    replayed_at = "NULL"
+    if replayed is not None:
+        replayed_at = f"(now() - interval '{replayed}')"
+    statements = (
+        "CREATE SCHEMA standby",
+        "CREATE FUNCTION standby.pg_is_in_recovery() RETURNS bool "
+        "AS 'SELECT true' LANGUAGE sql",
+        "CREATE FUNCTION standby.pg_last_wal_receive_lsn() RETURNS pg_lsn "
+        f"AS $$SELECT '{receive_lsn}'::pg_lsn$$ LANGUAGE sql",
+        "CREATE FUNCTION standby.pg_last_wal_replay_lsn() RETURNS pg_lsn "
+        f"AS $$SELECT '{replay_lsn}'::pg_lsn$$ LANGUAGE sql",
+        "CREATE FUNCTION standby.pg_last_xact_replay_timestamp() "
+        "RETURNS timestamptz "
+        f"AS $$SELECT {replayed_at}::timestamptz$$ LANGUAGE sql",
+        "CREATE VIEW standby.pg_stat_wal_receiver AS SELECT 1 AS pid "
+        f"WHERE {receiving}",
+        "SET LOCAL search_path TO standby, pg_catalog",
+    )
+    for statement in statements:
+        await dbsession.execute(text(statement))
+
+
+@pytest.mark.anyio
+async def test_lag_primary(dbsession: AsyncSession) -> None:
+    """Checks that primaries don't lag."""
+    assert await dbsession.scalar(text(LAG_SQL)) == 0
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("standby", "lag"),
+    [
+        ({"receiving": True}, 0),
+        ({"receiving": False}, None),
+        # The receiver disconnected before receiving all WAL
+        ({"receiving": False, "replayed": "1 hour"}, None),
+        (
+            {
+                "receiving": True,
+                "receive_lsn": "0/4000000",
+                "replayed": "30 seconds",
+            },
+            30,
+        ),
+        # Nothing replayed since the standby started
+        ({"receiving": True, "receive_lsn": "0/4000000"}, None),
+    ],
+)
+async def test_lag_standby(
+    dbsession: AsyncSession,
+    standby: typing.Dict[str, typing.Any],
+    lag: typing.Optional[float],
+) -> None:
+    """Checks that standbys without a WAL receiver have an unknown lag."""
+    await fake_standby(dbsession, **standby)
+
+    measured = await dbsession.scalar(text(LAG_SQL))
+
+    if lag is None:
+        assert measured is None
+    else:
+        assert float(measured) == pytest.approx(lag, abs=1)
+
+
+@pytest.mark.anyio
+async def test_not_streaming(
+    _engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Checks that replicas with an unknown lag aren't used."""
+    monkeypatch.setattr(replicas, "LAG_SQL", "SELECT NULL")
+    sessions = []
+
+    def primary() -> AsyncSession:
+        sessions.append(AsyncSession(_engine))
+        return sessions[-1]
+
+    router = ReplicaRouter(primary, [str(settings.db_url)], 10)
+    try:
+        with caplog.at_level(logging.WARNING):
+            await router.check_lag(timeout=5)
+        assert router.replicas[0].lag is None
+        assert not router.usable()
+        assert router.session() is sessions[0]
+    finally:
+        await router.dispose()
+
+    assert "isn't streaming from the primary" in caplog.text
@@ -0,0 +1,195 @@
+import types
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from quantex.services import response_cache
+from quantex.services.response_cache import ResponseCache
+from quantex.settings import settings
+from quantex.tests.utils import HEADERS, news
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> types.SimpleNamespace:
+    """
+    Replace the monotonic clock of response caches with a settable one.
+
+    :param monkeypatch: pytest monkeypatch.
+    :return: the clock, set its `now` to move time.
+    """
+    clock = types.SimpleNamespace(now=0.0)
+    monkeypatch.setattr(
+        response_cache,
+        "time",
+        types.SimpleNamespace(monotonic=lambda: clock.now),
+    )
+    return clock
+
+
+def test_key() -> None:
+    """Checks that keys don't depend on order or empty filters."""
+    assert ResponseCache.key(ticker="AAPL", term=None, limit=10) == (
+        ResponseCache.key(limit=10, ticker="AAPL", cursor="")
+    )
+    assert ResponseCache.key(ticker="AAPL") != ResponseCache.key(
+        ticker="MSFT",
+    )
+
+
+def test_ttl(clock: types.SimpleNamespace) -> None:
+    """Checks that responses expire after the TTL."""
+    cache = ResponseCache(ttl=30)
+    key = cache.key(ticker="AAPL")
+    entry = cache.set(key, b"body", ticker="AAPL")
+
+    clock.now = 29.9
+    assert cache.get(key) == entry
+
+    clock.now = 30
+    assert cache.get(key) is None
+
+
+def test_etag() -> None:
+    """Checks that ETags change with the body only."""
+    cache = ResponseCache()
+
+    first = cache.set(cache.key(ticker="AAPL"), b"body")
+    same = cache.set(cache.key(ticker="MSFT"), b"body")
+    other = cache.set(cache.key(ticker="AAPL"), b"other body")
+
+    assert first.etag == same.etag
+    assert first.etag != other.etag
+
+
+def test_lru() -> None:
+    """Checks that the least recently used responses are evicted."""
+    cache = ResponseCache(max_entries=2)
+    first, second, third = (
+        cache.key(ticker=ticker) for ticker in ("AAPL", "MSFT", "GOOG")
+    )
+    cache.set(first, b"first")
+    cache.set(second, b"second")
+    cache.get(first)
+
+    cache.set(third, b"third")
+
+    assert cache.get(second) is None
+    assert cache.get(first) is not None
+    assert cache.get(third) is not None
+
+
+def test_invalidate() -> None:
+    """Checks that responses of other tickers survive invalidation."""
+    cache = ResponseCache()
+    apple = cache.key(ticker="AAPL")
+    microsoft = cache.key(ticker="MSFT")
+    everything = cache.key(limit=100)
+    cache.set(apple, b"apple", ticker="AAPL")
+    cache.set(microsoft, b"microsoft", ticker="MSFT")
+    cache.set(everything, b"everything")
+
+    cache.invalidate([])
+    assert cache.get(everything) is not None
+
+    cache.invalidate(["AAPL"])
+
+    assert cache.get(apple) is None
+    assert cache.get(everything) is None
+    assert cache.get(microsoft) is not None
+
+
+def test_stale_for(clock: types.SimpleNamespace) -> None:
+    """Checks that reads lagging behind an invalidation aren't cached."""
+    cache = ResponseCache(stale_for=10)
+    apple = cache.key(ticker="AAPL")
+    microsoft = cache.key(ticker="MSFT")
+    everything = cache.key(limit=100)
+    clock.now = 100
+    cache.invalidate(["AAPL"])
+
+    clock.now = 105
+    assert cache.set(apple, b"apple", ticker="AAPL").body == b"apple"
+    cache.set(everything, b"everything")
+    cache.set(microsoft, b"microsoft", ticker="MSFT")
+    assert cache.get(apple) is None
+    assert cache.get(everything) is None
+    assert cache.get(microsoft) is not None
+
+    # Read before the replicas could have caught up
+    clock.now = 112
+    cache.set(apple, b"apple", ticker="AAPL", read_at=109)
+    assert cache.get(apple) is None
+
+    cache.set(apple, b"apple", ticker="AAPL", read_at=111)
+    cache.set(everything, b"everything")
+    assert cache.get(apple) is not None
+    assert cache.get(everything) is not None
+
+
+@pytest.mark.anyio
+async def test_not_modified(client: AsyncClient) -> None:
+    """Checks that sending the ETag back gets 304 until news change."""
+    await client.post(
+        "/api/news/", json=news("AAPL", "First"), headers=HEADERS
+    )
+    params = {"ticker": "AAPL"}
+
+    response = await client.get("/api/news/", params=params, headers=HEADERS)
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    for if_none_match in (etag, f'W/{etag}, "other"', "*"):
+        response = await client.get(
+            "/api/news/",
+            params=params,
+            headers={**HEADERS, "If-None-Match": if_none_match},
+        )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert not response.content
+
+    await client.post(
+        "/api/news/",
+        json=news("AAPL", "Second"),
+        headers=HEADERS,
+    )
+    response = await client.get(
+        "/api/news/",
+        params=params,
+        headers={**HEADERS, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.anyio
+async def test_writes_invalidate(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+) -> None:
+    """Checks that writes only drop responses they could change."""
+    for ticker in ("AAPL", "MSFT"):
+        await client.get(
+            "/api/news/",
+            params={"ticker": ticker},
+            headers=HEADERS,
+        )
+    cache = fastapi_app.state.news_cache
+
+    await client.post(
+        "/api/news/batch",
+        json=[news("AAPL", "Headline")],
+        headers=HEADERS,
+    )
+
+    assert (
+        cache.get(cache.key(ticker="AAPL", limit=settings.news_page_size))
+        is None
+    )
+    assert (
+        cache.get(cache.key(ticker="MSFT", limit=settings.news_page_size))
+        is not None
+    )
@@ -0,0 +1,78 @@
+import datetime
+import typing
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from quantex.database.dao.news_dao import NewsDAO
+from quantex.database.models.news_model import NewsDedupModel, NewsModel
+from quantex.database.models.news_sentiment_model import (
+    NewsSentimentHourlyModel,
+)
+from quantex.services.rollups import backfill
+from quantex.tests.utils import news
+from quantex.web.api.news.schema import NewsModelCreateDTO
+
+TICKER = "BACKFILL"
+
+
+@pytest.fixture
+async def created_news(
+    _engine: AsyncEngine,
+) -> typing.AsyncGenerator[None, None]:
+    """
+    Create committed news, backfilling reads them in its own sessions.
+
+    :param _engine: engine of the test database.
+    :yield: nothing, news are deleted with their rollups afterwards.
+    """
+    async with async_sessionmaker(_engine)() as session:
+        await NewsDAO(session).create_many_news(
+            [
+                NewsModelCreateDTO(**news(TICKER, "First")),
+                NewsModelCreateDTO(**news(TICKER, "Second", term="long")),
+            ],
+        )
+        await session.commit()
+
+    try:
+        yield
+    finally:
+        async with _engine.begin() as conn:
+            hashes = await conn.scalars(
+                delete(NewsModel)
+                .where(NewsModel.ticker == TICKER)
+                .returning(NewsModel.content_hash),
+            )
+            await conn.execute(
+                delete(NewsDedupModel).where(
+                    NewsDedupModel.content_hash.in_(hashes.all()),
+                ),
+            )
+            await conn.execute(
+                delete(NewsSentimentHourlyModel).where(
+                    NewsSentimentHourlyModel.ticker == TICKER,
+                ),
+            )
+
+
+@pytest.mark.anyio
+async def test_backfill(_engine: AsyncEngine, created_news: None) -> None:
+    """Checks that lost rollups are recounted window by window."""
+    rollup = NewsSentimentHourlyModel
+    query = select(rollup.bucket, rollup.term, rollup.result, rollup.count)
+    query = query.where(rollup.ticker == TICKER).order_by(
+        rollup.bucket,
+        rollup.term,
+    )
+    async with _engine.begin() as conn:
+        counted = (await conn.execute(query)).all()
+        await conn.execute(delete(rollup).where(rollup.ticker == TICKER))
+
+    since = datetime.datetime.utcnow() - datetime.timedelta(hours=3)
+    written = await backfill(since, window=datetime.timedelta(minutes=30))
+
+    async with _engine.connect() as conn:
+        assert (await conn.execute(query)).all() == counted
+    assert written >= len(counted)
@@ -0,0 +1,29 @@
+import typing
+
+from quantex.settings import settings
+
+HEADERS = {"X-Secret": settings.secret_key}
+
+
+def news(
+    ticker: str,
+    headline: str,
+    term: str = "short",
+    result: str = "positive",
+) -> typing.Dict[str, str]:
+    """
+    Build news to create through the API.
+
+    :param ticker: ticker of the news.
+    :param headline: headline of the news.
+    :param term: term of the analysis.
+    :param result: result of the analysis.
+    :return: news as sent to POST /api/news.
+    """
+    return {
+        "term": term,
+        "ticker": ticker,
+        "headline": headline,
+        "explanation": "- Explanation.",
+        "result": result,
+    }
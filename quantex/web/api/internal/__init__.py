@@ -0,0 +1,3 @@
+from quantex.web.api.internal.views import router
+
+__all__ = ["router"]
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.param_functions import Depends
+from starlette.requests import Request
+
+from quantex.database.pool import pool_stats
+from quantex.web.dependencies import verify_secret
+
+router = APIRouter()
+
+
+@router.get("/pool", dependencies=[Depends(verify_secret)])
+async def get_pool(request: Request):
+    """
+    Get statistics of the database connection pool.
+
+    Every worker has its own pool, so these only cover the worker that
+    handles the request. Wait times are in seconds.
+    """
+    return pool_stats(request.app.state.db_engine)
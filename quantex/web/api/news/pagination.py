@@ -0,0 +1,38 @@
+import base64
+import binascii
+import datetime
+import typing
+
+from fastapi import HTTPException
+from starlette import status
+
+
+def encode_cursor(created_at: datetime.datetime, news_id: int) -> str:
+    """
+    Encode position of news as an opaque pagination cursor.
+
+    :param created_at: creation time of the last news of a page.
+    :param news_id: id of the last news of a page.
+    :return: URL safe cursor.
+    """
+    raw = f"{created_at.isoformat()},{news_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> typing.Tuple[datetime.datetime, int]:
+    """
+    Decode a cursor created by `encode_cursor`.
+
+    :param cursor: cursor to decode.
+    :return: (created_at, id) of the news the cursor points to.
+    :raises HTTPException: if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, news_id = raw.split(",")
+        return datetime.datetime.fromisoformat(created_at), int(news_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
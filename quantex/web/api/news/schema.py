@@ -1,7 +1,7 @@
 import datetime
 import typing
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class NewsModelDTO(BaseModel):
@@ -30,3 +30,16 @@ class NewsModelCreateDTO(BaseModel):
     headline: str
     explanation: str
     result: typing.Literal["positive", "negative", "neutral"]
+
+
+class NewsLookupItemDTO(BaseModel):
+    """Single (ticker, headline) pair to look up."""
+
+    ticker: str
+    headline: str
+
+
+class NewsLookupDTO(BaseModel):
+    """Bulk lookup of (ticker, headline) pairs."""
+
+    items: typing.List[NewsLookupItemDTO] = Field(max_length=1000)
@@ -1,41 +1,330 @@
+import asyncio
+import datetime
+import time
 import typing
-from fastapi import APIRouter
+
+import orjson
+from fastapi import APIRouter, Body, HTTPException, Query
 from fastapi.param_functions import Depends
-from starlette.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
 from quantex.database.dao.news_dao import NewsDAO
 
-from quantex.web.api.news.schema import NewsModelCreateDTO
-from quantex.web.dependencies import verify_secret
+from quantex.services.metrics import stage
+from quantex.services.news_events import NewsEvents
+from quantex.services.response_cache import ResponseCache, cached_response
+from quantex.settings import settings
+from quantex.web.api.news.pagination import decode_cursor, encode_cursor
+from quantex.web.api.news.schema import NewsLookupDTO, NewsModelCreateDTO
+from quantex.web.dependencies import (
+    get_news_cache,
+    get_news_events,
+    verify_secret,
+)
 
 router = APIRouter()
 
 
+def _naive_utc(
+    moment: typing.Optional[datetime.datetime],
+) -> typing.Optional[datetime.datetime]:
+    """Convert time from a query to naive UTC, like stored creation times."""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
 @router.get("/", dependencies=[Depends(verify_secret)])
 async def get_news(
-    news_dao: NewsDAO = Depends(),
+    request: Request,
+    news_dao: NewsDAO = Depends(NewsDAO.replica),
+    cache: ResponseCache = Depends(get_news_cache),
     news_id: typing.Optional[int] = None,
     ticker: typing.Optional[str] = None,
     term: typing.Optional[str] = None,
     result: typing.Optional[str] = None,
     headline: typing.Optional[str] = None,
+    since: typing.Optional[datetime.datetime] = None,
+    until: typing.Optional[datetime.datetime] = None,
+    limit: int = Query(
+        default=settings.news_page_size,
+        ge=1,
+        le=settings.news_max_page_size,
+    ),
+    cursor: typing.Optional[str] = None,
 ):
-    """Get news by id and optional ticker, term or result."""
+    """
+    Get news by id, or a page of news by optional ticker, term, result or time.
+
+    Pass `next_cursor` of a response as `cursor` to get the next page.
+    Responses are cached for a while and carry an ETag, send it back in
+    If-None-Match to get 304 when nothing changed.
+    """
+    since, until = _naive_utc(since), _naive_utc(until)
+    key = cache.key(
+        news_id=news_id,
+        ticker=ticker,
+        term=term,
+        result=result,
+        headline=headline,
+        since=since,
+        until=until,
+        limit=limit,
+        cursor=cursor,
+    )
+    if entry := cache.get(key):
+        return cached_response(request, entry)
+
+    read_at = time.monotonic()
+    next_cursor = None
 
     if news_id:
         news = await news_dao.get_news(int(news_id))
+        # News don't change once created, only news of its ticker are added
+        ticker = news[0]["ticker"]
     else:
-        news = await news_dao.get_many_news(ticker, term, headline, result)
+        # One extra row tells whether there is a next page
+        news = await news_dao.get_many_news(
+            ticker,
+            term,
+            headline,
+            result,
+            since,
+            until,
+            limit=limit + 1,
+            after=decode_cursor(cursor) if cursor else None,
+        )
+        if len(news) > limit:
+            news = news[:limit]
+            next_cursor = encode_cursor(
+                news[-1]["created_at"],
+                news[-1]["id"],
+            )
 
     res = {
-        "news": [row.model_dump_json() for row in news] if news else [],
-        "count": 0 if not news else len(news),
+        "news": news,
+        "count": len(news),
+        "next_cursor": next_cursor,
     }
 
-    return JSONResponse(res)
+    with stage("serialize"):
+        body = orjson.dumps(res)
+    entry = cache.set(key, body, ticker=ticker or None, read_at=read_at)
+    return cached_response(request, entry)
+
+
+@router.get("/export", dependencies=[Depends(verify_secret)])
+async def export_news(
+    news_dao: NewsDAO = Depends(NewsDAO.replica),
+    ticker: typing.Optional[str] = None,
+    term: typing.Optional[str] = None,
+    result: typing.Optional[str] = None,
+    headline: typing.Optional[str] = None,
+    since: typing.Optional[datetime.datetime] = None,
+    until: typing.Optional[datetime.datetime] = None,
+):
+    """
+    Export all news by optional ticker, term, result or time as NDJSON.
+
+    News are streamed as they are read from the database, one JSON object
+    per line, newest first.
+    """
+
+    async def lines() -> typing.AsyncIterator[bytes]:
+        async for news in news_dao.stream_many_news(
+            ticker,
+            term,
+            headline,
+            result,
+            _naive_utc(since),
+            _naive_utc(until),
+        ):
+            with stage("serialize"):
+                body = b"".join(
+                    orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+                    for row in news
+                )
+            yield body
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/subscribe", dependencies=[Depends(verify_secret)])
+async def subscribe_news(
+    events: NewsEvents = Depends(get_news_events),
+    ticker: typing.Optional[str] = None,
+    term: typing.Optional[str] = None,
+    result: typing.Optional[str] = None,
+):
+    """
+    Subscribe to created news by optional ticker, term or result.
+
+    News are sent as server-sent events, with the news id as event id.
+    Explanations too long to be sent are null, get them by id. Subscribers
+    that fall behind are disconnected, they should catch up with GET
+    /api/news before subscribing again.
+    """
+
+    async def stream() -> typing.AsyncIterator[bytes]:
+        with events.subscribe(ticker, term, result) as subscription:
+            # Sent right away, so the client knows it's subscribed
+            yield b": subscribed\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(),
+                        settings.news_events_keepalive,
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield event
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/search", dependencies=[Depends(verify_secret)])
+async def search_news(
+    q: str = Query(min_length=1, max_length=256),
+    news_dao: NewsDAO = Depends(NewsDAO.replica),
+    ticker: typing.Optional[str] = None,
+    since: typing.Optional[datetime.datetime] = None,
+    until: typing.Optional[datetime.datetime] = None,
+    fuzzy: bool = False,
+    limit: int = Query(
+        default=settings.news_page_size,
+        ge=1,
+        le=settings.news_max_page_size,
+    ),
+    offset: int = Query(default=0, ge=0),
+):
+    """
+    Search news by headline, best matches first.
+
+    By default `q` is a full-text query, supporting "quoted phrases", OR and
+    -negation. With `fuzzy` headlines with similar words match too.
+    Unless `since` is given, only recent news are searched.
+    """
+    if offset + limit > settings.news_search_max_results:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "Only the first "
+                f"{settings.news_search_max_results} results can be paged"
+            ),
+        )
+
+    since, until = _naive_utc(since), _naive_utc(until)
+    if since is None:
+        since = (until or datetime.datetime.utcnow()) - datetime.timedelta(
+            days=settings.news_search_days,
+        )
+
+    news = await news_dao.search_news(
+        q,
+        ticker,
+        since,
+        until,
+        fuzzy,
+        limit,
+        offset,
+    )
+
+    with stage("serialize"):
+        return ORJSONResponse({"news": news, "count": len(news)})
+
+
+@router.get("/sentiment", dependencies=[Depends(verify_secret)])
+async def get_sentiment(
+    ticker: str,
+    news_dao: NewsDAO = Depends(NewsDAO.replica),
+    since: typing.Optional[datetime.datetime] = None,
+    until: typing.Optional[datetime.datetime] = None,
+    term: typing.Optional[str] = None,
+    result: typing.Optional[str] = None,
+    bucket: typing.Literal["hour", "day"] = "hour",
+):
+    """
+    Get number of news of a ticker per hour or day, term and result.
+
+    Defaults to the last 7 days.
+    """
+    until = _naive_utc(until) or datetime.datetime.utcnow()
+    since = _naive_utc(since) or until - datetime.timedelta(days=7)
+
+    counts = await news_dao.get_sentiment(
+        ticker,
+        since,
+        until,
+        term,
+        result,
+        bucket,
+    )
+
+    with stage("serialize"):
+        return ORJSONResponse({"sentiment": counts, "count": len(counts)})
 
 
 @router.post("/", dependencies=[Depends(verify_secret)])
-async def create_news(news: NewsModelCreateDTO, news_dao: NewsDAO = Depends()):
-    """Create news."""
-    await news_dao.create_news(news)
-    return JSONResponse({"status": "ok"})
+async def create_news(
+    news: NewsModelCreateDTO,
+    news_dao: NewsDAO = Depends(),
+    cache: ResponseCache = Depends(get_news_cache),
+):
+    """Create news, reporting whether it wasn't stored already."""
+    created = await news_dao.create_news(news)
+    if created:
+        cache.invalidate([news.ticker])
+    return JSONResponse({"status": "ok", "created": created})
+
+
+@router.post("/exists", dependencies=[Depends(verify_secret)])
+async def get_existing_news(
+    lookup: NewsLookupDTO,
+    news_dao: NewsDAO = Depends(NewsDAO.readonly),
+):
+    """Get which of the given (ticker, headline) pairs are already stored."""
+    existing = await news_dao.get_existing_news(lookup.items)
+
+    res = {
+        "existing": [
+            {"ticker": ticker, "headline": headline}
+            for ticker, headline in existing
+        ],
+        "count": len(existing),
+    }
+
+    return JSONResponse(res)
+
+
+@router.post("/batch", dependencies=[Depends(verify_secret)])
+async def create_many_news(
+    news: typing.List[NewsModelCreateDTO] = Body(max_length=1000),
+    news_dao: NewsDAO = Depends(),
+    cache: ResponseCache = Depends(get_news_cache),
+):
+    """Create many news at once, reporting status of every item."""
+    statuses = await news_dao.create_many_news(news)
+    cache.invalidate(
+        item.ticker
+        for item, (news_status, _) in zip(news, statuses)
+        if news_status == "created"
+    )
+
+    res = {
+        "results": [
+            {"status": news_status, "id": news_id}
+            for news_status, news_id in statuses
+        ],
+        "count": sum(news_status == "created" for news_status, _ in statuses),
+    }
+
+    return JSONResponse(res)
@@ -1,6 +1,11 @@
 from fastapi.routing import APIRouter
 
-from quantex.web.api import news
+from quantex.web.api import internal, news
 
 api_router = APIRouter()
 api_router.include_router(news.router, prefix="/news", tags=["news"])
+api_router.include_router(
+    internal.router,
+    prefix="/internal",
+    tags=["internal"],
+)
@@ -1,15 +1,17 @@
 from importlib import metadata
 
 from fastapi import FastAPI
-from fastapi.responses import UJSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from quantex.services.metrics import Metrics
 from quantex.web.api.router import api_router
 from quantex.web.lifetime import (
     register_shutdown_event,
     register_startup_event,
 )
-from quantex.web.middlewares import ProcessTimeHeader, SecurityHeaders
+from quantex.web.metrics import router as metrics_router
+from quantex.web.middlewares import Instrumentation, SecurityHeaders
 
 
 def get_app() -> FastAPI:
@@ -26,14 +28,15 @@ def get_app() -> FastAPI:
         docs_url="/api/docs",
         redoc_url="/api/redoc",
         openapi_url="/api/openapi.json",
-        default_response_class=UJSONResponse,
+        default_response_class=ORJSONResponse,
     )
 
     # Adds startup and shutdown events.
     register_startup_event(app)
     register_shutdown_event(app)
 
-    app.add_middleware(ProcessTimeHeader)
+    app.state.metrics = Metrics()
+    app.add_middleware(Instrumentation, metrics=app.state.metrics)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -45,5 +48,6 @@ def get_app() -> FastAPI:
 
     # Main router for the API.
     app.include_router(router=api_router, prefix="/api")
+    app.include_router(router=metrics_router)
 
     return app
@@ -1,10 +1,38 @@
 from typing import Annotated
 
 from fastapi import Header, HTTPException
+from starlette.requests import Request
 
+from quantex.services.metrics import stage
+from quantex.services.news_events import NewsEvents
+from quantex.services.response_cache import ResponseCache
 from quantex.settings import settings
 
 
 async def verify_secret(x_secret: Annotated[str, Header()]):
-    if x_secret != settings.secret_key:
-        raise HTTPException(status_code=403, detail="Secret header invalid")
+    with stage("auth"):
+        if x_secret != settings.secret_key:
+            raise HTTPException(
+                status_code=403,
+                detail="Secret header invalid",
+            )
+
+
+def get_news_cache(request: Request) -> ResponseCache:
+    """
+    Get cache of news responses of this worker.
+
+    :param request: current request.
+    :return: response cache.
+    """
+    return request.app.state.news_cache
+
+
+def get_news_events(request: Request) -> NewsEvents:
+    """
+    Get subscribers of created news of this worker.
+
+    :param request: current request.
+    :return: news events.
+    """
+    return request.app.state.news_events
@@ -1,13 +1,22 @@
+import asyncio
+import logging
+import signal
+import threading
 from asyncio import current_task
 from typing import Awaitable, Callable
 
 from fastapi import FastAPI
-from sqlalchemy.ext.asyncio import (
-    async_scoped_session,
-    async_sessionmaker,
-    create_async_engine,
-)
+from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker
 
+from quantex.database.pool import create_engine, warm_up
+from quantex.database.replicas import ReplicaRouter
+from quantex.database.utils import (
+    create_news_partitions,
+    drop_news_partitions,
+)
+from quantex.services.metrics import time_queries
+from quantex.services.news_events import NewsEvents
+from quantex.services.response_cache import ResponseCache
 from quantex.settings import settings
 
 
@@ -21,7 +30,8 @@ def _setup_db(app: FastAPI) -> None:
 
     :param app: fastAPI application.
     """
-    engine = create_async_engine(str(settings.db_url), echo=settings.db_echo)
+    engine = create_engine()
+    time_queries(engine)
     session_factory = async_scoped_session(
         async_sessionmaker(
             engine,
@@ -31,6 +41,130 @@ def _setup_db(app: FastAPI) -> None:
     )
     app.state.db_engine = engine
     app.state.db_session_factory = session_factory
+    app.state.db_readonly_session_factory = async_sessionmaker(
+        engine.execution_options(isolation_level="AUTOCOMMIT"),
+        expire_on_commit=False,
+    )
+
+
+def _setup_replicas(app: FastAPI) -> None:
+    """
+    Creates engines of the read replicas.
+
+    Read-only sessions go to the primary database until the replicas are
+    checked, or when there are none.
+
+    :param app: fastAPI application.
+    """
+    replicas = ReplicaRouter(
+        app.state.db_readonly_session_factory,
+        settings.db_replica_urls,
+        settings.db_replica_max_lag,
+    )
+    for replica in replicas.replicas:
+        time_queries(replica.engine)
+    app.state.db_replicas = replicas
+
+
+def _setup_cache(app: FastAPI) -> None:
+    """
+    Creates cache of news responses for this worker.
+
+    News are read from replicas, if there are any, so responses may lag
+    behind as much as the replicas.
+
+    :param app: fastAPI application.
+    """
+    stale_for = settings.db_replica_max_lag if settings.db_replica_urls else 0
+    app.state.news_cache = ResponseCache(
+        max_entries=settings.news_cache_size,
+        ttl=settings.news_cache_ttl,
+        stale_for=stale_for,
+    )
+
+
+def _setup_news_events(app: FastAPI) -> None:
+    """
+    Starts receiving created news for subscribers of this worker.
+
+    :param app: fastAPI application.
+    """
+    app.state.news_events = NewsEvents(
+        max_queued=settings.news_events_queue_size,
+    )
+    app.state.news_events_task = asyncio.create_task(
+        app.state.news_events.listen(
+            str(settings.db_url.with_scheme("postgresql")),
+        ),
+    )
+
+
+def _close_news_events_on_exit(app: FastAPI) -> None:
+    """
+    Ends news subscriptions as soon as the server is asked to exit.
+
+    Servers wait for open responses to finish before running shutdown
+    events, and subscriptions don't finish on their own, so they are ended
+    on the exit signals already. Previous handlers of the signals still run.
+
+    :param app: fastAPI application.
+    """
+    app.state.exit_handlers = {}
+    # Signal handlers can only be set from the main thread
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(signum)
+        # Without a Python handler the process exits right away anyway
+        if not callable(previous):
+            continue
+
+        def handle_exit(received, frame, previous=previous):
+            loop.call_soon_threadsafe(app.state.news_events.close)
+            previous(received, frame)
+
+        app.state.exit_handlers[signum] = previous
+        signal.signal(signum, handle_exit)
+
+
+async def _create_partitions(app: FastAPI) -> None:
+    """
+    Keeps news partitions created ahead of time while the app runs.
+
+    Partitions older than the retention period are dropped, if it's set.
+
+    :param app: fastAPI application.
+    """
+    while True:
+        try:
+            await create_news_partitions(app.state.db_engine)
+        except Exception:
+            logging.getLogger(__name__).exception(
+                "Creating news partitions failed",
+            )
+        if settings.news_retention_months:
+            try:
+                await drop_news_partitions(app.state.db_engine)
+            except Exception:
+                logging.getLogger(__name__).exception(
+                    "Dropping news partitions failed",
+                )
+        await asyncio.sleep(24 * 60 * 60)
+
+
+async def _check_replicas(app: FastAPI) -> None:
+    """
+    Keeps lag of the read replicas up to date while the app runs.
+
+    :param app: fastAPI application.
+    """
+    while True:
+        await app.state.db_replicas.check_lag(
+            timeout=settings.db_replica_check_interval,
+        )
+        await asyncio.sleep(settings.db_replica_check_interval)
 
 
 def register_startup_event(
@@ -49,6 +183,19 @@ def register_startup_event(
     @app.on_event("startup")
     async def _startup() -> None:
         _setup_db(app)
+        _setup_replicas(app)
+        _setup_cache(app)
+        _setup_news_events(app)
+        _close_news_events_on_exit(app)
+        try:
+            await warm_up(app.state.db_engine, settings.db_pool_prewarm)
+        except Exception:
+            # Connections are opened on demand when the database is back
+            logging.getLogger(__name__).exception("Warming up pool failed")
+        app.state.partitions_task = asyncio.create_task(
+            _create_partitions(app),
+        )
+        app.state.replicas_task = asyncio.create_task(_check_replicas(app))
 
     return _startup
 
@@ -65,6 +212,19 @@ def register_shutdown_event(
 
     @app.on_event("shutdown")
     async def _shutdown() -> None:
+        for signum, handler in app.state.exit_handlers.items():
+            signal.signal(signum, handler)
+        app.state.news_events.close()
+        tasks = (
+            app.state.partitions_task,
+            app.state.replicas_task,
+            app.state.news_events_task,
+        )
+        for task in tasks:
+            task.cancel()
+        # Tasks stop using connections before the engines are disposed
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await app.state.db_replicas.dispose()
         await app.state.db_engine.dispose()
 
     return _shutdown
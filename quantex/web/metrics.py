@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from quantex.web.dependencies import verify_secret
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    include_in_schema=False,
+    dependencies=[Depends(verify_secret)],
+)
+async def get_metrics(request: Request):
+    """
+    Get latency histograms in the Prometheus text format.
+
+    Every worker has its own metrics, so these only cover the worker that
+    handles the request.
+    """
+    return PlainTextResponse(
+        request.app.state.metrics.render(),
+        media_type="text/plain; version=0.0.4",
+    )
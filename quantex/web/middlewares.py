@@ -1,29 +1,87 @@
 import time
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from quantex.services.metrics import Metrics, Timings, request_timings
 
-class ProcessTimeHeader(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
+SECURITY_HEADERS = {
+    "X-Frame-Options": "DENY",
+    "X-Content-Type-Options": "nosniff",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "same-origin",
+}
 
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
 
+def _server_timing(timings: Timings, total: float) -> str:
+    stages = [*timings.items(), ("total", total)]
+    return ", ".join(
+        f"{name};dur={seconds * 1000:.3f}" for name, seconds in stages
+    )
 
-class SecurityHeaders(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "same-origin"
-        return response
+class Instrumentation:
+    """
+    Times requests and records their latency.
+
+    Responses get the time spent so far in X-Process-Time and, per stage, in
+    Server-Timing. Streamed responses send their headers before the body is
+    produced, so their full time is only recorded in the histograms.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings: Timings = {}
+        token = request_timings.set(timings)
+        status = 500
+
+        async def send_timed(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = time.perf_counter() - start
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(elapsed)
+                headers["Server-Timing"] = _server_timing(timings, elapsed)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            request_timings.reset(token)
+            # Unmatched paths share one label to keep the number of series low
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.metrics.observe(
+                scope["method"],
+                route,
+                status,
+                time.perf_counter() - start,
+                timings,
+            )
+
+
+class SecurityHeaders:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_secured(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_secured)